@@ -0,0 +1,135 @@
+"""Request latency with and without debug logging.
+
+Runs GET /{room}/state in-process against a fake speaker that logs every
+SOAP call at DEBUG the way SoCo does, with the state cache disabled so
+every request makes those calls. The log sink sleeps on each write to
+stand in for a busy journald. Compares INFO logging, DEBUG through the
+old synchronous handler, DEBUG through the queue pipeline, and sampled
+DEBUG.
+
+    python benchmarks/log_pipeline.py [--rounds 500] [--write-delay 0.0005]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import statistics
+import sys
+import time
+
+import httpx
+
+from sonos_api.config import settings
+from sonos_api.main import app, setup_logging
+from sonos_api.services.room_state import RoomStateStore
+from sonos_api.utils.metrics import metrics
+from sonos_api.utils.priority_lock import Priority, PriorityLock
+
+soap_logger = logging.getLogger("soco.services")
+
+
+class SlowStream(io.TextIOBase):
+    def __init__(self, delay: float) -> None:
+        self._delay = delay
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self._delay)
+        self.lines += 1
+        return len(text)
+
+
+class FakeSpeaker:
+    uid = "RINCON_000000000001400"
+    player_name = "Kitchen"
+    ip_address = "10.0.0.10"
+
+    def _soap(self, action: str) -> None:
+        soap_logger.debug("Sending %s %s", action, {"InstanceID": 0})
+        soap_logger.debug("Received %s", action)
+
+    def get_current_transport_info(self):
+        self._soap("GetTransportInfo")
+        return {"current_transport_state": "PLAYING"}
+
+    def get_current_track_info(self):
+        self._soap("GetPositionInfo")
+        return {"title": "Track", "artist": "Artist", "album": "Album", "album_art_uri": "",
+                "duration": "0:04:00", "position": "0:01:00", "uri": "x-file-cifs://nas/1.flac"}
+
+    @property
+    def volume(self):
+        self._soap("GetVolume")
+        return 20
+
+    @property
+    def mute(self):
+        self._soap("GetMute")
+        return False
+
+
+class FakeManager:
+    def __init__(self) -> None:
+        self.speaker = FakeSpeaker()
+        self.speakers = {"kitchen": self.speaker}
+        self._lock = PriorityLock()
+
+    def get(self, room):
+        return self.speaker if room == "kitchen" else None
+
+    def resolve_name(self, room):
+        return "kitchen" if room == "kitchen" else None
+
+    def get_lock(self, target, priority=Priority.WRITE, key=None):
+        return self._lock(priority, key)
+
+
+async def _run(client: httpx.AsyncClient, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = await client.get("/kitchen/state")
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+async def main(rounds: int, write_delay: float) -> None:
+    app.state.speaker_manager = FakeManager()
+    app.state.room_state = RoomStateStore(subscribe=False, cache_ttl=0)
+
+    scenarios = [
+        ("INFO, synchronous", "INFO", 0, 0.0),
+        ("DEBUG, synchronous", "DEBUG", 0, 1.0),
+        ("DEBUG, queued", "DEBUG", 10000, 1.0),
+        ("DEBUG, queued, 1% SOAP sample", "DEBUG", 10000, 0.01),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, level, queue_size, sample in scenarios:
+            settings.log_level, settings.log_queue_size, settings.log_soap_sample = level, queue_size, sample
+            sink = sys.stderr = SlowStream(write_delay)
+            listener = setup_logging()
+            logging.getLogger("httpx").setLevel(logging.WARNING)  # The benchmark's own client
+            dropped = metrics.snapshot()["counters"].get("log_records_dropped", 0)
+            samples = await _run(client, rounds)
+            if listener is not None:
+                listener.stop()
+            sys.stderr = sys.__stderr__
+            dropped = metrics.snapshot()["counters"].get("log_records_dropped", 0) - dropped
+
+            samples.sort()
+            p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+            print(
+                f"{name:<32} median {statistics.median(samples) * 1000:7.3f} ms   p95 {p95 * 1000:7.3f} ms"
+                f"   written {sink.lines:6d}   dropped {dropped}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--write-delay", type=float, default=0.0005, help="seconds per log write")
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.write_delay))
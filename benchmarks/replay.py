@@ -0,0 +1,174 @@
+"""Replay a speaker traffic capture through the routers.
+
+Record a capture on a real deployment with SONOS_SOAP_RECORD=capture.jsonl.gz,
+exercise the API for a while (this script's request mix is a good start:
+run it with --live against the running server), then replay it on any box.
+The app is started in a fresh process with SONOS_SOAP_REPLAY set, so
+SoCo gets the recorded answers with the recorded latencies, and the same
+request mix is timed per endpoint. Save results with --json and compare
+two commits with --compare.
+
+    python benchmarks/replay.py capture.jsonl.gz [--rounds 20] [--speed 1] [--json out.json] [--profile out.prof]
+    python benchmarks/replay.py --live http://pi:5005 [--rounds 5]
+    python benchmarks/replay.py --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ENDPOINTS = ("state", "zones", "queue", "info", "favorites", "volume")
+
+
+async def _drive(client, rooms: list[str], rounds: int) -> dict[str, list[float]]:
+    timings: dict[str, list[float]] = {name: [] for name in ENDPOINTS}
+
+    async def timed(name: str, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, path, **kwargs)
+        timings[name].append(time.perf_counter() - start)
+        if response.status_code >= 500:
+            print(f"  {method} {path}: {response.status_code} {response.text[:200]}", file=sys.stderr)
+        return response
+
+    for _ in range(rounds):
+        await timed("zones", "GET", "/zones")
+        await timed("favorites", "GET", "/favorites")
+        for room in rooms:
+            volume = (await timed("state", "GET", f"/{room}/state")).json().get("volume", 10)
+            await timed("queue", "GET", f"/{room}/queue")
+            await timed("info", "GET", f"/{room}/info")
+            await timed("volume", "PUT", f"/{room}/volume", json={"volume": volume})  # Leave it as it was
+    return timings
+
+
+def _child(rounds: int, profile: str | None) -> None:
+    """Runs in the replaying process; prints timings as JSON."""
+    import httpx
+
+    from sonos_api.main import app, lifespan
+    from sonos_api.utils.metrics import metrics
+
+    async def main() -> dict:
+        async with lifespan(app):
+            manager = app.state.speaker_manager
+            await manager.wait_discovered()
+            rooms = sorted(manager.speakers)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=60) as client:
+                await _drive(client, rooms, 1)  # Warm-up: imports, caches, first-use paths
+                if profile:
+                    import cProfile
+
+                    profiler = cProfile.Profile()
+                    profiler.enable()
+                timings = await _drive(client, rooms, rounds)
+                if profile:
+                    profiler.disable()
+                    profiler.dump_stats(profile)
+        counters = metrics.snapshot().get("counters", {})
+        return {
+            "rooms": len(rooms),
+            "timings": timings,
+            "misses": counters.get("soap_replay_misses", 0),
+            "loose": counters.get("soap_replay_loose", 0),
+        }
+
+    print(json.dumps(asyncio.run(main())))
+
+
+def _replay(args) -> dict:
+    with tempfile.TemporaryDirectory() as data:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])),
+            "SONOS_SOAP_REPLAY": os.path.abspath(args.capture),
+            "SONOS_SOAP_REPLAY_SPEED": str(args.speed),
+            "SONOS_DATA_DIR": data,
+            "SONOS_TTS_CACHE_DIR": os.path.join(data, "static"),
+            "SONOS_STATE_CACHE_TTL": "0",  # Every read goes to the (replayed) speaker
+            "SONOS_LOG_LEVEL": "WARNING",
+            "SONOS_LOG_QUEUE_SIZE": "0",
+        }
+        command = [sys.executable, __file__, "--child", "--rounds", str(args.rounds)]
+        if args.profile:
+            command += ["--profile", os.path.abspath(args.profile)]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+async def _live(base_url: str, rounds: int) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        rooms = sorted(zone["coordinator"]["roomName"] for zone in (await client.get("/zones")).json())
+        timings = await _drive(client, rooms, rounds)
+    return {"rooms": len(rooms), "timings": timings, "misses": 0, "loose": 0}
+
+
+def _summary(result: dict) -> dict[str, tuple[float, float]]:
+    rows = {}
+    for name, values in result["timings"].items():
+        if values:
+            values = sorted(values)
+            rows[name] = (statistics.median(values) * 1000, values[int(len(values) * 0.95)] * 1000)
+    return rows
+
+
+def _print(result: dict) -> None:
+    print(f"{result['rooms']} rooms, {result['misses']} calls not in capture, {result['loose']} matched by action only\n")
+    print(f"{'endpoint':<10} {'median':>9} {'p95':>9}")
+    for name, (median, p95) in _summary(result).items():
+        print(f"{name:<10} {median:6.2f} ms {p95:6.2f} ms")
+
+
+def _compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = _summary(json.load(f))
+    with open(after_path) as f:
+        after = _summary(json.load(f))
+    print(f"{'endpoint':<10} {'before':>9} {'after':>9} {'change':>8}   (medians)")
+    for name in (name for name in before if name in after):
+        old, new = before[name][0], after[name][0]
+        print(f"{name:<10} {old:6.2f} ms {new:6.2f} ms {(new - old) / old:+8.1%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", nargs="?")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay latencies divided by this")
+    parser.add_argument("--json", metavar="PATH", help="save timings for --compare")
+    parser.add_argument("--profile", metavar="PATH", help="cProfile stats of the timed rounds")
+    parser.add_argument("--live", metavar="URL", help="drive a running server instead of replaying")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.rounds, args.profile)
+        return 0
+    if args.compare:
+        _compare(*args.compare)
+        return 0
+    if args.live:
+        result = asyncio.run(_live(args.live, args.rounds))
+    elif args.capture:
+        result = _replay(args)
+    else:
+        parser.error("a capture file, --live or --compare is required")
+    _print(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f)
+    return 1 if result["misses"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Serialization benchmark for the hot read endpoints.
+
+Runs GET /{room}/queue (1000 items) and GET /zones (20 speakers) in-process
+against fake speakers, with and without a cached snapshot, and compares
+encoding plain dicts with orjson against the previous path (build pydantic
+models, then validate and encode them through the response model).
+
+    python benchmarks/serialization.py [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from types import SimpleNamespace
+
+import httpx
+import orjson
+from pydantic import TypeAdapter
+
+from sonos_api.main import app
+from sonos_api.models.state import ZoneInfo
+from sonos_api.routers.queue import QueueItem, QueueResponse
+from sonos_api.services.room_state import RoomStateStore
+from sonos_api.utils.priority_lock import Priority, PriorityLock
+
+
+class FakeQueue(list):
+    def __init__(self, items, update_id, total_matches):
+        super().__init__(items)
+        self.update_id = update_id
+        self.total_matches = total_matches
+
+
+class FakeSpeaker:
+    def __init__(self, index: int, queue_length: int = 0):
+        self.uid = f"RINCON_{index:012d}01400"
+        self.player_name = f"Room {index}"
+        self.ip_address = f"10.0.0.{index + 10}"
+        self.volume = 20
+        self.mute = False
+        self.update_id = 1
+        self._queue = [
+            SimpleNamespace(
+                title=f"Track {i}",
+                creator="Some Artist",
+                album="Some Album",
+                album_art_uri=f"/getaa?s=1&u=x-file-cifs%3a%2f%2fnas%2fmusic%2f{i}.flac",
+                resources=[SimpleNamespace(uri=f"x-file-cifs://nas/music/{i}.flac")],
+            )
+            for i in range(queue_length)
+        ]
+
+    def get_queue(self, start=0, max_items=100):
+        return FakeQueue(self._queue[start : start + max_items], self.update_id, len(self._queue))
+
+    def get_current_transport_info(self):
+        return {"current_transport_state": "PLAYING"}
+
+    def get_current_track_info(self):
+        return {
+            "title": "Track", "artist": "Artist", "album": "Album", "album_art_uri": "/getaa?s=1&u=x",
+            "duration": "0:04:00", "position": "0:01:00", "uri": "x-file-cifs://nas/music/1.flac",
+        }
+
+
+class FakeManager:
+    def __init__(self, speakers):
+        self.speakers = {s.player_name.lower().replace(" ", "_"): s for s in speakers}
+        groups = [
+            SimpleNamespace(coordinator=speakers[i], members=speakers[i : i + 2], volume=20, mute=False)
+            for i in range(0, len(speakers), 2)
+        ]
+        for speaker in speakers:
+            speaker.all_groups = groups
+        self._groups = {group.coordinator.uid: [s.uid for s in group.members] for group in groups}
+        self._locks = {}
+
+    def groups(self):
+        return self._groups
+
+    def get(self, room):
+        return self.speakers.get(self.resolve_name(room))
+
+    def resolve_name(self, room):
+        for name, speaker in self.speakers.items():
+            if room == speaker.uid or room.lower().replace(" ", "_") == name:
+                return name
+        return None
+
+    def suggest(self, room):
+        return []
+
+    def member_info(self, uid):
+        speaker = next(s for s in self.speakers.values() if s.uid == uid)
+        return {"uid": uid, "name": speaker.player_name, "visible": True}
+
+    def coordinator(self, room):
+        return self.get(room)
+
+    def get_lock(self, target, priority=Priority.WRITE, key=None):
+        speaker = self.get(target) if isinstance(target, str) else target
+        return self._locks.setdefault(speaker.uid, PriorityLock())(priority, key)
+
+
+class LiveStore(RoomStateStore):
+    """Store that reports event subscriptions for every room, so /zones is built from it."""
+
+    live = True
+
+
+_QUEUE_ADAPTER = TypeAdapter(QueueResponse)
+_ZONES_ADAPTER = TypeAdapter(list[ZoneInfo])
+
+
+def _legacy_queue(data: dict) -> bytes:
+    """Previous path: build models, then FastAPI validates and encodes them."""
+    model = QueueResponse(
+        room=data["room"], total=data["total"], update_id=data["update_id"],
+        items=[QueueItem(**item) for item in data["items"]],
+    )
+    return json.dumps(_QUEUE_ADAPTER.dump_python(_QUEUE_ADAPTER.validate_python(model), mode="json")).encode()
+
+
+def _legacy_zones(data: list) -> bytes:
+    zones = [ZoneInfo(**zone) for zone in data]
+    return json.dumps(_ZONES_ADAPTER.dump_python(_ZONES_ADAPTER.validate_python(zones), mode="json")).encode()
+
+
+def _timed(rounds: int, func, *args) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _timed_get(client: httpx.AsyncClient, path: str, rounds: int, before=None) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        if before:
+            before()
+        start = time.perf_counter()
+        response = await client.get(path)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+def _report(name: str, samples: list[float]) -> None:
+    samples.sort()
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{name:<36} median {statistics.median(samples) * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms")
+
+
+async def main(rounds: int) -> None:
+    speakers = [FakeSpeaker(i, queue_length=1000 if i == 0 else 0) for i in range(20)]
+    app.state.speaker_manager = FakeManager(speakers)
+    store = app.state.room_state = LiveStore(subscribe=False)
+
+    manager = app.state.speaker_manager
+    for room, speaker in manager.speakers.items():
+        await store.get(room, speaker, manager.get_lock(room))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = json.loads((await client.get("/room_0/queue")).content)
+        zones = json.loads((await client.get("/zones")).content)
+
+        print("encode only")
+        _report("  queue 1000 items, models", _timed(rounds, _legacy_queue, queue))
+        _report("  queue 1000 items, orjson", _timed(rounds, orjson.dumps, queue))
+        _report("  zones 20 speakers, models", _timed(rounds, _legacy_zones, zones))
+        _report("  zones 20 speakers, orjson", _timed(rounds, orjson.dumps, zones))
+
+        def bump_queue():
+            speakers[0].update_id += 1
+
+        def bump_zones():
+            store.topology_version += 1
+
+        print("GET through the app")
+        _report("  /room_0/queue, changed", await _timed_get(client, "/room_0/queue", rounds, bump_queue))
+        _report("  /room_0/queue, snapshot", await _timed_get(client, "/room_0/queue", rounds))
+        _report("  /zones, changed", await _timed_get(client, "/zones", rounds, bump_zones))
+        _report("  /zones, snapshot", await _timed_get(client, "/zones", rounds))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    asyncio.run(main(parser.parse_args().rounds))
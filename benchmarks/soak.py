@@ -0,0 +1,234 @@
+"""Soak test: memory must stay flat over millions of requests.
+
+Drives a request mix in-process against fake speakers through the real
+SpeakerManager, state cache and history recorder: state reads, volume
+writes, pause/play, /zones, unknown rooms, SSE clients that connect and
+drop, and speakers that are swapped for new ones. Samples RSS, GC-tracked
+objects, speaker locks and SSE queues as it goes and fails (exit 1) if
+they grew after the warm-up.
+
+    python benchmarks/soak.py [--requests 2000000] [--concurrency 16] [--sample-every N] [--max-rss-growth-mb 8]
+
+Add --tracemalloc to print the allocation sites that grew (several times slower).
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sonos_api.discovery.manager import SpeakerManager
+from sonos_api.main import app
+from sonos_api.routers import events
+from sonos_api.services.history import HistoryRecorder
+from sonos_api.services.room_state import RoomStateStore
+from sonos_api.utils.memory import MemoryProfiler, rss_bytes
+
+ROOMS = 8
+
+
+class FakeSpeaker:
+    def __init__(self, index: int, serial: int = 0) -> None:
+        self.uid = f"RINCON_{serial:06d}{index:06d}01400"
+        self.player_name = f"Room {index}"
+        self.ip_address = f"10.0.0.{index + 10}"
+        self.volume = 20
+        self.mute = False
+        self.transport = "PLAYING"
+
+    def get_current_transport_info(self):
+        return {"current_transport_state": self.transport}
+
+    def get_current_track_info(self):
+        return {
+            "title": "Track", "artist": "Artist", "album": "Album", "album_art_uri": "",
+            "duration": "0:04:00", "position": "0:01:00", "uri": "x-file-cifs://nas/music/1.flac",
+        }
+
+    def pause(self):
+        self.transport = "PAUSED_PLAYBACK"
+
+    def play(self):
+        self.transport = "PLAYING"
+
+
+def _household(speakers: list[FakeSpeaker]) -> dict:
+    groups = [SimpleNamespace(coordinator=s, members=[s], volume=s.volume, mute=False) for s in speakers]
+    for speaker in speakers:
+        speaker.all_groups = groups
+    return {s.uid: (s, s.player_name) for s in speakers}
+
+
+async def _sse_client() -> None:
+    """Connect to /events, take one event, then drop the connection."""
+    gone = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            gone.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/events", "raw_path": b"/events", "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1), "server": ("soak", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, send))
+    while not events.client_stats()["clients"] and not task.done():
+        await asyncio.sleep(0)
+    events.broadcast("soak", {"ping": True})
+    await asyncio.wait_for(task, timeout=5)
+
+
+def _sample(manager) -> dict:
+    # A swapped-out speaker's lock can still be held during the churn prune;
+    # the batch is drained now, so prune again as the next discovery would
+    manager._prune_locks()
+    gc.collect()
+    return {
+        "rss": rss_bytes() or 0,
+        "objects": len(gc.get_objects()),
+        "locks": manager.lock_stats()["count"],
+        "sse": events.client_stats()["clients"],
+    }
+
+
+async def main(args) -> int:
+    speakers = [FakeSpeaker(i) for i in range(ROOMS)]
+    manager = SpeakerManager(lock_max_wait=2.0)
+    manager.registry.replace(_household(speakers))
+    store = RoomStateStore(subscribe=False, cache_ttl=1.0)
+    await store.start(manager)
+    history = HistoryRecorder(tempfile.mktemp(suffix=".json"), capacity=1000, snapshot_interval=3600)
+    await history.start(manager, store)
+    app.state.speaker_manager = manager
+    app.state.room_state = store
+    app.state.history = history
+
+    rooms = list(manager.speakers)
+    profiler = MemoryProfiler(frames=8) if args.tracemalloc else None
+
+    async def one(client: httpx.AsyncClient, i: int) -> None:
+        room = rooms[i % len(rooms)]
+        kind = i % 20
+        if kind < 10:
+            response = await client.get(f"/{room}/state")
+        elif kind < 14:
+            response = await client.put(f"/{room}/volume", json={"volume": i % 100})
+        elif kind == 14:
+            response = await client.post(f"/{room}/pause")
+        elif kind == 15:
+            response = await client.post(f"/{room}/play")
+        elif kind == 16:
+            response = await client.get("/zones")
+        elif kind == 17:
+            response = await client.get(f"/ghost-{i}/state")  # Unknown rooms must not leave anything behind
+            assert response.status_code == 404
+            return
+        elif kind == 18:
+            response = await client.get("/health")
+        else:
+            if i % 200 == 19:
+                await _sse_client()
+            return
+        if response.status_code not in (200, 409, 429):
+            raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text}")
+
+        if i % args.churn_every == 0:
+            # A speaker is swapped for a new one (new UUID, same room), as
+            # the next discovery would see it; its old lock must go
+            slot = (i // args.churn_every) % ROOMS
+            speakers[slot] = FakeSpeaker(slot, serial=i // args.churn_every)
+            manager.registry.replace(_household(speakers))
+            manager._prune_locks()
+
+    async def run(client: httpx.AsyncClient, begin: int, end: int) -> None:
+        counter = itertools.count(begin)
+
+        async def worker():
+            while (i := next(counter)) < end:
+                await one(client, i)
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    samples = []
+    warm = max(1, args.requests // 10)
+    sample_every = args.sample_every or max(1, args.requests // 20)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://soak") as client:
+        start = time.monotonic()
+        done = 0
+        while done < args.requests:
+            end = min(done + sample_every, args.requests)
+            await run(client, done, end)
+            done = end
+            if profiler is not None and done >= warm and not samples:
+                profiler.start()
+            sample = _sample(manager)
+            if done >= warm:
+                samples.append(sample)
+            rate = done / (time.monotonic() - start)
+            print(
+                f"{done:>10,d} req  {rate:7.0f} req/s  rss {sample['rss'] / 2**20:7.1f} MB  "
+                f"objects {sample['objects']:>8,d}  locks {sample['locks']}  sse {sample['sse']}",
+                flush=True,
+            )
+
+    await history.stop()
+    await store.stop()
+
+    if len(samples) < 2:
+        print("Too few samples after warm-up; raise --requests or lower --sample-every")
+        return 1
+    first, last = samples[0], samples[-1]
+    rss_growth = (last["rss"] - first["rss"]) / 2**20
+    object_growth = last["objects"] - first["objects"]
+    print(f"\nafter warm-up: rss {rss_growth:+.1f} MB, objects {object_growth:+,d}, "
+          f"locks {last['locks']} (speakers {ROOMS}), sse {last['sse']}")
+    if profiler is not None:
+        for site in profiler.report(top=10)["growth"]:
+            print(f"  {site['size_diff']:+10,d} B  {site['site']}")
+
+    failures = []
+    if rss_growth > args.max_rss_growth_mb:
+        failures.append(f"RSS grew {rss_growth:.1f} MB")
+    if object_growth > args.max_object_growth:
+        failures.append(f"{object_growth} more live objects")
+    if last["locks"] > ROOMS:
+        failures.append(f"{last['locks']} speaker locks for {ROOMS} speakers")
+    if last["sse"]:
+        failures.append(f"{last['sse']} SSE queues left")
+    for failure in failures:
+        print("FAIL:", failure)
+    if not failures:
+        print("OK: memory flat")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sample-every", type=int, default=0, help="requests between samples (default: 1/20 of --requests)")
+    parser.add_argument("--churn-every", type=int, default=5_000, help="requests between speaker drop-outs")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=8.0)
+    parser.add_argument("--max-object-growth", type=int, default=5_000)
+    parser.add_argument("--tracemalloc", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
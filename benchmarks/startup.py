@@ -0,0 +1,150 @@
+"""Startup time: import profile and time to first 200.
+
+Starts the app in a fresh process against fake speakers whose discovery
+takes --discovery-delay seconds (soco.discover waits out its timeout on
+a real network), runs the lifespan and measures, from process start:
+imports done, lifespan started, first 200 from /health and first 200
+from /{room}/state. Exits 1 if the median time to the first /health 200
+exceeds --max-first-200.
+
+    python benchmarks/startup.py [--runs 5] [--discovery-delay 5] [--max-first-200 2.0]
+    python benchmarks/startup.py --imports 25   # slowest imports (python -X importtime)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOMS = 4
+
+
+def _child(discovery_delay: float) -> None:
+    """Runs in the measured process; prints timings as JSON."""
+    started = float(os.environ["STARTUP_T0"])
+    import asyncio
+    from types import SimpleNamespace
+
+    import httpx
+    import soco
+
+    from sonos_api.main import app, lifespan
+
+    imported = time.time()
+
+    class FakeSpeaker:
+        def __init__(self, index: int) -> None:
+            self.uid = f"RINCON_{index:012d}01400"
+            self.player_name = f"Room {index}"
+            self.ip_address = f"10.0.0.{index + 10}"
+            self.volume = 20
+            self.mute = False
+            self.is_visible = True
+            self.is_satellite = self.has_satellites = self.is_subwoofer = False
+
+        def get_current_transport_info(self):
+            return {"current_transport_state": "STOPPED"}
+
+        def get_current_track_info(self):
+            return {"title": "", "artist": "", "album": "", "album_art_uri": "", "duration": "", "position": "", "uri": ""}
+
+    speakers = [FakeSpeaker(i) for i in range(ROOMS)]
+    groups = [SimpleNamespace(coordinator=s, members=[s]) for s in speakers]
+    for speaker in speakers:
+        speaker.all_groups = groups
+
+    def discover(timeout=5, **kwargs):
+        time.sleep(discovery_delay)
+        return set(speakers)
+
+    soco.discover = discover
+
+    async def first_200(client: httpx.AsyncClient, path: str) -> float:
+        while (await client.get(path)).status_code != 200:
+            await asyncio.sleep(0.01)
+        return time.time()
+
+    async def main() -> dict:
+        async with lifespan(app):
+            ready = time.time()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+                health = await first_200(client, "/health")
+                state = await first_200(client, "/room_0/state")
+        return {"imported": imported, "ready": ready, "health": health, "state": state}
+
+    timings = asyncio.run(main())
+    print(json.dumps({name: value - started for name, value in timings.items()}))
+
+
+def _run_once(discovery_delay: float) -> dict:
+    with tempfile.TemporaryDirectory() as data:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])),
+            "SONOS_DATA_DIR": data,
+            "SONOS_TTS_CACHE_DIR": os.path.join(data, "static"),
+            "SONOS_EVENT_SUBSCRIPTIONS": "false",
+            "SONOS_LOG_LEVEL": "CRITICAL",
+            "STARTUP_T0": repr(time.time()),
+        }
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--discovery-delay", str(discovery_delay)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _imports(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import sonos_api.main"],
+        env={**os.environ, "PYTHONPATH": os.getcwd()}, check=True, capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), int(own), name.rstrip()))
+    total = next(cumulative for cumulative, _, name in rows if name.strip() == "sonos_api.main")
+    ours = sum(own for _, own, name in rows if name.strip().startswith("sonos_api"))
+    print(f"import sonos_api.main: {total / 1000:.0f} ms (sonos_api modules themselves: {ours / 1000:.0f} ms)\n")
+    print(f"{'cumulative':>12} {'self':>9}  module")
+    for cumulative, own, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:9.1f} ms {own / 1000:6.1f} ms  {name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--discovery-delay", type=float, default=5.0)
+    parser.add_argument("--max-first-200", type=float, default=2.0, help="seconds, median /health")
+    parser.add_argument("--imports", type=int, metavar="N", help="print the N slowest imports and exit")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.discovery_delay)
+        return 0
+    if args.imports:
+        _imports(args.imports)
+        return 0
+
+    runs = [_run_once(args.discovery_delay) for _ in range(args.runs)]
+    for name in ("imported", "ready", "health", "state"):
+        values = [run[name] for run in runs]
+        print(f"{name:<10} median {statistics.median(values):6.3f} s   max {max(values):6.3f} s")
+    first_200 = statistics.median(run["health"] for run in runs)
+    if first_200 > args.max_first_200:
+        print(f"FAIL: first /health 200 after {first_200:.3f} s (limit {args.max_first_200} s)")
+        return 1
+    print(f"OK: first /health 200 after {first_200:.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,8 +18,8 @@ sudo -u pi python3 -m venv "$APP_DIR/.venv"
 sudo -u pi "$APP_DIR/.venv/bin/pip" install --upgrade pip
 sudo -u pi "$APP_DIR/.venv/bin/pip" install "$APP_DIR"
 
-# Create static dir for TTS cache
-sudo -u pi mkdir -p "$APP_DIR/static"
+# Create static dir for TTS cache and data dir for persistent state
+sudo -u pi mkdir -p "$APP_DIR/static" "$APP_DIR/data"
 
 # Install systemd service
 echo "Installing systemd service..."
@@ -6,10 +6,39 @@ class Settings(BaseSettings):
 
     api_host: str = "0.0.0.0"
     api_port: int = 5005
+    callback_host: str = ""
+    owner_socket: str = ""
     discovery_interval: int = 30
+    room_aliases: dict[str, str] = {}
+    lock_max_wait: float = 2.0
+    speaker_max_queue: int = 8
+    speaker_rate_limit: float = 10.0
+    speaker_rate_burst: int = 20
     log_level: str = "INFO"
     log_json: bool = False
+    log_queue_size: int = 10000
+    log_soap_sample: float = 0.0
     tts_cache_dir: str = "static"
+    clips_max_mb: int = 16
+    data_dir: str = "data"
+    library_refresh_interval: int = 900
+    library_page_delay: float = 0.2
+    event_subscriptions: bool = True
+    state_cache_ttl: float = 5.0
+    position_resync_interval: float = 60.0
+    history_size: int = 10000
+    history_snapshot_interval: float = 300.0
+    art_proxy: bool = True
+    art_cache_max_mb: int = 64
+    art_memory_max_mb: int = 8
+    watchdog_probe_interval: float = 1.0
+    watchdog_max_lag: float = 5.0
+    watchdog_pool_timeout: float = 10.0
+    slow_callback_threshold: float = 0.25
+    debug_memory: bool = False
+    soap_record: str = ""
+    soap_replay: str = ""
+    soap_replay_speed: float = 1.0
 
 
 settings = Settings()
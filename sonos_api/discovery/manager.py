@@ -1,29 +1,71 @@
 import asyncio
 import logging
+from collections.abc import Mapping
 
 import soco
 
+from sonos_api.discovery.registry import SpeakerRegistry
+from sonos_api.utils.network import resolver
+from sonos_api.utils.priority_lock import Priority, PriorityLock
 from sonos_api.utils.speaker import normalize_room_name
 
 logger = logging.getLogger(__name__)
 
 
 class SpeakerManager:
-    """Manages discovered Sonos speakers with background re-discovery."""
+    """Manages discovered Sonos speakers with background re-discovery.
 
-    def __init__(self, discovery_interval: int = 30) -> None:
+    Also caches the group topology so transport commands can be routed to
+    a room's group coordinator. Speaker locks are keyed by UUID, so they
+    survive room renames.
+    """
+
+    def __init__(
+        self,
+        discovery_interval: int = 30,
+        lock_max_wait: float = 2.0,
+        max_queue: int = 0,
+        rate_limit: float = 0.0,
+        rate_burst: float = 1.0,
+        aliases: dict[str, str] | None = None,
+    ) -> None:
         self._discovery_interval = discovery_interval
-        self._speakers: dict[str, soco.SoCo] = {}
-        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_options = {"max_wait": lock_max_wait, "max_queue": max_queue, "rate": rate_limit, "burst": rate_burst}
+        self.registry = SpeakerRegistry(aliases)
+        self._locks: dict[str, PriorityLock] = {}  # speaker uid -> lock
+        self._coordinators: dict[str, soco.SoCo] = {}  # member uid -> group coordinator
+        self._members: dict[str, dict] = {}  # member uid -> name and bonding, from the topology
+        self._topology_task: asyncio.Task | None = None
         self._discovery_task: asyncio.Task | None = None
+        self._discovered = asyncio.Event()
+
+    @property
+    def speakers(self) -> Mapping[str, soco.SoCo]:
+        """Room name -> speaker; a read-only snapshot, not a copy."""
+        return self.registry.speakers
 
     @property
-    def speakers(self) -> dict[str, soco.SoCo]:
-        return dict(self._speakers)
+    def discovered(self) -> bool:
+        """True once the first discovery has finished (or speakers are known)."""
+        return self._discovered.is_set() or bool(self.registry.speakers)
+
+    async def wait_discovered(self, timeout: float | None = None) -> bool:
+        """Wait for the first discovery to finish. Returns False on timeout."""
+        if self.discovered:
+            return True
+        try:
+            await asyncio.wait_for(self._discovered.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     async def start(self) -> None:
-        """Run initial discovery and start background task."""
-        await self._discover()
+        """Start discovery in the background.
+
+        Returns at once: the first discovery takes several seconds, and the
+        API (``/health`` at least) should be up meanwhile. Use
+        ``wait_discovered`` for work that needs the speakers.
+        """
         self._discovery_task = asyncio.create_task(self._discovery_loop())
 
     async def stop(self) -> None:
@@ -47,36 +89,178 @@ class SpeakerManager:
             logger.warning("No Sonos devices found")
             return
 
-        found: dict[str, soco.SoCo] = {}
+        found: dict[str, tuple[soco.SoCo, str]] = {}
         for device in devices:
             try:
-                name = await asyncio.to_thread(lambda d=device: d.player_name)
-                normalized = normalize_room_name(name)
-                found[normalized] = device
-                if normalized not in self._locks:
-                    self._locks[normalized] = asyncio.Lock()
+                # Read uid here too: SoCo fetches it lazily over the network
+                name, uid = await asyncio.to_thread(lambda d=device: (d.player_name, d.uid))
+                found[uid] = (device, name)
             except Exception:
                 logger.exception("Failed to get player name for %s", device.ip_address)
 
-        self._speakers = found
-        logger.info("Discovered %d speakers: %s", len(found), list(found.keys()))
+        self.registry.replace(found)
+        logger.info("Discovered %d speakers: %s", len(found), list(self.registry.speakers))
+        self._prune_locks()
+        await asyncio.to_thread(resolver.check, [device.ip_address for device, _ in found.values()])
+        await self.refresh_topology()
+
+    async def refresh_topology(self) -> None:
+        """Re-read group membership (one ZoneGroupTopology call).
+
+        Also picks up renamed rooms and new visible speakers without
+        waiting for the next discovery.
+        """
+        speakers = list(self.registry.speakers.values())
+        if not speakers:
+            return
+
+        def _member(m):
+            return m, {
+                "uid": m.uid,
+                "name": m.player_name,
+                "visible": m.is_visible,
+                "satellite": m.is_satellite,
+                "home_theater": m.has_satellites,
+                "subwoofer": m.is_subwoofer,
+            }
+
+        def _read():
+            # Names and bonding all come from the same cached topology read
+            return [(group.coordinator, [_member(m) for m in group.members]) for group in speakers[0].all_groups]
+
+        try:
+            groups = await asyncio.to_thread(_read)
+        except Exception as exc:
+            logger.warning("Failed to read group topology: %s", exc)
+            return
+        coordinators, infos = {}, {}
+        for coordinator, members in groups:
+            for member, info in members:
+                uid = info["uid"]
+                coordinators[uid] = coordinator
+                infos[uid] = info
+                if info["visible"]:
+                    self.registry.upsert(uid, member, info["name"])
+                else:
+                    self.registry.rename(uid, info["name"])
+        self._coordinators = coordinators
+        self._members = infos
+
+    def invalidate_topology(self) -> asyncio.Task:
+        """Schedule a topology refresh (after a join/leave or a topology event).
+
+        Returns the refresh task; await it when the new grouping is needed next.
+        """
+        if self._topology_task is None or self._topology_task.done():
+            self._topology_task = asyncio.create_task(self.refresh_topology())
+        return self._topology_task
 
     async def _discovery_loop(self) -> None:
-        """Periodically re-discover speakers."""
+        """Discover speakers now and then periodically."""
+        await self._discover()
+        self._discovered.set()
         while True:
             await asyncio.sleep(self._discovery_interval)
             await self._discover()
 
     def get(self, room: str) -> soco.SoCo | None:
-        """Get a speaker by normalized room name."""
-        return self._speakers.get(normalize_room_name(room))
-
-    def get_lock(self, room: str) -> asyncio.Lock:
-        """Get the per-device lock for a room."""
-        normalized = normalize_room_name(room)
-        if normalized not in self._locks:
-            self._locks[normalized] = asyncio.Lock()
-        return self._locks[normalized]
+        """Get a speaker by room name, alias, UUID or IP address."""
+        return self.registry.get(room)
+
+    def resolve_name(self, room: str) -> str | None:
+        """Canonical room name for any key accepted by ``get``."""
+        return self.registry.name_of(room)
+
+    def lookup_table(self) -> dict[str, str]:
+        """Every exact room key (name, alias, UUID, IP) -> room name."""
+        return self.registry.lookup_table()
+
+    def suggest(self, room: str) -> list[str]:
+        """Known room names similar to an unknown one."""
+        return self.registry.suggest(room)
+
+    def member_info(self, uid: str) -> dict | None:
+        """Cached topology info for any household member, including hidden ones.
+
+        Keys: uid, name, visible, satellite, home_theater, subwoofer.
+        """
+        return self._members.get(uid)
+
+    def coordinator(self, room: str) -> soco.SoCo | None:
+        """Get the group coordinator for a room (the room itself when ungrouped).
+
+        Transport state, the queue and play mode belong to the coordinator;
+        commands sent to a member are rejected or redirected by Sonos.
+        """
+        speaker = self.get(room)
+        if speaker is None:
+            return None
+        return self._coordinators.get(speaker.uid, speaker)
+
+    def groups(self) -> dict[str, list[str]]:
+        """Cached topology: coordinator UID -> member UIDs, hidden members included."""
+        groups: dict[str, list[str]] = {}
+        for uid, coordinator in self._coordinators.items():
+            groups.setdefault(coordinator.uid, []).append(uid)
+        return groups
+
+    def group_members(self, room: str) -> list[str]:
+        """Room keys (as in ``speakers``) of the visible rooms grouped with ``room``, itself included.
+
+        From the cached topology; mapped through UIDs so rooms sharing a
+        player name stay distinct.
+        """
+        coordinator = self.coordinator(room)
+        if coordinator is None:
+            return []
+        members = [
+            self.registry.name_of(uid)
+            for uid, info in self._members.items()
+            if info["visible"] and self._coordinators[uid].uid == coordinator.uid
+        ]
+        return [name for name in members if name is not None] or [self.resolve_name(room)]
+
+    def group_of(self, room: str) -> dict | None:
+        """``{"coordinator", "members"}`` of a room's group as room keys; None for an unknown room."""
+        coordinator = self.coordinator(room)
+        if coordinator is None:
+            return None
+        return {
+            "coordinator": self.resolve_name(coordinator.uid) or self.resolve_name(room),
+            "members": self.group_members(room),
+        }
+
+    def get_lock(self, target: str | soco.SoCo, priority: Priority = Priority.WRITE, key: str | None = None):
+        """Get the per-device lock for a room name or speaker, held at ``priority`` in ``async with``.
+
+        Lock the coordinator (pass ``manager.coordinator(room)``) for
+        transport operations and the room itself for rendering (volume,
+        mute, EQ). Raises SpeakerBusy on entry when the speaker's queue or
+        rate limit is exhausted. Passing ``key`` lets a newer queued write
+        with the same key replace this one (which then raises Superseded).
+        """
+        speaker = self.get(target) if isinstance(target, str) else target
+        lock_id = speaker.uid if speaker is not None else normalize_room_name(target)
+        lock = self._locks.get(lock_id)
+        if lock is None:
+            lock = self._locks[lock_id] = PriorityLock(**self._lock_options)
+        return lock(priority, key)
+
+    def _prune_locks(self) -> None:
+        """Drop idle locks of speakers that are gone and of names that never resolved."""
+        stale = [lock_id for lock_id, lock in self._locks.items() if lock.idle() and self.get(lock_id) is None]
+        for lock_id in stale:
+            del self._locks[lock_id]
+        if stale:
+            logger.debug("Dropped %d idle speaker locks", len(stale))
+
+    def lock_stats(self) -> dict:
+        locks = list(self._locks.values())
+        return {
+            "count": len(locks),
+            "held": sum(lock.locked() for lock in locks),
+            "waiting": sum(lock.waiting for lock in locks),
+        }
 
     async def trigger_rediscovery(self) -> None:
         """Trigger an immediate re-discovery (e.g. after a device becomes unreachable)."""
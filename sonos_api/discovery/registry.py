@@ -0,0 +1,134 @@
+import difflib
+import logging
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import soco
+
+from sonos_api.utils.speaker import normalize_room_name
+
+logger = logging.getLogger(__name__)
+
+# Resolved raw lookup keys kept per registry generation
+_MEMO_SIZE = 1024
+
+
+class SpeakerRegistry:
+    """Speakers indexed by UUID, IP address, room name and configured alias.
+
+    Rooms are addressed by normalized name; when two speakers share a name
+    the one with the lowest UUID keeps it and the others get ``_2``,
+    ``_3``... suffixes (every speaker is also reachable by UUID and IP).
+    Indexes are rebuilt only when membership or a name actually changes;
+    reads never copy: ``speakers`` is a read-only view of an immutable
+    snapshot that is swapped on change.
+    """
+
+    def __init__(self, aliases: Mapping[str, str] | None = None) -> None:
+        # alias -> room name, UUID or IP
+        self._aliases = {normalize_room_name(k): v for k, v in (aliases or {}).items()}
+        self._devices: dict[str, soco.SoCo] = {}  # uid -> device
+        self._player_names: dict[str, str] = {}  # uid -> name as reported by the speaker
+        self._names: dict[str, str] = {}  # uid -> unique normalized room name
+        self._keys: dict[str, str] = {}  # lookup key -> uid
+        self._memo: dict[str, str | None] = {}  # raw request key -> uid
+        self._choices: list[str] = []  # names and aliases offered as suggestions
+        self._view: Mapping[str, soco.SoCo] = MappingProxyType({})
+
+    @property
+    def speakers(self) -> Mapping[str, soco.SoCo]:
+        """Room name -> device. Read-only and safe to iterate across awaits."""
+        return self._view
+
+    # -- updates -----------------------------------------------------------
+
+    def replace(self, devices: Mapping[str, tuple[soco.SoCo, str]]) -> None:
+        """Apply a discovery result (uid -> (device, player name))."""
+        current = {uid: (device, self._player_names[uid]) for uid, device in self._devices.items()}
+        if dict(devices) == current:
+            return
+        self._devices = {uid: device for uid, (device, _) in devices.items()}
+        self._player_names = {uid: name for uid, (_, name) in devices.items()}
+        self._rebuild()
+
+    def upsert(self, uid: str, device: soco.SoCo, player_name: str) -> None:
+        """Add or update one speaker (e.g. a new room seen in a topology update)."""
+        if self._devices.get(uid) is device and self._player_names.get(uid) == player_name:
+            return
+        self._devices[uid] = device
+        self._player_names[uid] = player_name
+        self._rebuild()
+
+    def rename(self, uid: str, player_name: str) -> None:
+        """Apply a name seen in a topology update (known speakers only)."""
+        if uid in self._devices and self._player_names.get(uid) != player_name:
+            logger.info("Speaker %s renamed to %r", uid, player_name)
+            self._player_names[uid] = player_name
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        by_name: dict[str, list[str]] = {}
+        for uid, player_name in self._player_names.items():
+            by_name.setdefault(normalize_room_name(player_name), []).append(uid)
+
+        names: dict[str, str] = {}
+        for name, uids in by_name.items():
+            uids.sort()
+            if len(uids) > 1:
+                logger.warning("Speakers %s share the room name %r; suffixing duplicates", uids, name)
+            for index, uid in enumerate(uids):
+                names[uid] = name if index == 0 else f"{name}_{index + 1}"
+
+        keys: dict[str, str] = {}
+        for uid, device in self._devices.items():
+            keys[uid] = uid
+            keys[uid.lower()] = uid
+            keys[device.ip_address] = uid
+        for uid, name in names.items():
+            keys[name] = uid
+        for alias, target in self._aliases.items():
+            uid = keys.get(target) or keys.get(normalize_room_name(target))
+            if uid is None:
+                logger.debug("Alias %r points at unknown room %r", alias, target)
+            elif alias not in keys:
+                keys[alias] = uid
+
+        self._names = names
+        self._keys = keys
+        self._memo = {}
+        self._choices = sorted(set(names.values()) | {a for a in self._aliases if a in keys})
+        self._view = MappingProxyType({names[uid]: self._devices[uid] for uid in sorted(names, key=names.get)})
+
+    # -- lookups -----------------------------------------------------------
+
+    def _resolve(self, key: str) -> str | None:
+        uid = self._keys.get(key)
+        if uid is not None:
+            return uid
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        uid = self._keys.get(normalize_room_name(key))
+        if len(self._memo) >= _MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = uid
+        return uid
+
+    def get(self, key: str) -> soco.SoCo | None:
+        """Look up a speaker by room name, alias, UUID or IP address."""
+        uid = self._resolve(key)
+        return self._devices.get(uid) if uid is not None else None
+
+    def name_of(self, key: str) -> str | None:
+        """Canonical (normalized, unique) room name for any lookup key."""
+        uid = self._resolve(key)
+        return self._names.get(uid) if uid is not None else None
+
+    def lookup_table(self) -> dict[str, str]:
+        """Every exact lookup key (name, alias, UUID, IP) -> room name."""
+        return {key: self._names[uid] for key, uid in self._keys.items() if uid in self._names}
+
+    def suggest(self, key: str, limit: int = 3) -> list[str]:
+        """Room names and aliases that look like ``key`` ("did you mean")."""
+        return difflib.get_close_matches(normalize_room_name(key), self._choices, n=limit, cutoff=0.5)
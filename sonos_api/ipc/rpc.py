@@ -0,0 +1,231 @@
+import asyncio
+import itertools
+import logging
+import struct
+import weakref
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Frame: header length, body length, JSON header, raw body
+_FRAME = struct.Struct("<II")
+
+
+class OwnerUnavailable(Exception):
+    """The owner process can't be reached or dropped the connection."""
+
+
+def _pack(header: dict, body: bytes = b"") -> bytes:
+    encoded = orjson.dumps(header)
+    return _FRAME.pack(len(encoded), len(body)) + encoded + body
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple[dict, bytes]:
+    header_len, body_len = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    header = orjson.loads(await reader.readexactly(header_len))
+    body = await reader.readexactly(body_len) if body_len else b""
+    return header, body
+
+
+# -- owner side ---------------------------------------------------------------
+
+
+async def _run_request(app, header: dict, body: bytes, writer: asyncio.StreamWriter, cancelled: asyncio.Event):
+    """Run one forwarded HTTP request through the owner's ASGI app."""
+    request_id = header["id"]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": header["method"],
+        "scheme": "http",
+        "path": header["path"],
+        "raw_path": header["path"].encode(),
+        "root_path": "",
+        "query_string": header["query"].encode("latin-1"),
+        "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in header["headers"]],
+        "client": tuple(header["client"]) if header.get("client") else None,
+        "server": None,
+    }
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await cancelled.wait()
+        return {"type": "http.disconnect"}
+
+    start: dict = {}
+    responded = False
+
+    async def send(message):
+        nonlocal responded
+        if message["type"] == "http.response.start":
+            start.update(
+                status=message["status"],
+                headers=[(k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])],
+            )
+        elif message["type"] == "http.response.body" and not cancelled.is_set():
+            frame = {"id": request_id, "more": message.get("more_body", False)}
+            if not responded:
+                frame.update(start)  # Status and headers travel with the first chunk
+                responded = True
+            writer.write(_pack(frame, message.get("body", b"")))
+            await writer.drain()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        logger.exception("Forwarded request %s %s failed", header["method"], header["path"])
+        if not responded:
+            writer.write(_pack({"id": request_id, "more": False, "status": 500, "headers": []}))
+        elif not cancelled.is_set():
+            writer.write(_pack({"id": request_id, "more": False}))  # End the truncated stream
+
+
+async def serve_connection(app, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """One worker connection; requests on it run concurrently."""
+    tasks: dict[int, tuple[asyncio.Task, asyncio.Event]] = {}
+    try:
+        while True:
+            try:
+                header, body = await _read_frame(reader)
+            except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+                return  # Worker gone, or the owner is shutting down
+            request_id = header["id"]
+            if header.get("cancel"):
+                entry = tasks.get(request_id)
+                if entry is not None:
+                    entry[1].set()  # The app sees http.disconnect
+                continue
+            cancelled = asyncio.Event()
+            task = asyncio.create_task(_run_request(app, header, body, writer, cancelled))
+            tasks[request_id] = (task, cancelled)
+            task.add_done_callback(lambda _, i=request_id: tasks.pop(i, None))
+    finally:
+        for task, cancelled in list(tasks.values()):
+            cancelled.set()
+            task.cancel()
+        writer.close()
+
+
+# -- worker side --------------------------------------------------------------
+
+
+class ResponseBody:
+    """Async iterator over one response's body chunks.
+
+    The request's slot in the client is released when the last chunk has
+    been read, on ``aclose`` (started or not) and, as a fallback, when the
+    object is garbage collected; an unfinished response is cancelled on
+    the owner.
+    """
+
+    def __init__(self, client: "OwnerClient", request_id: int, queue: asyncio.Queue, first) -> None:
+        self._queue = queue
+        self._first = first
+        self._done = False
+        self._release = client._release
+        self._request_id = request_id
+        self._finalizer = weakref.finalize(self, client._release, request_id, True)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._done:
+            raise StopAsyncIteration
+        frame, self._first = self._first, None
+        if frame is None:
+            frame = await self._queue.get()
+        if frame is None:
+            self._finish(cancel=False)
+            raise OwnerUnavailable("connection lost")
+        if not frame[0]["more"]:
+            self._finish(cancel=False)
+        return frame[1]
+
+    def _finish(self, cancel: bool) -> None:
+        if not self._done:
+            self._done = True
+            self._finalizer.detach()
+            self._release(self._request_id, cancel)
+
+    async def aclose(self) -> None:
+        self._finish(cancel=True)
+
+
+class OwnerClient:
+    """Multiplexed request channel from a worker to the owner.
+
+    One Unix-socket connection per worker process, opened lazily and
+    re-opened after a failure; responses are matched to requests by id
+    and may arrive as several chunks (SSE, long-polls).
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Queue] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._connecting = asyncio.Lock()
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        async with self._connecting:
+            if self._writer is None:
+                try:
+                    reader, self._writer = await asyncio.open_unix_connection(self._path)
+                except OSError as exc:
+                    raise OwnerUnavailable(str(exc)) from None
+                self._reader_task = asyncio.create_task(self._read_loop(reader))
+            return self._writer
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                header, body = await _read_frame(reader)
+                queue = self._pending.get(header["id"])
+                if queue is not None:
+                    queue.put_nowait((header, body))
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            logger.warning("Lost connection to owner: %s", exc)
+        finally:
+            self._writer = None
+            for queue in self._pending.values():
+                queue.put_nowait(None)
+
+    async def request(self, header: dict, body: bytes = b""):
+        """Send a request; returns (status, headers, ResponseBody).
+
+        Iterate the body to the end or ``aclose`` it.
+        """
+        writer = await self._connect()
+        request_id = next(self._ids)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._pending[request_id] = queue
+        writer.write(_pack({**header, "id": request_id}, body))
+
+        try:
+            first = await queue.get()
+        except BaseException:
+            self._release(request_id, cancel=True)
+            raise
+        if first is None:
+            self._release(request_id)
+            raise OwnerUnavailable("connection lost")
+        return first[0]["status"], first[0]["headers"], ResponseBody(self, request_id, queue, first)
+
+    def _release(self, request_id: int, cancel: bool = False) -> None:
+        """Forget a request; with ``cancel`` the owner sees a disconnect (client went away)."""
+        if self._pending.pop(request_id, None) is not None and cancel and self._writer is not None:
+            self._writer.write(_pack({"id": request_id, "cancel": True}))
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
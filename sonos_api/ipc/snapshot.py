@@ -0,0 +1,103 @@
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Header: sequence number, payload length, payload CRC-32
+_HEADER = struct.Struct("<QII")
+SNAPSHOT_SIZE = 1 << 20
+
+
+def snapshot_path(owner_socket: str) -> str:
+    """Where the owner publishes state for the workers (next to its socket)."""
+    return owner_socket + ".state"
+
+
+class SnapshotWriter:
+    """Publishes the owner's state as one JSON document in a shared mapping.
+
+    Single writer, many readers, no locks: the sequence number is odd
+    while a write is in progress and readers retry until they see the
+    same even sequence before and after copying a payload whose CRC
+    matches (the CRC also covers weakly ordered stores on ARM).
+
+    The file is reused across owner restarts (never truncated or
+    unlinked) so workers keep a valid mapping, and the sequence carries on
+    from the last published value.
+    """
+
+    def __init__(self, path: str, size: int = SNAPSHOT_SIZE) -> None:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        seq = _HEADER.unpack_from(self._map, 0)[0]
+        self._seq = seq + seq % 2
+
+    def publish(self, document: dict) -> bool:
+        payload = orjson.dumps(document)
+        if _HEADER.size + len(payload) > len(self._map):
+            logger.error("State snapshot too large (%d bytes); workers will forward reads", len(payload))
+            return False
+        self._seq += 1
+        _HEADER.pack_into(self._map, 0, self._seq, 0, 0)
+        self._map[_HEADER.size : _HEADER.size + len(payload)] = payload
+        self._seq += 1
+        _HEADER.pack_into(self._map, 0, self._seq, len(payload), zlib.crc32(payload))
+        return True
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class SnapshotReader:
+    """Worker side of SnapshotWriter; parses each published version once."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._map: mmap.mmap | None = None
+        self._seq = -1
+        self._document: dict | None = None
+
+    def _open(self) -> bool:
+        try:
+            fd = os.open(self._path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            self._map = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        return True
+
+    def read(self) -> dict | None:
+        """Latest published document, or None when there is none (yet)."""
+        if self._map is None and not self._open():
+            return None
+        for _ in range(10):
+            seq, length, crc = _HEADER.unpack_from(self._map, 0)
+            if seq == self._seq:
+                return self._document
+            if seq % 2 or not length:
+                continue
+            payload = self._map[_HEADER.size : _HEADER.size + length]
+            if _HEADER.unpack_from(self._map, 0)[0] != seq or zlib.crc32(payload) != crc:
+                continue
+            self._document = orjson.loads(payload)
+            self._seq = seq
+            return self._document
+        return self._document
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._seq = -1
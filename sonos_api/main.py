@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import logging.handlers
+import os
 from contextlib import asynccontextmanager
 
 import structlog
@@ -9,12 +12,52 @@ from soco.exceptions import SoCoException
 
 from sonos_api.config import settings
 from sonos_api.discovery.manager import SpeakerManager
-from sonos_api.routers import equalizer, events, favorites, groups, playback, queue, state, system, tts, volume
+from sonos_api.routers import (
+    art,
+    clips,
+    debug,
+    device,
+    equalizer,
+    events,
+    favorites,
+    groups,
+    history,
+    library,
+    operations,
+    playback,
+    queue,
+    scenes,
+    schedule,
+    state,
+    system,
+    tts,
+    volume,
+    ws,
+)
 from sonos_api.routers import settings as settings_router
+from sonos_api.services.art import ArtCache
+from sonos_api.services.capabilities import CapabilityCache
+from sonos_api.services.clips import ClipStore
+from sonos_api.services.history import HistoryRecorder
+from sonos_api.services.library import LibraryIndex
+from sonos_api.services.room_state import RoomStateStore
+from sonos_api.services.scheduler import Scheduler
+from sonos_api.services.soap_capture import SoapRecorder, SoapReplayer
+from sonos_api.services.speaker_settings import SpeakerSettings
+from sonos_api.services.watchdog import LoopWatchdog
+from sonos_api.utils.logqueue import SamplingFilter, start_queue_logging
+from sonos_api.utils.memory import MemoryProfiler
+from sonos_api.utils.priority_lock import SpeakerBusy, Superseded
+
 
+def setup_logging() -> logging.handlers.QueueListener | None:
+    """Configure structlog for structured logging.
 
-def setup_logging() -> None:
-    """Configure structlog for structured logging."""
+    Records are formatted and written by a background thread behind a
+    bounded queue (``SONOS_LOG_QUEUE_SIZE``; 0 writes synchronously), so a
+    slow journald never stalls the event loop. Returns the listener to stop
+    at shutdown.
+    """
     shared_processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
@@ -45,32 +88,155 @@ def setup_logging() -> None:
 
     handler = logging.StreamHandler()
     handler.setFormatter(formatter)
+    listener = None
+    if settings.log_queue_size > 0:
+        handler, listener = start_queue_logging(handler, settings.log_queue_size)
 
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
     root_logger.addHandler(handler)
     root_logger.setLevel(settings.log_level.upper())
 
-    # Quiet noisy loggers
-    logging.getLogger("soco").setLevel(logging.WARNING)
+    # Quiet noisy loggers; SoCo logs every SOAP call at DEBUG, so keep a sample
+    if settings.log_soap_sample > 0 and root_logger.level <= logging.DEBUG:
+        logging.getLogger("soco").setLevel(logging.DEBUG)
+        handler.addFilter(SamplingFilter(("soco",), round(1 / settings.log_soap_sample)))
+    else:
+        logging.getLogger("soco").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    return listener
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    setup_logging()
+    log_listener = setup_logging()
     logger = structlog.get_logger()
     logger.info("Starting Sonos API", port=settings.api_port)
+    if settings.debug_memory:
+        # Start tracing before anything else allocates, so startup shows up too
+        app.state.memory_profiler = MemoryProfiler()
+        app.state.memory_profiler.start()
+
+    # Before anything talks to a speaker
+    soap_capture = None
+    if settings.soap_replay:
+        soap_capture = SoapReplayer(settings.soap_replay, speed=settings.soap_replay_speed)
+        await asyncio.to_thread(soap_capture.load)
+        soap_capture.install()
+    elif settings.soap_record:
+        soap_capture = SoapRecorder(settings.soap_record)
+        soap_capture.install()
 
-    manager = SpeakerManager(discovery_interval=settings.discovery_interval)
+    manager = SpeakerManager(
+        discovery_interval=settings.discovery_interval,
+        lock_max_wait=settings.lock_max_wait,
+        max_queue=settings.speaker_max_queue,
+        rate_limit=settings.speaker_rate_limit,
+        rate_burst=settings.speaker_rate_burst,
+        aliases=settings.room_aliases,
+    )
     app.state.speaker_manager = manager
+    # Discovery runs in the background; everything below is local
     await manager.start()
 
+    room_state = RoomStateStore(
+        # Event callbacks can't be replayed; fall back to polling
+        subscribe=settings.event_subscriptions and not settings.soap_replay,
+        cache_ttl=settings.state_cache_ttl,
+        resync_interval=settings.position_resync_interval,
+    )
+    room_state.add_listener(
+        lambda s: events.broadcast("state", {
+            "room": s.room, "state": s.transport, "volume": s.volume, "mute": s.mute, "track": s.track_info(),
+        })
+    )
+    app.state.room_state = room_state
+    await room_state.start(manager)
+
+    history_recorder = HistoryRecorder(
+        os.path.join(settings.data_dir, "history.json"),
+        capacity=settings.history_size,
+        snapshot_interval=settings.history_snapshot_interval,
+    )
+    app.state.history = history_recorder
+
+    art_cache = ArtCache(
+        os.path.join(settings.data_dir, "art"),
+        max_disk_bytes=settings.art_cache_max_mb * 1024 * 1024,
+        max_memory_bytes=settings.art_memory_max_mb * 1024 * 1024,
+    )
+    app.state.art_cache = art_cache
+
+    capabilities = CapabilityCache(
+        os.path.join(settings.data_dir, "devices.json"),
+        interval=settings.discovery_interval,
+    )
+    app.state.capabilities = capabilities
+
+    speaker_settings = SpeakerSettings(ttl=settings.state_cache_ttl)
+    speaker_settings.start(manager, room_state, capabilities)
+    app.state.speaker_settings = speaker_settings
+
+    clip_store = ClipStore(os.path.join(settings.data_dir, "clips"), settings.clips_max_mb * 1024 * 1024)
+    app.state.clips = clip_store
+
+    library_index = LibraryIndex(
+        os.path.join(settings.data_dir, "library.db"),
+        page_delay=settings.library_page_delay,
+    )
+    app.state.library = library_index
+
+    scheduler = Scheduler(os.path.join(settings.data_dir, "schedule.json"), operations)
+    app.state.scheduler = scheduler
+
+    # Independent disk loads, side by side in the thread pool
+    await asyncio.gather(
+        asyncio.to_thread(os.makedirs, settings.tts_cache_dir, exist_ok=True),
+        asyncio.to_thread(art_cache.load),
+        asyncio.to_thread(capabilities.load),
+        asyncio.to_thread(clip_store.load),
+        asyncio.to_thread(scheduler.load),
+        history_recorder.start(manager, room_state),
+        library_index.start(manager, settings.library_refresh_interval),
+    )
+    await capabilities.start(manager)
+    await scheduler.start(app)
+
+    watchdog = LoopWatchdog(
+        probe_interval=settings.watchdog_probe_interval,
+        max_lag=settings.watchdog_max_lag,
+        pool_timeout=settings.watchdog_pool_timeout,
+        slow_callback=settings.slow_callback_threshold,
+    )
+    await watchdog.start()
+    watchdog.notify("READY=1\nSTATUS=Discovering speakers")
+
+    async def _report_discovery():
+        await manager.wait_discovered()
+        logger.info("Discovery finished", speakers=len(manager.speakers))
+        watchdog.notify(f"STATUS=Serving {len(manager.speakers)} speakers")
+
+    discovery_status = asyncio.create_task(_report_discovery())
+
     yield
 
     logger.info("Shutting down Sonos API")
+    watchdog.notify("STOPPING=1")
+    discovery_status.cancel()
+    await watchdog.stop()
+    await scheduler.stop()
+    await library_index.stop()
+    await capabilities.stop()
+    await history_recorder.stop()
+    await room_state.stop()
     await manager.stop()
+    if soap_capture is not None:
+        await asyncio.to_thread(soap_capture.uninstall)
+    if settings.debug_memory:
+        app.state.memory_profiler.stop()
+    if log_listener is not None:
+        log_listener.stop()
 
 
 app = FastAPI(
@@ -85,23 +251,31 @@ async def root():
     return RedirectResponse(url="/docs")
 
 
-# Serve TTS audio files
-import os
-os.makedirs(settings.tts_cache_dir, exist_ok=True)
-app.mount("/static", StaticFiles(directory=settings.tts_cache_dir), name="static")
+# Serve TTS audio files (the directory is created at startup)
+app.mount("/static", StaticFiles(directory=settings.tts_cache_dir, check_dir=False), name="static")
 
 # Register routers
 app.include_router(system.router, tags=["system"])
+app.include_router(scenes.router, tags=["scenes"])
+app.include_router(clips.router, tags=["clips"])
+app.include_router(history.router, tags=["history"])
+app.include_router(schedule.router, tags=["schedule"])
 app.include_router(state.router, tags=["state"])
 app.include_router(playback.router, tags=["playback"])
 app.include_router(volume.router, tags=["volume"])
 app.include_router(queue.router, tags=["queue"])
 app.include_router(favorites.router, tags=["favorites"])
+app.include_router(library.router, tags=["library"])
 app.include_router(settings_router.router, tags=["settings"])
 app.include_router(tts.router, tags=["tts"])
 app.include_router(groups.router, tags=["groups"])
 app.include_router(equalizer.router, tags=["equalizer"])
+app.include_router(device.router, tags=["device"])
+app.include_router(art.router, tags=["art"])
 app.include_router(events.router, tags=["events"])
+app.include_router(ws.router, tags=["events"])
+if settings.debug_memory:
+    app.include_router(debug.router, tags=["debug"])
 
 
 # Global exception handlers
@@ -115,14 +289,29 @@ async def soco_exception_handler(request: Request, exc: SoCoException):
     )
 
 
+@app.exception_handler(SpeakerBusy)
+async def speaker_busy_handler(request: Request, exc: SpeakerBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"error": "Speaker busy", "detail": str(exc)},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
+@app.exception_handler(Superseded)
+async def superseded_handler(request: Request, exc: Superseded):
+    return JSONResponse(
+        status_code=409,
+        content={"error": "Superseded by a newer request", "detail": str(exc)},
+    )
+
+
 @app.exception_handler(ConnectionError)
 async def connection_error_handler(request: Request, exc: ConnectionError):
     logger = structlog.get_logger()
     logger.error("Connection error", error=str(exc), path=request.url.path)
     # Trigger re-discovery in background
     if hasattr(request.app.state, "speaker_manager"):
-        import asyncio
-
         asyncio.create_task(request.app.state.speaker_manager.trigger_rediscovery())
     return JSONResponse(
         status_code=503,
@@ -17,6 +17,29 @@ class PlayerState(BaseModel):
     volume: int
     mute: bool
     track: TrackInfo = TrackInfo()
+    version: int = 0  # pass as ?since= (or the ETag as If-None-Match) to long-poll for changes
+
+
+class GroupMembership(BaseModel):
+    coordinator: str
+    members: list[str]
+
+
+class RoomSnapshot(BaseModel):
+    # Only the selected fields are present
+    state: str | None = None
+    volume: int | None = None
+    mute: bool | None = None
+    track: TrackInfo | None = None
+    group: GroupMembership | None = None
+    version: int = 0
+    source: str | None = None  # events, cache or speaker
+    age: float | None = None  # seconds since the values were read from the speaker
+    error: str | None = None  # the read failed; any values are from the cache
+
+
+class StateSnapshot(BaseModel):
+    rooms: dict[str, RoomSnapshot]
 
 
 class GroupState(BaseModel):
@@ -45,6 +68,51 @@ class ZoneInfo(BaseModel):
     members: list[MemberInfo]
 
 
+class DeviceFeatures(BaseModel):
+    eq: bool
+    loudness: bool
+    night_mode: bool
+    dialog_mode: bool
+    line_in: bool
+    tv: bool
+
+
+class DeviceBonding(BaseModel):
+    visible: bool = True  # False for stereo-pair secondaries, satellites and subs
+    satellite: bool = False
+    home_theater: bool = False  # soundbar with satellites
+    subwoofer: bool = False
+
+
+class DeviceInfo(BaseModel):
+    room: str
+    uid: str
+    model_name: str
+    model_number: str
+    software_version: str
+    hardware_version: str
+    display_version: str
+    mac_address: str
+    features: DeviceFeatures
+    bonding: DeviceBonding = DeviceBonding()
+    fetched: float  # unix time the info was read from the device
+
+
+class RoomSettings(BaseModel):
+    # None where the speaker doesn't support a setting or reading it failed
+    room: str
+    bass: int | None = None
+    treble: int | None = None
+    loudness: bool | None = None
+    night_mode: bool | None = None
+    dialog_mode: bool | None = None
+    shuffle: bool | None = None
+    repeat: str | None = None
+    crossfade: bool | None = None
+    sleep_timer: int | None = None  # seconds left, 0 when off
+    errors: dict[str, str] = {}
+
+
 class HealthResponse(BaseModel):
     status: str = "ok"
     speakers: int = 0
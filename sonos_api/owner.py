@@ -0,0 +1,112 @@
+"""Owner process for multi-worker deployments.
+
+Runs discovery, event subscriptions, per-speaker locking and all speaker
+I/O (the full app and its lifespan) without an HTTP listener. Workers
+(``sonos_api.worker``) forward requests to it over a Unix socket and read
+room state from a snapshot it publishes in shared memory.
+
+    SONOS_OWNER_SOCKET=/run/sonos-api/owner.sock python -m sonos_api.owner
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+
+from sonos_api.config import settings
+from sonos_api.ipc.rpc import serve_connection
+from sonos_api.ipc.snapshot import SnapshotWriter, snapshot_path
+from sonos_api.main import app, lifespan
+from sonos_api.routers.state import live_zones
+
+logger = logging.getLogger(__name__)
+
+# Republish at least this often so workers can tell a live owner from a dead one
+HEARTBEAT_INTERVAL = 1.0
+
+
+class StatePublisher:
+    """Publishes room state, room keys and groups on every change (coalesced per loop turn)."""
+
+    def __init__(self, writer: SnapshotWriter, manager, store) -> None:
+        self._writer = writer
+        self._manager = manager
+        self._store = store
+        self._scheduled = False
+        self._task: asyncio.Task | None = None
+
+    def schedule(self, _state=None) -> None:
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self.publish)
+
+    def publish(self) -> None:
+        self._scheduled = False
+        live = self._store.live
+        zones_version = self._store.zones_version
+        # Workers fill in the track positions per response, as the owner does
+        zones, zone_rooms = live_zones(self._manager, self._store) if live else (None, None)
+        self._writer.publish({
+            "published": time.time(),
+            "speakers": len(self._manager.speakers),
+            "discovered": self._manager.discovered,
+            "live": live,
+            "keys": self._manager.lookup_table(),
+            "rooms": self._store.export(),
+            "groups": {room: self._manager.group_of(room) for room in self._manager.speakers},
+            "zones_version": zones_version,
+            "zones": zones,
+            "zone_rooms": zone_rooms,
+        })
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self.publish()
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    def start(self) -> None:
+        self._store.add_listener(self.schedule)
+        self._task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self) -> None:
+        self._store.remove_listener(self.schedule)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def serve(path: str) -> None:
+    if os.path.exists(path):
+        os.unlink(path)  # Stale socket from a previous run
+
+    async with lifespan(app):
+        writer = SnapshotWriter(snapshot_path(path))
+        publisher = StatePublisher(writer, app.state.speaker_manager, app.state.room_state)
+        publisher.start()
+        server = await asyncio.start_unix_server(lambda r, w: serve_connection(app, r, w), path=path)
+        os.chmod(path, 0o660)
+        logger.info("Owner listening on %s", path)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        async with server:
+            await stop.wait()
+        await publisher.stop()
+        writer.close()
+    os.unlink(path)
+
+
+def main() -> None:
+    if not settings.owner_socket:
+        raise SystemExit("Set SONOS_OWNER_SOCKET to the Unix socket path the workers connect to")
+    asyncio.run(serve(settings.owner_socket))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from urllib.parse import urlsplit
+
+import requests
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+
+from sonos_api.services.art import SIZES, art_etag, decode_art_token
+
+router = APIRouter()
+
+_CACHE_CONTROL = "public, max-age=2592000, immutable"
+
+
+@router.get("/art/{token}")
+async def get_art(token: str, request: Request, size: int = 0):
+    """Album art proxied from the speaker, optionally scaled to {size} px (64, 128, 256, 512)."""
+    if size not in SIZES:
+        return JSONResponse(status_code=400, content={"error": "Invalid size", "detail": f"Use one of {list(SIZES)}"})
+
+    url = decode_art_token(token)
+    manager = request.app.state.speaker_manager
+    known_hosts = {s.ip_address for s in manager.speakers.values()}
+    if not url or urlsplit(url).hostname not in known_hosts:
+        return JSONResponse(status_code=404, content={"error": "Art not found", "detail": token})
+
+    # Revalidation is answered before the image is loaded or resized
+    headers = {"ETag": art_etag(url, size), "Cache-Control": _CACHE_CONTROL}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    try:
+        image = await request.app.state.art_cache.get(url, size)
+    except requests.RequestException as exc:
+        return JSONResponse(status_code=502, content={"error": "Failed to fetch art from speaker", "detail": str(exc)})
+    return Response(content=image.data, media_type=image.content_type, headers=headers)
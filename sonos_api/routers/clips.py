@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import re
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from sonos_api.config import settings
+from sonos_api.services.announce import play_announcement
+from sonos_api.utils.http import room_not_found
+from sonos_api.utils.network import resolver
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class ClipRequest(BaseModel):
+    volume: int | None = None
+
+
+def _clip_not_found(name: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"error": "Clip not found", "detail": name})
+
+
+@router.get("/clips")
+async def list_clips(request: Request):
+    """List stored clips with their size and duration."""
+    return {"clips": request.app.state.clips.list()}
+
+
+@router.put("/clips/{name}")
+async def upload_clip(name: str, request: Request, duration: float | None = None):
+    """Store a clip: raw audio body with its Content-Type (e.g. audio/mpeg).
+
+    Durations of MP3 and WAV clips are read from the audio; pass
+    `?duration=<seconds>` for other formats so playback needn't poll.
+    """
+    data = await request.body()
+    if not data:
+        return JSONResponse(status_code=400, content={"error": "Empty clip"})
+    try:
+        clip = await request.app.state.clips.add(name, data, request.headers.get("content-type", ""), duration)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": "Invalid clip", "detail": str(exc)})
+    except MemoryError as exc:
+        return JSONResponse(status_code=413, content={"error": "Clip storage full", "detail": str(exc)})
+    return {"status": "ok", **clip.describe()}
+
+
+@router.delete("/clips/{name}")
+async def delete_clip(name: str, request: Request):
+    """Delete a stored clip."""
+    if not await request.app.state.clips.remove(name):
+        return _clip_not_found(name)
+    return {"status": "ok", "deleted": name}
+
+
+@router.api_route("/clips/{name}/audio{ext}", methods=["GET", "HEAD"], include_in_schema=False)
+async def stream_clip(name: str, ext: str, request: Request):
+    """Clip audio for the speakers, from memory, with byte-range support."""
+    clip = request.app.state.clips.get(name)
+    if clip is None:
+        return _clip_not_found(name)
+
+    headers = {"ETag": clip.etag, "Accept-Ranges": "bytes", "Cache-Control": "public, max-age=3600"}
+    size = len(clip.data)
+    header = request.headers.get("range")
+    match = _RANGE_RE.match(header) if header else None
+    if match is None:
+        return Response(content=clip.data, media_type=clip.content_type, headers=headers)
+
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    elif last:
+        start, end = max(0, size - int(last)), size - 1  # Suffix range: last N bytes
+    else:
+        start, end = 0, size - 1
+    if start > end or start >= size:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(content=clip.data[start : end + 1], status_code=206, media_type=clip.content_type, headers=headers)
+
+
+async def _play(manager, speaker, clip, volume: int | None) -> None:
+    uri = f"{resolver.base_url(speaker, settings.api_port)}/clips/{clip.name}/audio{clip.extension}"
+    async with manager.get_lock(speaker):
+        await play_announcement(speaker, uri, title=clip.name, volume=volume, duration=clip.duration)
+
+
+@router.post("/{room}/clip/{name}")
+async def play_clip(room: str, name: str, request: Request, body: ClipRequest = ClipRequest()):
+    """Play a stored clip, then restore volume and playback."""
+    manager = request.app.state.speaker_manager
+    speaker = manager.get(room)
+    if not speaker:
+        return room_not_found(request, room)
+    clip = request.app.state.clips.get(name)
+    if clip is None:
+        return _clip_not_found(name)
+
+    await _play(manager, speaker, clip, body.volume)
+    return {"status": "ok", "clip": clip.name, "duration": clip.duration}
+
+
+@router.post("/clip/{name}")
+async def play_clip_all(name: str, request: Request, body: ClipRequest = ClipRequest()):
+    """Play a stored clip in every group at once (sent to each coordinator)."""
+    manager = request.app.state.speaker_manager
+    clip = request.app.state.clips.get(name)
+    if clip is None:
+        return _clip_not_found(name)
+
+    coordinators = {}
+    for room in manager.speakers:
+        speaker = manager.coordinator(room)
+        coordinators.setdefault(speaker.uid, (room, speaker))
+
+    results = await asyncio.gather(
+        *(_play(manager, speaker, clip, body.volume) for _, speaker in coordinators.values()), return_exceptions=True
+    )
+    played = []
+    for (room, _), result in zip(coordinators.values(), results):
+        if isinstance(result, Exception):
+            logger.warning("Clip %s failed in %s: %s", clip.name, room, result)
+        else:
+            played.append(room)
+    return {"status": "ok", "clip": clip.name, "duration": clip.duration, "rooms": played}
@@ -0,0 +1,40 @@
+import asyncio
+import gc
+
+import soco
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from sonos_api.routers import events
+from sonos_api.utils.memory import GROUPS, count_instances, rss_bytes
+
+router = APIRouter()
+
+
+@router.get("/debug/memory")
+async def memory_report(request: Request, top: int = 15, group: str = "lineno"):
+    """Memory diagnostics: tracemalloc top sites, growth since the last call, live objects.
+
+    Only mounted when `SONOS_DEBUG_MEMORY` is set. `group` is `lineno`,
+    `filename` or `traceback`. Walks the whole heap; expect it to take a
+    while on a Pi.
+    """
+    if group not in GROUPS:
+        return JSONResponse(status_code=400, content={"error": "Invalid group", "detail": group})
+    state = request.app.state
+    gc.collect()
+    report = state.memory_profiler.report(top=max(1, min(top, 100)), group=group)
+    soco_cache = soco.core._ArgsSingleton._instances
+    return {
+        "rss_bytes": rss_bytes(),
+        **report,
+        "objects": {
+            "gc_tracked": len(gc.get_objects()),
+            "soco_devices": count_instances(soco.SoCo),
+            "soco_cached": sum(len(instances) for instances in soco_cache.values()),
+            "speaker_locks": state.speaker_manager.lock_stats(),
+            "sse": events.client_stats(),
+            "tasks": len(asyncio.all_tasks()),
+            "history": state.history.stats(),
+        },
+    }
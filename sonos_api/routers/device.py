@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Request
+
+from sonos_api.models.state import DeviceInfo
+from sonos_api.utils.http import room_not_found
+from sonos_api.utils.priority_lock import Priority
+from sonos_api.utils.retry import retry_soco
+
+router = APIRouter()
+
+
+@router.get("/{room}/info", response_model=DeviceInfo)
+async def get_info(room: str, request: Request):
+    """Model, firmware, hardware features and bonding of a room's speaker.
+
+    Served from the persisted device cache; the speaker is only contacted
+    the first time it is seen and after a firmware update.
+    """
+    manager = request.app.state.speaker_manager
+    speaker = manager.get(room)
+    if not speaker:
+        return room_not_found(request, room)
+
+    capabilities = request.app.state.capabilities
+    device = capabilities.get(speaker.uid)
+    if device is None:
+
+        @retry_soco()
+        async def _read():
+            return await capabilities.ensure(speaker)
+
+        async with manager.get_lock(speaker, Priority.READ):
+            device = await _read()
+
+    bonding = manager.member_info(speaker.uid) or {}
+    return {
+        **device,
+        "room": manager.resolve_name(room),
+        "bonding": {k: bonding[k] for k in ("visible", "satellite", "home_theater", "subwoofer") if k in bonding},
+    }
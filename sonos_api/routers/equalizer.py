@@ -1,10 +1,9 @@
-import asyncio
-
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from sonos_api.utils.retry import retry_soco
+from sonos_api.routers.settings import write_failed
+from sonos_api.utils.http import room_not_found
 
 router = APIRouter()
 
@@ -20,21 +19,14 @@ async def set_equalizer(room: str, body: EqualizerRequest, request: Request):
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
-
-    @retry_soco()
-    async def _set():
-        result = {}
-        if body.bass is not None:
-            val = max(-10, min(10, body.bass))
-            await asyncio.to_thread(lambda: setattr(speaker, "bass", val))
-            result["bass"] = val
-        if body.treble is not None:
-            val = max(-10, min(10, body.treble))
-            await asyncio.to_thread(lambda: setattr(speaker, "treble", val))
-            result["treble"] = val
-        return result
-
-    async with manager.get_lock(room):
-        result = await _set()
-    return {"status": "ok", **result}
+        return room_not_found(request, room)
+    if not request.app.state.capabilities.supports(speaker, "eq"):
+        return JSONResponse(status_code=400, content={"error": "Not supported by this speaker", "detail": "eq"})
+
+    wanted = {}
+    if body.bass is not None:
+        wanted["bass"] = max(-10, min(10, body.bass))
+    if body.treble is not None:
+        wanted["treble"] = max(-10, min(10, body.treble))
+    failed = write_failed(await request.app.state.speaker_settings.write(room, wanted))
+    return failed or {"status": "ok", **wanted}
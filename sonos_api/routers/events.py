@@ -22,6 +22,12 @@ def broadcast(event: str, data: dict) -> None:
             pass  # Drop events for slow clients
 
 
+def client_stats() -> dict:
+    """Connected SSE clients and events queued for them."""
+    clients = list(_clients)
+    return {"clients": len(clients), "queued": sum(q.qsize() for q in clients)}
+
+
 @router.get("/events")
 async def sse_events(request: Request):
     """Server-Sent Events stream for real-time updates."""
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from sonos_api.utils.http import FastJSONResponse, room_not_found
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
@@ -36,25 +37,26 @@ async def get_favorites(request: Request):
 
     favs = await _get()
 
+    # Plain dicts matching FavoriteItem: the data is ours, so skip re-validation
     items = [
-        FavoriteItem(
-            title=getattr(fav, "title", ""),
-            uri=getattr(fav, "reference", {}).get("uri", "") if isinstance(getattr(fav, "reference", None), dict) else str(getattr(fav, "resources", [{}])[0].uri) if getattr(fav, "resources", []) else "",
-            meta=getattr(fav, "resource_meta_data", ""),
-        )
+        {
+            "title": getattr(fav, "title", ""),
+            "uri": getattr(fav, "reference", {}).get("uri", "") if isinstance(getattr(fav, "reference", None), dict) else str(getattr(fav, "resources", [{}])[0].uri) if getattr(fav, "resources", []) else "",
+            "meta": getattr(fav, "resource_meta_data", ""),
+        }
         for fav in favs
     ]
 
-    return FavoritesResponse(total=len(items), items=items)
+    return FastJSONResponse({"total": len(items), "items": items})
 
 
 @router.post("/{room}/favorite/{name}")
 async def play_favorite(room: str, name: str, request: Request):
     """Play a Sonos favorite by name (case-insensitive partial match)."""
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
+    speaker = manager.coordinator(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _get_favs():
@@ -93,7 +95,10 @@ async def play_favorite(room: str, name: str, request: Request):
         if uri:
             await asyncio.to_thread(lambda: speaker.play_uri(uri, meta))
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker):
         await _play()
+    store = request.app.state.room_state
+    store.update(room, transport="PLAYING")
+    store.invalidate_clock(room)
 
     return {"status": "ok", "favorite": getattr(match, "title", "")}
@@ -1,16 +1,18 @@
 import asyncio
+from typing import Annotated
 
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from sonos_api.utils.http import room_not_found
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
 
 
 class GroupVolumeRequest(BaseModel):
-    volume: int | str  # absolute int or "+5"/"-5"
+    volume: int | Annotated[str, Field(pattern=r"^[+-]?\d+$")]  # absolute int or "+5"/"-5"
 
 
 @router.post("/{room}/join/{other}")
@@ -20,9 +22,9 @@ async def join_group(room: str, other: str, request: Request):
     speaker = manager.get(room)
     target = manager.get(other)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
     if not target:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": other})
+        return room_not_found(request, other)
 
     @retry_soco()
     async def _join():
@@ -30,6 +32,7 @@ async def join_group(room: str, other: str, request: Request):
 
     async with manager.get_lock(room):
         await _join()
+    request.app.state.room_state.topology_changed()
     return {"status": "ok", "room": room, "joined": other}
 
 
@@ -39,7 +42,7 @@ async def leave_group(room: str, request: Request):
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _leave():
@@ -47,6 +50,7 @@ async def leave_group(room: str, request: Request):
 
     async with manager.get_lock(room):
         await _leave()
+    request.app.state.room_state.topology_changed()
     return {"status": "ok", "room": room}
 
 
@@ -56,7 +60,7 @@ async def set_group_volume(room: str, body: GroupVolumeRequest, request: Request
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _set():
@@ -74,7 +78,9 @@ async def set_group_volume(room: str, body: GroupVolumeRequest, request: Request
         await asyncio.to_thread(lambda: setattr(group, "volume", target))
         return target
 
-    async with manager.get_lock(room):
+    key = "groupvolume" if isinstance(body.volume, int) else None
+    # Group volume is set through the coordinator
+    async with manager.get_lock(manager.coordinator(room), key=key):
         new_vol = await _set()
 
     if new_vol is None:
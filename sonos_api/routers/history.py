@@ -0,0 +1,56 @@
+import time
+from datetime import datetime
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from sonos_api.utils.http import room_not_found
+
+router = APIRouter()
+
+# Default query window (seconds)
+_DEFAULT_RANGE = 24 * 3600
+
+
+@router.get("/history")
+async def history_overview(request: Request):
+    """Rooms with recorded history, and how much memory it takes."""
+    recorder = request.app.state.history
+    return {"rooms": recorder.rooms(), **recorder.stats()}
+
+
+@router.get("/history/{room}")
+async def room_history(
+    room: str,
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    step: float = 0,
+    at: datetime | None = None,
+):
+    """State changes of a room: transport, track, volume, mute and group.
+
+    `start` and `end` take ISO 8601 times (local time unless an offset is
+    given) or unix seconds, and default to the last 24 hours. `step=<seconds>`
+    downsamples to one row per interval, with the number of changes and the
+    volume range in each. `at=` returns just the state in effect at that time.
+    """
+    recorder = request.app.state.history
+    manager = request.app.state.speaker_manager
+    key = request.app.state.room_state.room_key(room)
+    if key not in recorder.rooms() and manager.resolve_name(room) is None:
+        return room_not_found(request, room)
+
+    if at is not None:
+        entry = recorder.at(key, at.timestamp())
+        if entry is None:
+            return JSONResponse(status_code=404, content={"error": "No history at that time", "detail": at.isoformat()})
+        return {"room": key, **entry}
+
+    end_ts = end.timestamp() if end is not None else time.time()
+    start_ts = start.timestamp() if start is not None else end_ts - _DEFAULT_RANGE
+    if start_ts > end_ts:
+        return JSONResponse(status_code=400, content={"error": "Invalid range", "detail": "start is after end"})
+    if step < 0 or (step and (end_ts - start_ts) / step > 10000):
+        return JSONResponse(status_code=400, content={"error": "Invalid step", "detail": "at most 10000 intervals"})
+    return {"room": key, "start": start_ts, "end": end_ts, "step": step, "history": recorder.query(key, start_ts, end_ts, step)}
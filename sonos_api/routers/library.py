@@ -0,0 +1,106 @@
+import asyncio
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from sonos_api.services.library import CATEGORIES
+from sonos_api.utils.http import room_not_found
+from sonos_api.utils.retry import retry_soco
+
+router = APIRouter()
+
+
+class LibraryItem(BaseModel):
+    id: str
+    type: str
+    title: str
+    artist: str = ""
+    album: str = ""
+    uri: str = ""
+
+
+class LibrarySearchResponse(BaseModel):
+    query: str
+    total: int
+    items: list[LibraryItem]
+
+
+def _invalid_type(kind: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content={"error": "Invalid type", "detail": f"'{kind}' is not one of {list(CATEGORIES)}"},
+    )
+
+
+@router.get("/library/search", response_model=LibrarySearchResponse)
+async def search_library(
+    q: str, request: Request, kind: str | None = Query(None, alias="type"), limit: int = 20,
+):
+    """Search the local music-library index (artists, albums, tracks, playlists, radio)."""
+    if kind is not None and kind not in CATEGORIES:
+        return _invalid_type(kind)
+    library = request.app.state.library
+    rows = await library.search(q, kind, max(1, min(limit, 200)))
+    return LibrarySearchResponse(query=q, total=len(rows), items=[LibraryItem(**row) for row in rows])
+
+
+@router.get("/library/status")
+async def library_status(request: Request):
+    """Index state per category (container UpdateID, item count, last refresh)."""
+    return await request.app.state.library.status()
+
+
+@router.post("/library/refresh")
+async def refresh_library(request: Request, force: bool = False):
+    """Re-crawl changed categories now (or all of them with ?force=true)."""
+    manager = request.app.state.speaker_manager
+    if not manager.speakers:
+        return JSONResponse(status_code=503, content={"error": "No speakers available"})
+    refreshed = await request.app.state.library.refresh(manager, force=force)
+    return {"status": "ok", "refreshed": refreshed}
+
+
+@router.post("/{room}/library/play/{name}")
+async def play_from_library(room: str, name: str, request: Request, kind: str | None = Query(None, alias="type")):
+    """Play the best library match for {name}, replacing the queue."""
+    manager = request.app.state.speaker_manager
+    speaker = manager.coordinator(room)
+    if not speaker:
+        return room_not_found(request, room)
+    if kind is not None and kind not in CATEGORIES:
+        return _invalid_type(kind)
+
+    library = request.app.state.library
+    matches = await library.search(name, kind, 1)
+    if not matches:
+        return JSONResponse(status_code=404, content={"error": "No library match", "detail": name})
+    match = matches[0]
+    item = None
+    if match["type"] != "radio":
+        item = await library.get_item(match["id"])
+        if item is None:
+            return JSONResponse(
+                status_code=409,
+                content={"error": "Library item not playable; refresh the library", "detail": match["title"]},
+            )
+
+    @retry_soco()
+    async def _play():
+        def _do():
+            if match["type"] == "radio":
+                speaker.play_uri(match["uri"], title=match["title"])
+                return
+            speaker.clear_queue()
+            speaker.add_to_queue(item)
+            speaker.play_from_queue(0)
+
+        await asyncio.to_thread(_do)
+
+    async with manager.get_lock(speaker):
+        await _play()
+    store = request.app.state.room_state
+    store.update(room, transport="PLAYING")
+    store.invalidate_clock(room)
+
+    return {"status": "ok", "type": match["type"], "title": match["title"], "artist": match["artist"]}
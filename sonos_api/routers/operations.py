@@ -0,0 +1,178 @@
+import functools
+import inspect
+import json
+import logging
+
+from fastapi import params
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from soco.exceptions import SoCoException
+
+from sonos_api.routers import (
+    clips,
+    device,
+    equalizer,
+    favorites,
+    groups,
+    library,
+    playback,
+    queue,
+    settings,
+    state,
+    system,
+    tts,
+    volume,
+)
+from sonos_api.utils.http import room_not_found
+from sonos_api.utils.priority_lock import SpeakerBusy, Superseded
+
+logger = logging.getLogger(__name__)
+
+# Named operations for channels that bypass FastAPI routing (e.g. the
+# WebSocket control channel). They call the endpoint functions directly so
+# locking, retries and state-cache updates stay in one place.
+# name -> endpoint function; room-scoped operations take a "room" argument.
+OPERATIONS = {
+    "state": state.get_state,
+    "zones": state.get_zones,
+    "play": playback.play,
+    "pause": playback.pause,
+    "playpause": playback.playpause,
+    "next": playback.next_track,
+    "previous": playback.previous_track,
+    "seek": settings.seek,
+    "playmode": settings.set_playmode,
+    "sleep": settings.set_sleep_timer,
+    "settings": settings.get_room_settings,
+    "settings_update": settings.update_room_settings,
+    "volume": volume.set_volume,
+    "mute": volume.mute,
+    "unmute": volume.unmute,
+    "togglemute": volume.togglemute,
+    "equalizer": equalizer.set_equalizer,
+    "info": device.get_info,
+    "join": groups.join_group,
+    "leave": groups.leave_group,
+    "groupvolume": groups.set_group_volume,
+    "queue": queue.get_queue,
+    "queue_add": queue.add_to_queue,
+    "queue_replace": queue.replace_queue,
+    "queue_clear": queue.clear_queue,
+    "favorites": favorites.get_favorites,
+    "favorite": favorites.play_favorite,
+    "library_play": library.play_from_library,
+    "say": tts.say,
+    "clip": clips.play_clip,
+    "clip_all": clips.play_clip_all,
+    "pauseall": system.pause_all,
+    "resumeall": system.resume_all,
+}
+
+
+class OperationError(Exception):
+    def __init__(self, status: int, error: str, detail=None) -> None:
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.detail = detail
+
+
+@functools.lru_cache
+def _adapter(annotation) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def _coerce(annotation, key: str, value):
+    """``value`` validated (and converted, e.g. "5" -> 5.0) against a parameter annotation."""
+    if annotation is inspect.Parameter.empty:
+        return value
+    try:
+        return _adapter(annotation).validate_python(value)
+    except ValidationError as exc:
+        errors = json.loads(exc.json())
+        for error in errors:
+            error["loc"] = [key, *error["loc"]]
+        raise OperationError(422, "Invalid arguments", errors) from None
+
+
+def _bind(func, conn, args: dict) -> dict:
+    kwargs = {}
+    for name, param in inspect.signature(func).parameters.items():
+        annotation = param.annotation
+        if name == "request":
+            kwargs[name] = conn
+        elif name == "response":
+            kwargs[name] = Response()
+        elif inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+            try:
+                kwargs[name] = annotation.model_validate(args.get(name, args))
+            except ValidationError as exc:
+                raise OperationError(422, "Invalid arguments", json.loads(exc.json())) from None
+        else:
+            default = param.default
+            if isinstance(default, params.Param):
+                key = default.alias or name
+                default = default.default
+            else:
+                key = name
+            if key in args:
+                kwargs[name] = _coerce(annotation, key, args[key])
+            elif default is inspect.Parameter.empty:
+                raise OperationError(422, "Missing argument", key)
+            else:
+                kwargs[name] = default
+    return kwargs
+
+
+# Arguments naming a room that must resolve
+_ROOM_ARGS = ("room", "other")
+
+
+def check(conn, op: str, args: dict) -> None:
+    """Validate ``op`` and its arguments without running it. Raises OperationError.
+
+    Arguments are checked against the endpoint's annotations and models,
+    and rooms must be known (404, or 503 before the first discovery).
+    """
+    func = OPERATIONS.get(op)
+    if func is None:
+        raise OperationError(400, "Unknown operation", op)
+    kwargs = _bind(func, conn, args)
+    manager = conn.app.state.speaker_manager
+    for name in _ROOM_ARGS:
+        if name in kwargs and manager.get(kwargs[name]) is None:
+            response = room_not_found(conn, kwargs[name])
+            body = json.loads(response.body)
+            raise OperationError(response.status_code, body["error"], body["detail"])
+
+
+async def invoke(conn, op: str, args: dict) -> tuple[int, object]:
+    """Run operation ``op`` with ``args``. Returns (status code, JSON-able result).
+
+    ``conn`` is the Request or WebSocket the call originates from; endpoint
+    functions only use it to reach ``app.state`` and request headers.
+    """
+    func = OPERATIONS.get(op)
+    if func is None:
+        raise OperationError(400, "Unknown operation", op)
+    kwargs = _bind(func, conn, args)
+
+    try:
+        result = await func(**kwargs)
+    except SoCoException as exc:
+        raise OperationError(502, "Speaker communication error", str(exc)) from None
+    except ConnectionError as exc:
+        raise OperationError(503, "Speaker unreachable", str(exc)) from None
+    except SpeakerBusy as exc:
+        raise OperationError(429, "Speaker busy", {"reason": str(exc), "retry_after": exc.retry_after}) from None
+    except Superseded as exc:
+        raise OperationError(409, "Superseded by a newer request", str(exc)) from None
+
+    if isinstance(result, Response):
+        body = json.loads(result.body) if result.body else None
+        return result.status_code, body
+    if isinstance(result, BaseModel):
+        return 200, result.model_dump()
+    if isinstance(result, list):
+        return 200, [r.model_dump() if isinstance(r, BaseModel) else r for r in result]
+    return 200, result
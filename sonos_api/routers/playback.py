@@ -1,16 +1,17 @@
 import asyncio
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
 
+from sonos_api.utils.http import room_not_found
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
 
 
 def _get_speaker_or_404(request: Request, room: str):
+    """Resolve the speaker that owns {room}'s transport (its group coordinator)."""
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
+    speaker = manager.coordinator(room)
     if not speaker:
         return None, manager
     return speaker, manager
@@ -21,14 +22,15 @@ async def play(room: str, request: Request):
     """Resume playback."""
     speaker, manager = _get_speaker_or_404(request, room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _play():
         await asyncio.to_thread(speaker.play)
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker):
         await _play()
+    request.app.state.room_state.update(room, transport="PLAYING")
     return {"status": "ok"}
 
 
@@ -37,14 +39,15 @@ async def pause(room: str, request: Request):
     """Pause playback."""
     speaker, manager = _get_speaker_or_404(request, room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _pause():
         await asyncio.to_thread(speaker.pause)
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker):
         await _pause()
+    request.app.state.room_state.update(room, transport="PAUSED_PLAYBACK")
     return {"status": "ok"}
 
 
@@ -53,7 +56,7 @@ async def playpause(room: str, request: Request):
     """Toggle play/pause."""
     speaker, manager = _get_speaker_or_404(request, room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _toggle():
@@ -61,11 +64,13 @@ async def playpause(room: str, request: Request):
         state = info.get("current_transport_state", "")
         if state == "PLAYING":
             await asyncio.to_thread(speaker.pause)
-        else:
-            await asyncio.to_thread(speaker.play)
+            return "PAUSED_PLAYBACK"
+        await asyncio.to_thread(speaker.play)
+        return "PLAYING"
 
-    async with manager.get_lock(room):
-        await _toggle()
+    async with manager.get_lock(speaker):
+        new_state = await _toggle()
+    request.app.state.room_state.update(room, transport=new_state)
     return {"status": "ok"}
 
 
@@ -74,14 +79,15 @@ async def next_track(room: str, request: Request):
     """Skip to next track."""
     speaker, manager = _get_speaker_or_404(request, room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _next():
         await asyncio.to_thread(speaker.next)
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker):
         await _next()
+    request.app.state.room_state.invalidate_clock(room)
     return {"status": "ok"}
 
 
@@ -90,12 +96,13 @@ async def previous_track(room: str, request: Request):
     """Go to previous track."""
     speaker, manager = _get_speaker_or_404(request, room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _prev():
         await asyncio.to_thread(speaker.previous)
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker):
         await _prev()
+    request.app.state.room_state.invalidate_clock(room)
     return {"status": "ok"}
@@ -1,14 +1,29 @@
 import asyncio
 
+import orjson
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from soco.exceptions import SoCoException, SoCoUPnPException
 
 from sonos_api.models.state import TrackInfo
+from sonos_api.services.art import encode_art_url
+from sonos_api.utils.http import FastJSONResponse, Snapshots, room_not_found
+from sonos_api.utils.priority_lock import Priority
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
 
+# Sonos accepts at most 16 URIs per AddMultipleURIsToQueue call
+_ADD_CHUNK_SIZE = 16
+
+# GET /{room}/queue reads at most this many tracks, one page per lock hold
+_QUEUE_MAX_ITEMS = 1000
+_QUEUE_PAGE_SIZE = 100
+
+# Serialized GET /{room}/queue bodies keyed by (room, ip), valid for one queue UpdateID
+_snapshots = Snapshots()
+
 
 class QueueItem(BaseModel):
     position: int
@@ -22,51 +37,333 @@ class QueueItem(BaseModel):
 class QueueResponse(BaseModel):
     room: str
     total: int
+    update_id: int = 0
     items: list[QueueItem]
 
 
+class QueueURI(BaseModel):
+    uri: str
+    meta: str = ""  # DIDL-Lite metadata, optional for library/stream URIs
+
+
+class QueueAddRequest(BaseModel):
+    items: list[QueueURI] = Field(min_length=1)
+    position: int | None = None  # 1-based position to insert at; default appends
+    as_next: bool = False
+    update_id: int = 0  # queue UpdateID from GET /{room}/queue; 0 skips the check
+
+
+class QueueReplaceRequest(BaseModel):
+    items: list[QueueURI] = Field(min_length=1)
+    play: bool = True
+    start_track: int = 1  # 1-based
+    update_id: int = 0
+
+
+class QueueReorderRequest(BaseModel):
+    start: int = Field(ge=1)  # 1-based first track to move
+    count: int = Field(default=1, ge=1)
+    insert_before: int = Field(ge=1)  # 1-based position in the current queue
+    update_id: int = 0
+
+
+# UPnP faults caused by the request itself: bad arguments, URIs or metadata
+_CLIENT_FAULTS = {"402", "600", "601", "704", "714", "716"}
+
+
+class QueueEditFailed(Exception):
+    """A queue edit failed, possibly after part of it was applied.
+
+    ``done`` is what was applied before the failure; ``update_id`` the
+    UpdateID the failing call was sent with (0: unchecked).
+    """
+
+    def __init__(self, cause: Exception, done: dict, update_id: int) -> None:
+        super().__init__(str(cause))
+        self.cause = cause
+        self.done = done
+        self.update_id = update_id
+
+
+async def _edit_failed(manager, speaker, room: str, failure: QueueEditFailed) -> JSONResponse:
+    """Map a failed queue edit to 409 (stale update_id), 400 (bad request) or 502."""
+    cause = failure.cause
+    if failure.done:
+        return JSONResponse(
+            status_code=502,
+            content={"error": "Queue edit partly applied", "detail": f"{room}: {cause}", **failure.done},
+        )
+    if not isinstance(cause, SoCoUPnPException):
+        return JSONResponse(status_code=502, content={"error": "Speaker communication error", "detail": f"{room}: {cause}"})
+    if failure.update_id:
+        # Sonos doesn't document a fault code for a mismatched UpdateID: compare instead
+        try:
+            async with manager.get_lock(speaker, Priority.READ):
+                current = await asyncio.to_thread(lambda: speaker.get_queue(max_items=1).update_id)
+        except Exception:
+            current = failure.update_id
+        if int(current or 0) != failure.update_id:
+            return JSONResponse(
+                status_code=409,
+                content={"error": "Queue changed (stale update_id)", "detail": f"{room}: current update_id is {current}"},
+            )
+    status = 400 if str(cause.error_code) in _CLIENT_FAULTS else 502
+    description = cause.error_description or str(cause)
+    return JSONResponse(
+        status_code=status,
+        content={"error": "Queue edit rejected", "detail": f"{room}: UPnP error {cause.error_code}: {description}"},
+    )
+
+
+def _add_uris(speaker, items: list[QueueURI], update_id: int, position: int | None, as_next: bool) -> dict:
+    """Enqueue URIs in chunks, chaining each call's NewUpdateID into the next.
+
+    Not retried: a repeated chunk would be enqueued twice. Raises
+    ``QueueEditFailed`` with what was added so far.
+    """
+    first_track = None
+    length = 0
+    added = 0
+    next_position = position or 0
+    for index in range(0, len(items), _ADD_CHUNK_SIZE):
+        chunk = items[index : index + _ADD_CHUNK_SIZE]
+        try:
+            response = speaker.avTransport.AddMultipleURIsToQueue([
+                ("InstanceID", 0),
+                ("UpdateID", update_id),
+                ("NumberOfURIs", len(chunk)),
+                ("EnqueuedURIs", " ".join(item.uri for item in chunk)),
+                ("EnqueuedURIsMetaData", " ".join(item.meta for item in chunk)),
+                ("ContainerURI", ""),
+                ("ContainerMetaData", ""),
+                ("DesiredFirstTrackNumberEnqueued", next_position),
+                ("EnqueueAsNext", int(as_next)),
+            ])
+        except Exception as exc:
+            done = {"first_track": first_track, "added": added, "length": length, "update_id": update_id} if added else {}
+            raise QueueEditFailed(exc, done, update_id) from exc
+        update_id = int(response.get("NewUpdateID", 0))
+        length = int(response.get("NewQueueLength", 0))
+        added_first = int(response.get("FirstTrackNumberEnqueued", 0))
+        if first_track is None:
+            first_track = added_first
+        tracks = int(response.get("NumTracksAdded", len(chunk)))
+        added += tracks
+        # Keep later chunks contiguous with the first one
+        next_position = added_first + tracks
+        as_next = False
+    return {"first_track": first_track or 0, "added": added, "length": length, "update_id": update_id}
+
+
+async def _read_queue(manager, speaker, read_page) -> tuple[list, int]:
+    """Read up to ``_QUEUE_MAX_ITEMS`` tracks one page per lock hold.
+
+    Restarts if the queue's UpdateID changes between pages; if it keeps
+    changing the (possibly mixed) result is returned with update_id 0.
+    """
+    items: list = []
+    update_id = None
+    restarts = 0
+    while len(items) < _QUEUE_MAX_ITEMS:
+        async with manager.get_lock(speaker, Priority.BACKGROUND):
+            page = await read_page(len(items), min(_QUEUE_PAGE_SIZE, _QUEUE_MAX_ITEMS - len(items)))
+        page_update_id = int(getattr(page, "update_id", 0) or 0)
+        if update_id is not None and page_update_id != update_id:
+            if restarts < 2:
+                restarts += 1
+                items, update_id = [], None
+                continue
+            page_update_id = 0
+        update_id = page_update_id
+        items.extend(page)
+        if not len(page) or len(items) >= page.total_matches:
+            break
+    return items, update_id or 0
+
+
 @router.get("/{room}/queue", response_model=QueueResponse)
 async def get_queue(room: str, request: Request):
-    """Get current queue."""
+    """Get current queue.
+
+    The serialized queue is cached per room and reused while the queue's
+    UpdateID (read with a one-item browse) is unchanged. Otherwise it is
+    fetched in background-priority pages so commands can run in between.
+    """
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
+    speaker = manager.coordinator(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
+    key = (room, speaker.ip_address)
 
     @retry_soco()
-    async def _get():
-        return await asyncio.to_thread(speaker.get_queue, max_items=1000)
-
-    async with manager.get_lock(room):
-        queue = await _get()
-
-    items = [
-        QueueItem(
-            position=i + 1,
-            title=getattr(item, "title", ""),
-            artist=getattr(item, "creator", ""),
-            album=getattr(item, "album", ""),
-            album_art=getattr(item, "album_art_uri", ""),
-            uri=getattr(item, "resources", [{}])[0].uri if getattr(item, "resources", []) else "",
+    async def _page(start: int, count: int):
+        return await asyncio.to_thread(speaker.get_queue, start, count)
+
+    # The probe also passes the request through admission control before any paging
+    async with manager.get_lock(speaker, Priority.READ):
+        probe = await _page(0, 1)
+    cached = _snapshots.get(key, probe.update_id)
+    if cached is not None:
+        return FastJSONResponse(cached)
+
+    queue, update_id = await _read_queue(manager, speaker, _page)
+
+    # Plain dicts matching QueueItem: the data is ours, so skip re-validation
+    art_base = f"http://{speaker.ip_address}:1400"
+    items = []
+    for i, item in enumerate(queue):
+        resources = getattr(item, "resources", None)
+        items.append({
+            "position": i + 1,
+            "title": getattr(item, "title", ""),
+            "artist": getattr(item, "creator", ""),
+            "album": getattr(item, "album", ""),
+            "album_art": encode_art_url(getattr(item, "album_art_uri", ""), art_base),
+            "uri": resources[0].uri if resources else "",
+        })
+
+    body = orjson.dumps({"room": room, "total": len(items), "update_id": update_id, "items": items})
+    if update_id:
+        _snapshots.put(key, update_id, body)
+    return FastJSONResponse(body)
+
+
+@router.post("/{room}/queue")
+async def add_to_queue(room: str, body: QueueAddRequest, request: Request):
+    """Add URIs to the queue in bulk (16 per AddMultipleURIsToQueue call).
+
+    If a later chunk fails, the response is a 502 that still reports the
+    tracks already added (`first_track`, `added`, `update_id`).
+    """
+    manager = request.app.state.speaker_manager
+    speaker = manager.coordinator(room)
+    if not speaker:
+        return room_not_found(request, room)
+
+    try:
+        async with manager.get_lock(speaker):
+            result = await asyncio.to_thread(
+                _add_uris, speaker, body.items, body.update_id, body.position, body.as_next
+            )
+    except QueueEditFailed as failure:
+        return await _edit_failed(manager, speaker, room, failure)
+    return {"status": "ok", **result}
+
+
+@router.put("/{room}/queue")
+async def replace_queue(room: str, body: QueueReplaceRequest, request: Request):
+    """Replace the queue with the given URIs and optionally start playing.
+
+    Not retried. A failure after the queue was cleared is a 502 that says
+    what was done (`cleared`, tracks `added`).
+    """
+    manager = request.app.state.speaker_manager
+    speaker = manager.coordinator(room)
+    if not speaker:
+        return room_not_found(request, room)
+
+    def _replace():
+        if body.update_id:
+            # Clearing takes no UpdateID, so check it explicitly first
+            current = speaker.get_queue(max_items=1).update_id
+            if current != body.update_id:
+                return None, current
+        try:
+            speaker.clear_queue()
+        except Exception as exc:
+            raise QueueEditFailed(exc, {}, 0) from exc
+        try:
+            result = _add_uris(speaker, body.items, 0, None, False)
+        except QueueEditFailed as failure:
+            failure.done = {"cleared": True, "added": 0, **failure.done, "playing": False}
+            raise
+        if body.play:
+            try:
+                speaker.play_from_queue(max(0, body.start_track - 1))
+            except Exception as exc:
+                raise QueueEditFailed(exc, {"cleared": True, **result, "playing": False}, 0) from exc
+        return result, None
+
+    try:
+        async with manager.get_lock(speaker):
+            result, current = await asyncio.to_thread(_replace)
+    except QueueEditFailed as failure:
+        return await _edit_failed(manager, speaker, room, failure)
+    except (SoCoException, OSError) as exc:
+        # The update_id check itself failed; nothing was changed
+        return await _edit_failed(manager, speaker, room, QueueEditFailed(exc, {}, 0))
+    if result is None:
+        return JSONResponse(
+            status_code=409,
+            content={"error": "Queue changed (stale update_id)", "detail": f"{room}: current update_id is {current}"},
         )
-        for i, item in enumerate(queue)
-    ]
+    if body.play:
+        store = request.app.state.room_state
+        store.update(room, transport="PLAYING")
+        store.invalidate_clock(room)
+    return {"status": "ok", "playing": body.play, **result}
+
+
+@router.delete("/{room}/queue/items")
+async def remove_from_queue(room: str, request: Request, start: int, count: int = 1, update_id: int = 0):
+    """Remove {count} tracks starting at 1-based position {start}."""
+    manager = request.app.state.speaker_manager
+    speaker = manager.coordinator(room)
+    if not speaker:
+        return room_not_found(request, room)
+    if start < 1 or count < 1:
+        return JSONResponse(status_code=400, content={"error": "'start' and 'count' must be >= 1"})
 
-    return QueueResponse(room=room, total=len(items), items=items)
+    # Not retried: a repeat of an applied removal without update_id would remove more tracks
+    try:
+        async with manager.get_lock(speaker):
+            response = await asyncio.to_thread(
+                speaker.avTransport.RemoveTrackRangeFromQueue,
+                [("InstanceID", 0), ("UpdateID", update_id), ("StartingIndex", start), ("NumberOfTracks", count)],
+            )
+    except (SoCoException, OSError) as exc:
+        return await _edit_failed(manager, speaker, room, QueueEditFailed(exc, {}, update_id))
+    return {"status": "ok", "removed": count, "update_id": int(response.get("NewUpdateID", 0))}
+
+
+@router.post("/{room}/queue/reorder")
+async def reorder_queue(room: str, body: QueueReorderRequest, request: Request):
+    """Move {count} tracks starting at {start} to before position {insert_before}."""
+    manager = request.app.state.speaker_manager
+    speaker = manager.coordinator(room)
+    if not speaker:
+        return room_not_found(request, room)
+
+    # Not retried, like the other queue edits
+    try:
+        async with manager.get_lock(speaker):
+            await asyncio.to_thread(
+                speaker.avTransport.ReorderTracksInQueue,
+                [
+                    ("InstanceID", 0),
+                    ("StartingIndex", body.start),
+                    ("NumberOfTracks", body.count),
+                    ("InsertBefore", body.insert_before),
+                    ("UpdateID", body.update_id),
+                ],
+            )
+    except (SoCoException, OSError) as exc:
+        return await _edit_failed(manager, speaker, room, QueueEditFailed(exc, {}, body.update_id))
+    return {"status": "ok"}
 
 
 @router.delete("/{room}/queue")
 async def clear_queue(room: str, request: Request):
     """Clear the queue."""
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
+    speaker = manager.coordinator(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _clear():
         await asyncio.to_thread(speaker.clear_queue)
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker):
         await _clear()
     return {"status": "ok"}
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from sonos_api.services import scenes
+
+router = APIRouter()
+
+
+@router.get("/scenes")
+async def list_scenes():
+    """List saved scenes."""
+    return {"scenes": await asyncio.to_thread(scenes.list_scenes)}
+
+
+@router.get("/scenes/{name}")
+async def get_scene(name: str):
+    """Get a saved scene."""
+    try:
+        scene = await asyncio.to_thread(scenes.load_scene, name)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": "Invalid scene name", "detail": str(exc)})
+    if scene is None:
+        return JSONResponse(status_code=404, content={"error": "Scene not found", "detail": name})
+    return scene
+
+
+@router.post("/scenes/{name}/capture")
+async def capture_scene(name: str, request: Request):
+    """Capture groups, sources, volume, mute, EQ and play mode of every room as {name}."""
+    manager = request.app.state.speaker_manager
+    if not manager.speakers:
+        return JSONResponse(status_code=503, content={"error": "No speakers available"})
+    try:
+        scenes.scene_path(name)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": "Invalid scene name", "detail": str(exc)})
+
+    scene = await scenes.capture(manager)
+    await asyncio.to_thread(scenes.save_scene, name, scene)
+    return {"status": "ok", "scene": name, "rooms": [room["name"] for room in scene["rooms"].values()]}
+
+
+@router.post("/scenes/{name}/apply")
+async def apply_scene(name: str, request: Request):
+    """Apply scene {name}, changing only what differs from the current state."""
+    manager = request.app.state.speaker_manager
+    try:
+        scene = await asyncio.to_thread(scenes.load_scene, name)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": "Invalid scene name", "detail": str(exc)})
+    if scene is None:
+        return JSONResponse(status_code=404, content={"error": "Scene not found", "detail": name})
+
+    start = time.monotonic()
+    result = await scenes.apply(manager, request.app.state.room_state, scene)
+    status = "ok" if not result["errors"] else "partial"
+    return {"status": status, "scene": name, "elapsed": round(time.monotonic() - start, 3), **result}
+
+
+@router.delete("/scenes/{name}")
+async def delete_scene(name: str):
+    """Delete a saved scene."""
+    try:
+        deleted = await asyncio.to_thread(scenes.delete_scene, name)
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": "Invalid scene name", "detail": str(exc)})
+    if not deleted:
+        return JSONResponse(status_code=404, content={"error": "Scene not found", "detail": name})
+    return {"status": "ok"}
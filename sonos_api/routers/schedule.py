@@ -0,0 +1,76 @@
+import re
+import time
+from datetime import datetime
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from sonos_api.routers.operations import OperationError
+from sonos_api.services.scheduler import DAYS
+
+router = APIRouter()
+
+_CLOCK_RE = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+
+
+class ScheduleRequest(BaseModel):
+    op: str
+    args: dict = {}
+    at: datetime | None = None
+    daily: str | None = None
+    days: list[str] = []
+
+
+def _job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"error": "Job not found", "detail": job_id})
+
+
+@router.get("/schedule")
+async def list_jobs(request: Request):
+    """List scheduled jobs, soonest first."""
+    return {"jobs": request.app.state.scheduler.jobs()}
+
+
+@router.post("/schedule")
+async def add_job(body: ScheduleRequest, request: Request):
+    """Schedule an operation once (`at`) or every day at `daily` ("HH:MM", local time).
+
+    `op` and `args` are the same as on the WebSocket channel (e.g.
+    `pauseall`, `volume`, `favorite`, `say`, `sleep`), plus `fade` with
+    `{"room", "volume", "duration"}`. `days` limits a daily job to some
+    weekdays (`mon` … `sun`).
+    """
+    if (body.at is None) == (body.daily is None):
+        return JSONResponse(status_code=400, content={"error": "Give either 'at' or 'daily'"})
+    if body.daily is not None and not _CLOCK_RE.match(body.daily):
+        return JSONResponse(status_code=400, content={"error": "Invalid time", "detail": body.daily})
+    days = [day.lower()[:3] for day in body.days]
+    if any(day not in DAYS for day in days):
+        return JSONResponse(status_code=400, content={"error": "Invalid days", "detail": body.days})
+    at = body.at.timestamp() if body.at is not None else None
+    if at is not None and at < time.time():
+        return JSONResponse(status_code=400, content={"error": "Time is in the past", "detail": body.at.isoformat()})
+
+    try:
+        job = request.app.state.scheduler.add(body.op, body.args, at=at, daily=body.daily, days=days)
+    except OperationError as exc:
+        return JSONResponse(status_code=exc.status, content={"error": exc.error, "detail": exc.detail})
+    return {"status": "ok", "job": job.describe()}
+
+
+@router.get("/schedule/{job_id}")
+async def get_job(job_id: str, request: Request):
+    """Get a scheduled job and the result of its last run."""
+    job = request.app.state.scheduler.get(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    return job.describe()
+
+
+@router.delete("/schedule/{job_id}")
+async def cancel_job(job_id: str, request: Request):
+    """Cancel a job; a fade in progress stops where it is."""
+    if not request.app.state.scheduler.cancel(job_id):
+        return _job_not_found(job_id)
+    return {"status": "ok", "cancelled": job_id}
@@ -2,8 +2,11 @@ import asyncio
 
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from sonos_api.models.state import RoomSettings
+from sonos_api.services.speaker_settings import FIELDS, parse_play_mode
+from sonos_api.utils.http import room_not_found
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
@@ -19,60 +22,112 @@ class SeekRequest(BaseModel):
     track: int | None = None  # track number (1-based)
 
 
+# Longest sleep timer a speaker accepts (seconds)
+MAX_SLEEP = 86399
+
+
 class SleepTimerRequest(BaseModel):
-    seconds: int  # 0 to cancel
+    seconds: int = Field(ge=0, le=MAX_SLEEP)  # 0 to cancel
 
 
-# Play mode mapping: (shuffle, repeat) -> SoCo play_mode string
-_PLAY_MODES = {
-    (False, "off"): "NORMAL",
-    (True, "off"): "SHUFFLE_NOREPEAT",
-    (False, "all"): "REPEAT_ALL",
-    (True, "all"): "SHUFFLE",
-    (False, "one"): "REPEAT_ONE",
-    (True, "one"): "SHUFFLE_REPEAT_ONE",
-}
+class RoomSettingsRequest(BaseModel):
+    bass: int | None = None  # -10 to 10
+    treble: int | None = None  # -10 to 10
+    loudness: bool | None = None
+    night_mode: bool | None = None
+    dialog_mode: bool | None = None
+    shuffle: bool | None = None
+    repeat: str | None = None  # "off", "one", "all"
+    crossfade: bool | None = None
+    sleep_timer: int | None = Field(default=None, ge=0, le=MAX_SLEEP)  # seconds, 0 to cancel
 
 
-@router.put("/{room}/playmode")
-async def set_playmode(room: str, body: PlayModeRequest, request: Request):
-    """Set play mode (shuffle/repeat)."""
+_REPEAT_MODES = ("off", "one", "all")
+
+
+def write_failed(result: dict) -> JSONResponse | None:
+    """502 when every setting that had to be sent failed."""
+    if result["errors"] and not result["changed"]:
+        return JSONResponse(
+            status_code=502,
+            content={"error": "Speaker communication error", "detail": result["errors"]},
+        )
+    return None
+
+
+@router.get("/{room}/settings", response_model=RoomSettings)
+async def get_room_settings(room: str, request: Request):
+    """Get EQ, loudness, night and dialog mode, play mode, crossfade and sleep timer.
+
+    Values kept current by events or read in the last few seconds come
+    from the cache; the rest are read concurrently. Settings the speaker
+    doesn't support are null.
+    """
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
-    if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+    if not manager.get(room):
+        return room_not_found(request, room)
+
+    values, errors = await request.app.state.speaker_settings.read(room)
+    mode = values.pop("play_mode")
+    shuffle, repeat = parse_play_mode(mode) if mode is not None else (None, None)
+    return {
+        "room": room,
+        **values,
+        "shuffle": shuffle,
+        "repeat": repeat,
+        "errors": errors,
+    }
+
+
+@router.put("/{room}/settings")
+async def update_room_settings(room: str, body: RoomSettingsRequest, request: Request):
+    """Change any of the settings of `GET /{room}/settings`.
+
+    Only settings that differ from the cached values are sent, in
+    parallel. Returns which were `changed`, `unchanged`, `unsupported`
+    by the speaker, and `errors` by setting.
+    """
+    manager = request.app.state.speaker_manager
+    if not manager.get(room):
+        return room_not_found(request, room)
+    if body.repeat is not None and body.repeat not in _REPEAT_MODES:
+        return JSONResponse(status_code=400, content={"error": "Invalid repeat mode", "detail": body.repeat})
 
-    @retry_soco()
-    async def _set():
-        current_mode = await asyncio.to_thread(lambda: speaker.play_mode)
-        # Parse current mode
-        cur_shuffle = "SHUFFLE" in current_mode
-        if "REPEAT_ONE" in current_mode:
-            cur_repeat = "one"
-        elif "REPEAT" in current_mode or current_mode == "SHUFFLE":
-            cur_repeat = "all"
-        else:
-            cur_repeat = "off"
+    service = request.app.state.speaker_settings
+    wanted = {name: value for name, value in body.model_dump().items() if name in FIELDS and value is not None}
+    for name in ("bass", "treble"):
+        if name in wanted:
+            wanted[name] = max(-10, min(10, wanted[name]))
+    if body.shuffle is not None or body.repeat is not None:
+        wanted["play_mode"] = await service.play_mode(room, body.shuffle, body.repeat)
+
+    result = await service.write(room, wanted)
+    return write_failed(result) or {"status": "ok", **result}
 
-        new_shuffle = body.shuffle if body.shuffle is not None else cur_shuffle
-        new_repeat = body.repeat if body.repeat is not None else cur_repeat
 
-        mode = _PLAY_MODES.get((new_shuffle, new_repeat), "NORMAL")
-        await asyncio.to_thread(lambda: setattr(speaker, "play_mode", mode))
-        return {"shuffle": new_shuffle, "repeat": new_repeat, "mode": mode}
+@router.put("/{room}/playmode")
+async def set_playmode(room: str, body: PlayModeRequest, request: Request):
+    """Set play mode (shuffle/repeat)."""
+    manager = request.app.state.speaker_manager
+    if not manager.coordinator(room):
+        return room_not_found(request, room)
 
-    async with manager.get_lock(room):
-        result = await _set()
-    return {"status": "ok", **result}
+    service = request.app.state.speaker_settings
+    mode = await service.play_mode(room, body.shuffle, body.repeat)
+    failed = write_failed(await service.write(room, {"play_mode": mode}))
+    if failed:
+        return failed
+    shuffle, repeat = parse_play_mode(mode)
+    return {"status": "ok", "shuffle": shuffle, "repeat": repeat, "mode": mode}
 
 
 @router.post("/{room}/seek")
 async def seek(room: str, body: SeekRequest, request: Request):
     """Seek to position (seconds) or track number."""
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
+    speaker = manager.coordinator(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     if body.position is None and body.track is None:
         return JSONResponse(
@@ -91,8 +146,13 @@ async def seek(room: str, body: SeekRequest, request: Request):
             timestamp = f"{h}:{m:02d}:{s:02d}"
             await asyncio.to_thread(lambda: speaker.seek(timestamp))
 
-    async with manager.get_lock(room):
+    async with manager.get_lock(speaker, key="seek" if body.track is None else None):
         await _seek()
+    store = request.app.state.room_state
+    if body.track is not None:
+        store.invalidate_clock(room)
+    else:
+        store.set_position(room, body.position)
     return {"status": "ok"}
 
 
@@ -100,15 +160,8 @@ async def seek(room: str, body: SeekRequest, request: Request):
 async def set_sleep_timer(room: str, body: SleepTimerRequest, request: Request):
     """Set sleep timer (seconds). Use 0 to cancel."""
     manager = request.app.state.speaker_manager
-    speaker = manager.get(room)
-    if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
-
-    @retry_soco()
-    async def _set():
-        duration = None if body.seconds == 0 else body.seconds
-        await asyncio.to_thread(lambda: speaker.set_sleep_timer(duration))
+    if not manager.coordinator(room):
+        return room_not_found(request, room)
 
-    async with manager.get_lock(room):
-        await _set()
-    return {"status": "ok", "seconds": body.seconds}
+    failed = write_failed(await request.app.state.speaker_settings.write(room, {"sleep_timer": body.seconds}))
+    return failed or {"status": "ok", "seconds": body.seconds}
@@ -1,25 +1,49 @@
 import asyncio
+import hashlib
+import time
 
-from fastapi import APIRouter, Request
+import orjson
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import JSONResponse
 
-from sonos_api.models.state import PlayerState, TrackInfo, ZoneInfo, MemberInfo, MemberState, GroupState
+from sonos_api.models.state import PlayerState, StateSnapshot, TrackInfo, ZoneInfo
+from sonos_api.services.art import encode_art_url
+from sonos_api.utils.http import (
+    MAX_WAIT,
+    FastJSONResponse,
+    etag_matches,
+    not_modified,
+    request_version,
+    room_not_found,
+    version_etag,
+)
+from sonos_api.utils.priority_lock import Priority
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
 
 
+_EMPTY_TRACK = TrackInfo().model_dump()
+
+# /zones while live: (zones version, zones, coordinator room key per zone)
+_live_zones: tuple[int, list[dict], list[str]] | None = None
+
+# GET /state fields -> the RoomStateStore part each needs read (group comes from the topology cache)
+STATE_FIELDS = {"state": "transport", "volume": "volume", "mute": "mute", "track": "track", "group": None}
+
+
 @retry_soco()
-async def _get_track_info(speaker) -> TrackInfo:
+async def _get_track_info(speaker) -> dict:
     info = await asyncio.to_thread(speaker.get_current_track_info)
-    return TrackInfo(
-        title=info.get("title", ""),
-        artist=info.get("artist", ""),
-        album=info.get("album", ""),
-        album_art=info.get("album_art_uri", ""),
-        duration=info.get("duration", ""),
-        position=info.get("position", ""),
-        uri=info.get("uri", ""),
-    )
+    return {
+        "title": info.get("title", ""),
+        "artist": info.get("artist", ""),
+        "album": info.get("album", ""),
+        "album_art": encode_art_url(info.get("album_art_uri", ""), f"http://{speaker.ip_address}:1400"),
+        "duration": info.get("duration", ""),
+        "position": info.get("position", ""),
+        "uri": info.get("uri", ""),
+    }
 
 
 @retry_soco()
@@ -29,38 +53,220 @@ async def _get_transport_state(speaker) -> str:
 
 
 @router.get("/{room}/state", response_model=PlayerState)
-async def get_state(room: str, request: Request):
-    """Get the current player state for a room."""
+async def get_state(room: str, request: Request, response: Response, wait: float = 0, since: int | None = None):
+    """Get the current player state for a room.
+
+    Returns 304 when `If-None-Match` matches the current version. With
+    `?wait=<seconds>` (and `since=<version>` or `If-None-Match`) the request
+    is held until the room's state changes, or answered with 304 on timeout.
+    """
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        from fastapi.responses import JSONResponse
+        return room_not_found(request, room)
 
-        return JSONResponse(
-            status_code=404,
-            content={"error": "Room not found", "detail": f"No speaker found for '{room}'"},
-        )
+    store = request.app.state.room_state
+    lock = manager.get_lock(room, Priority.READ)
+    cached = await store.get(room, speaker, lock)
+
+    known = request_version(request, since)
+    if wait > 0 and known is not None:
+        deadline = time.monotonic() + min(wait, MAX_WAIT)
+        poll = store.poll_interval(room)
+        while cached.version <= known:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return not_modified(version_etag(cached.version))
+            # Rooms without an event subscription are re-read every poll interval
+            await store.wait(cached.changed, min(remaining, poll) if poll else remaining)
+            cached = await store.get(room, speaker, lock)
 
-    async with manager.get_lock(room):
-        transport_state = await _get_transport_state(speaker)
-        track = await _get_track_info(speaker)
-        volume = await asyncio.to_thread(lambda: speaker.volume)
-        mute = await asyncio.to_thread(lambda: speaker.mute)
+    etag = version_etag(cached.version)
+    if wait <= 0 and etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
 
     return PlayerState(
         room=room,
-        state=transport_state,
-        volume=volume,
-        mute=mute,
-        track=track,
+        state=cached.transport,
+        volume=cached.volume,
+        mute=cached.mute,
+        track=TrackInfo(**cached.track_info()),
+        version=cached.version,
     )
 
 
+async def _room_snapshot(request: Request, room: str, speaker, fields: list[str], max_age: float | None) -> dict:
+    manager = request.app.state.speaker_manager
+    store = request.app.state.room_state
+    parts = {STATE_FIELDS[field] for field in fields} - {None}
+    source = store.source(room, max_age)
+    state = store.peek(room)
+    entry = {}
+    if parts and source is None:
+        try:
+            async with manager.get_lock(room, Priority.READ):
+                state = await store.read(room, speaker, parts)
+            source = "speaker"
+        except Exception as exc:
+            # One unreachable room shouldn't fail the whole snapshot
+            entry["error"] = str(exc) or type(exc).__name__
+            source = "cache" if state is not None and state.synced else None
+
+    now = time.monotonic()
+    if state is not None and source is not None:
+        for field in fields:
+            if field == "state":
+                entry["state"] = state.transport
+            elif field == "track":
+                entry["track"] = state.track_info(now)
+            elif field != "group":
+                entry[field] = getattr(state, field)
+        entry["version"] = state.version
+    if "group" in fields:
+        # Registry room keys, like the keys of "rooms"
+        entry["group"] = manager.group_of(room)
+        if entry["group"] is None:
+            # Dropped out since the snapshot started (rediscovery)
+            return {"error": "Room no longer known", "source": None}
+    if source == "cache":
+        entry["age"] = round(now - state.synced, 3)
+    elif source is not None:
+        entry["age"] = 0.0
+    entry["source"] = source
+    return entry
+
+
+def live_zones(manager, store) -> tuple[list[dict], list[str]]:
+    """/zones from the topology cache and the room state store, without speaker calls.
+
+    Only valid while ``store.live``. Hidden members (satellites,
+    subwoofers) have no room state and are left out; the group volume is
+    the members' average. ``currentTrack`` is filled in per response by
+    ``fill_tracks``, since the position moves without a version change;
+    the rest is built once per zones version. Returns the zones and each
+    zone's coordinator room key.
+    """
+    global _live_zones
+    version = store.zones_version
+    if _live_zones is not None and _live_zones[0] == version:
+        return _live_zones[1], _live_zones[2]
+
+    zones, keys = [], []
+    for coordinator_uid, uids in manager.groups().items():
+        coordinator_key = manager.resolve_name(coordinator_uid)
+        coordinator_state = store.peek(coordinator_key) if coordinator_key else None
+        if coordinator_state is None:
+            continue
+        rooms = []
+        for uid in uids:
+            info = manager.member_info(uid)
+            key = manager.resolve_name(uid) if info and info["visible"] else None
+            state = store.peek(key) if key else None
+            if state is not None:
+                rooms.append((uid, info["name"], state))
+        if not any(uid == coordinator_uid for uid, _, _ in rooms):
+            continue
+        group_state = {
+            "volume": round(sum(state.volume for _, _, state in rooms) / len(rooms)),
+            "mute": all(state.mute for _, _, state in rooms),
+        }
+        members = [
+            {
+                "uuid": uid,
+                "roomName": name,
+                "coordinator": coordinator_uid,
+                "state": {
+                    "volume": state.volume,
+                    "mute": state.mute,
+                    "playbackState": coordinator_state.transport,
+                    "currentTrack": _EMPTY_TRACK,
+                },
+                "groupState": group_state,
+            }
+            for uid, name, state in rooms
+        ]
+        coord_member = next(m for m in members if m["uuid"] == coordinator_uid)
+        zones.append({"uuid": coordinator_uid, "coordinator": coord_member, "members": members})
+        keys.append(coordinator_key)
+    _live_zones = (version, zones, keys)
+    return zones, keys
+
+
+def fill_tracks(zones: list[dict], tracks: list[dict]) -> list[dict]:
+    """Set each zone's members' ``currentTrack`` (in place) to the zone's entry in ``tracks``."""
+    for zone, track in zip(zones, tracks):
+        for member in zone["members"]:
+            member["state"]["currentTrack"] = track
+    return zones
+
+
+@router.get("/state", response_model=StateSnapshot)
+async def get_all_states(request: Request, fields: str | None = None, max_age: float | None = None):
+    """Get the state of every room in one response.
+
+    `fields` selects any of `state`, `volume`, `mute`, `track` and `group`
+    (default: all). Rooms are read concurrently, and only for the selected
+    fields that aren't cached; `group` comes from the topology cache and
+    never costs a speaker call. Each room reports its `source` (`events`:
+    kept current by subscriptions, `cache`, or `speaker`: read for this
+    request) and `age` in seconds. `max_age` accepts cached values older
+    than the cache TTL.
+    """
+    selected = list(STATE_FIELDS) if fields is None else [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [field for field in selected if field not in STATE_FIELDS]
+    if unknown:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid fields", "detail": f"{', '.join(unknown)} (valid: {', '.join(STATE_FIELDS)})"},
+        )
+    manager = request.app.state.speaker_manager
+    if not manager.discovered:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Discovering speakers", "detail": "No speakers known yet"},
+            headers={"Retry-After": "1"},
+        )
+
+    speakers = dict(manager.speakers)
+    entries = await asyncio.gather(
+        *(_room_snapshot(request, room, speaker, selected, max_age) for room, speaker in speakers.items())
+    )
+    return FastJSONResponse({"rooms": dict(zip(speakers, entries))}, headers={"Cache-Control": "no-cache"})
+
+
 @router.get("/zones", response_model=list[ZoneInfo])
-async def get_zones(request: Request):
-    """Get all zone/group topology."""
+async def get_zones(request: Request, wait: float = 0, since: int | None = None):
+    """Get all zone/group topology.
+
+    While every room is kept current by event subscriptions the response
+    carries a version ETag: `If-None-Match` returns 304 without touching
+    the speakers and `?wait=<seconds>&since=<version>` long-polls for any
+    room or topology change. The response is then built from the
+    event-fed room state without speaker calls (hidden satellites and
+    subwoofers are left out); only the track positions are computed per
+    request. Otherwise the ETag is a hash of the body.
+    """
     manager = request.app.state.speaker_manager
     speakers = manager.speakers
+    store = request.app.state.room_state
+
+    if store.live:
+        known = request_version(request, since)
+        if wait > 0 and known is not None and store.zones_version <= known:
+            if not await store.wait(store.any_changed, min(wait, MAX_WAIT)):
+                return not_modified(version_etag(store.zones_version))
+        version = store.zones_version
+        etag = version_etag(version)
+        if wait <= 0 and etag_matches(request, etag):
+            return not_modified(etag)
+        zones, rooms = live_zones(manager, store)
+        now = time.monotonic()
+        states = [store.peek(room) for room in rooms]
+        tracks = [state.track_info(now) if state is not None else _EMPTY_TRACK for state in states]
+        body = orjson.dumps(fill_tracks(zones, tracks))
+        return FastJSONResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
 
     if not speakers:
         return []
@@ -72,6 +278,7 @@ async def get_zones(request: Request):
     except Exception:
         return []
 
+    # Built as plain dicts matching ZoneInfo: the data is ours, so skip re-validation
     zones = []
     for group in groups:
         coordinator = group.coordinator
@@ -84,31 +291,40 @@ async def get_zones(request: Request):
             group_mute = await asyncio.to_thread(lambda g=group: g.mute)
         except Exception:
             playback_state = "UNKNOWN"
-            current_track = TrackInfo()
+            current_track = _EMPTY_TRACK
             group_volume = 0
             group_mute = False
 
-        group_state = GroupState(volume=group_volume, mute=group_mute)
+        group_state = {"volume": group_volume, "mute": group_mute}
 
         members = []
         for member in group.members:
-            member_name = await asyncio.to_thread(lambda m=member: m.player_name)
+            # Names come from the manager's topology cache; only unknown members cost a call
+            info = manager.member_info(member.uid)
+            if info is not None:
+                member_name = info["name"]
+            else:
+                member_name = await asyncio.to_thread(lambda m=member: m.player_name)
             member_volume = await asyncio.to_thread(lambda m=member: m.volume)
             member_mute = await asyncio.to_thread(lambda m=member: m.mute)
-            members.append(MemberInfo(
-                uuid=member.uid,
-                roomName=member_name,
-                coordinator=coordinator.uid,
-                state=MemberState(
-                    volume=member_volume,
-                    mute=member_mute,
-                    playbackState=playback_state,
-                    currentTrack=current_track,
-                ),
-                groupState=group_state,
-            ))
-
-        coord_member = next(m for m in members if m.uuid == coordinator.uid)
-        zones.append(ZoneInfo(uuid=coordinator.uid, coordinator=coord_member, members=members))
+            members.append({
+                "uuid": member.uid,
+                "roomName": member_name,
+                "coordinator": coordinator.uid,
+                "state": {
+                    "volume": member_volume,
+                    "mute": member_mute,
+                    "playbackState": playback_state,
+                    "currentTrack": current_track,
+                },
+                "groupState": group_state,
+            })
 
-    return zones
+        coord_member = next(m for m in members if m["uuid"] == coordinator.uid)
+        zones.append({"uuid": coordinator.uid, "coordinator": coord_member, "members": members})
+
+    body = orjson.dumps(zones)
+    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return FastJSONResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
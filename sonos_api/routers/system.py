@@ -3,6 +3,7 @@ import asyncio
 from fastapi import APIRouter, Request
 
 from sonos_api.models.state import HealthResponse
+from sonos_api.utils.metrics import metrics
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
@@ -10,22 +11,38 @@ router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse)
 async def health(request: Request):
-    """Health check with device count."""
+    """Health check with device count.
+
+    Answers as soon as the server is up; `status` is `discovering` until
+    the first speaker discovery has finished.
+    """
     manager = request.app.state.speaker_manager
     return HealthResponse(
-        status="ok",
+        status="ok" if manager.discovered else "discovering",
         speakers=len(manager.speakers),
     )
 
 
+@router.get("/metrics")
+async def get_metrics():
+    """Internal metrics (event-loop lag, thread pool latency, stalls)."""
+    return metrics.snapshot()
+
+
 @router.post("/pauseall")
 async def pause_all(request: Request):
     """Pause all zones."""
     manager = request.app.state.speaker_manager
     speakers = manager.speakers
     paused = []
+    coordinators = set()
 
-    for name, speaker in speakers.items():
+    for name in speakers:
+        # One command per group, sent to its coordinator
+        speaker = manager.coordinator(name)
+        if speaker.uid in coordinators:
+            continue
+        coordinators.add(speaker.uid)
 
         @retry_soco()
         async def _pause(s=speaker):
@@ -36,7 +53,7 @@ async def pause_all(request: Request):
             return False
 
         try:
-            async with manager.get_lock(name):
+            async with manager.get_lock(speaker):
                 if await _pause():
                     paused.append(name)
         except Exception:
@@ -51,8 +68,14 @@ async def resume_all(request: Request):
     manager = request.app.state.speaker_manager
     speakers = manager.speakers
     resumed = []
+    coordinators = set()
 
-    for name, speaker in speakers.items():
+    for name in speakers:
+        # One command per group, sent to its coordinator
+        speaker = manager.coordinator(name)
+        if speaker.uid in coordinators:
+            continue
+        coordinators.add(speaker.uid)
 
         @retry_soco()
         async def _resume(s=speaker):
@@ -63,7 +86,7 @@ async def resume_all(request: Request):
             return False
 
         try:
-            async with manager.get_lock(name):
+            async with manager.get_lock(speaker):
                 if await _resume():
                     resumed.append(name)
         except Exception:
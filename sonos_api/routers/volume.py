@@ -1,16 +1,17 @@
 import asyncio
+from typing import Annotated
 
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from sonos_api.utils.http import room_not_found
 from sonos_api.utils.retry import retry_soco
 
 router = APIRouter()
 
 
 class VolumeRequest(BaseModel):
-    volume: int | str  # absolute int or "+5"/"-5"
+    volume: int | Annotated[str, Field(pattern=r"^[+-]?\d+$")]  # absolute int or "+5"/"-5"
 
 
 @router.put("/{room}/volume")
@@ -19,7 +20,7 @@ async def set_volume(room: str, body: VolumeRequest, request: Request):
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _set_vol():
@@ -33,8 +34,11 @@ async def set_volume(room: str, body: VolumeRequest, request: Request):
         await asyncio.to_thread(lambda: setattr(speaker, "volume", target))
         return target
 
-    async with manager.get_lock(room):
+    # Absolute sets are idempotent: a newer queued one replaces this one
+    key = "volume" if isinstance(body.volume, int) else None
+    async with manager.get_lock(room, key=key):
         new_vol = await _set_vol()
+    request.app.state.room_state.update(room, volume=new_vol)
     return {"status": "ok", "volume": new_vol}
 
 
@@ -44,7 +48,7 @@ async def mute(room: str, request: Request):
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _mute():
@@ -52,6 +56,7 @@ async def mute(room: str, request: Request):
 
     async with manager.get_lock(room):
         await _mute()
+    request.app.state.room_state.update(room, mute=True)
     return {"status": "ok", "mute": True}
 
 
@@ -61,7 +66,7 @@ async def unmute(room: str, request: Request):
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _unmute():
@@ -69,6 +74,7 @@ async def unmute(room: str, request: Request):
 
     async with manager.get_lock(room):
         await _unmute()
+    request.app.state.room_state.update(room, mute=False)
     return {"status": "ok", "mute": False}
 
 
@@ -78,7 +84,7 @@ async def togglemute(room: str, request: Request):
     manager = request.app.state.speaker_manager
     speaker = manager.get(room)
     if not speaker:
-        return JSONResponse(status_code=404, content={"error": "Room not found", "detail": room})
+        return room_not_found(request, room)
 
     @retry_soco()
     async def _toggle():
@@ -89,4 +95,5 @@ async def togglemute(room: str, request: Request):
 
     async with manager.get_lock(room):
         new_mute = await _toggle()
+    request.app.state.room_state.update(room, mute=new_mute)
     return {"status": "ok", "mute": new_mute}
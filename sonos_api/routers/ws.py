@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+from collections import deque
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from sonos_api.routers.operations import OperationError, invoke
+from sonos_api.utils.metrics import metrics
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Commands accepted but not yet answered per connection. When the limit is
+# reached the server stops reading, so a client that doesn't drain its
+# replies is throttled by TCP instead of growing server memory.
+_MAX_INFLIGHT = 32
+
+# Fields a state subscription can be narrowed to
+STATE_FIELDS = ("state", "volume", "mute", "track")
+
+
+def _state_data(state) -> dict:
+    return {"state": state.transport, "volume": state.volume, "mute": state.mute, "track": state.track_info()}
+
+
+class _Connection:
+    """One /ws client: per-room command lanes plus a single writer task.
+
+    Commands for the same room run one at a time in arrival order; different
+    rooms run concurrently. Replies are bounded by ``_MAX_INFLIGHT`` and
+    state events are coalesced per room (only the newest is sent), so the
+    outgoing buffer never exceeds one entry per room plus the inflight limit.
+    """
+
+    def __init__(self, websocket: WebSocket) -> None:
+        self.ws = websocket
+        self.store = websocket.app.state.room_state
+        self._slots = asyncio.Semaphore(_MAX_INFLIGHT)
+        self._replies: deque[dict] = deque()
+        self._pending: dict[str, object] = {}  # room -> newest unsent RoomState
+        self._wakeup = asyncio.Event()
+        self._lanes: dict[str, asyncio.Queue] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._rooms: set[str] | None = None
+        self._fields: tuple[str, ...] = STATE_FIELDS
+        self._subscribed = False
+
+    async def run(self) -> None:
+        self.store.add_listener(self._on_state)
+        reader = asyncio.create_task(self._reader())
+        writer = asyncio.create_task(self._writer())
+        try:
+            await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.store.remove_listener(self._on_state)
+            for task in (reader, writer, *self._tasks):
+                task.cancel()
+            await asyncio.gather(reader, writer, *self._tasks, return_exceptions=True)
+
+    # -- outgoing ----------------------------------------------------------
+
+    def _reply(self, message: dict) -> None:
+        self._replies.append(message)
+        self._wakeup.set()
+
+    def _on_state(self, state) -> None:
+        if self._subscribed and (self._rooms is None or state.room in self._rooms):
+            if state.room in self._pending:
+                metrics.inc("ws_state_coalesced")
+            self._pending[state.room] = state
+            self._wakeup.set()
+
+    async def _writer(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._replies or self._pending:
+                if self._replies:
+                    message = self._replies.popleft()
+                    try:
+                        await self.ws.send_text(json.dumps(message))
+                    finally:
+                        self._slots.release()
+                else:
+                    room = next(iter(self._pending))
+                    state = self._pending.pop(room)
+                    await self.ws.send_text(json.dumps(self._state_event(state)))
+
+    def _state_event(self, state) -> dict:
+        data = _state_data(state)
+        return {
+            "event": "state",
+            "room": state.room,
+            "version": state.version,
+            "data": {k: data[k] for k in self._fields},
+        }
+
+    # -- incoming ----------------------------------------------------------
+
+    async def _reader(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                text = await self.ws.receive_text()
+            except WebSocketDisconnect:
+                return
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise ValueError("message must be an object")
+            except ValueError as exc:
+                self._reply({"id": None, "status": 400, "error": "Invalid message", "detail": str(exc)})
+                continue
+
+            op = message.get("op")
+            if op == "subscribe":
+                self._subscribe(message)
+            elif op == "unsubscribe":
+                self._subscribed = False
+                self._pending.clear()
+                self._reply({"id": message.get("id"), "status": 200, "result": {"subscribed": False}})
+            else:
+                self._enqueue(message)
+
+    def _subscribe(self, message: dict) -> None:
+        rooms, fields = message.get("rooms"), message.get("fields")
+        unknown = [f for f in fields or () if f not in STATE_FIELDS]
+        if unknown:
+            self._reply({
+                "id": message.get("id"), "status": 422,
+                "error": "Invalid fields", "detail": f"{unknown} not in {list(STATE_FIELDS)}",
+            })
+            return
+        self._rooms = None if rooms is None else {self.store.room_key(r) for r in rooms}
+        self._fields = tuple(fields) if fields else STATE_FIELDS
+        self._subscribed = True
+        self._reply({
+            "id": message.get("id"), "status": 200,
+            "result": {"subscribed": True, "rooms": rooms, "fields": list(self._fields)},
+        })
+        # Initial snapshot of every cached room the subscription covers
+        for room in list(self.ws.app.state.speaker_manager.speakers) if self._rooms is None else self._rooms:
+            state = self.store.peek(room)
+            if state is not None and state.version:
+                self._on_state(state)
+
+    def _enqueue(self, message: dict) -> None:
+        room = message.get("room") or ""
+        # One lane per room, whichever name, alias, UUID or IP names it; the
+        # operation still gets the string as sent
+        if isinstance(room, str) and room:
+            room = self.store.room_key(room)
+        lane = self._lanes.get(room)
+        if lane is None:
+            lane = self._lanes[room] = asyncio.Queue()
+            task = asyncio.create_task(self._run_lane(room, lane))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        lane.put_nowait(message)
+
+    async def _run_lane(self, room: str, lane: asyncio.Queue) -> None:
+        while not lane.empty():
+            message = lane.get_nowait()
+            self._reply(await self._execute(message))
+        del self._lanes[room]
+
+    async def _execute(self, message: dict) -> dict:
+        msg_id = message.get("id")
+        args = message.get("args") or {}
+        if not isinstance(args, dict):
+            return {"id": msg_id, "status": 400, "error": "Invalid message", "detail": "args must be an object"}
+        if message.get("room"):
+            args = {**args, "room": message["room"]}
+        try:
+            status, result = await invoke(self.ws, message.get("op"), args)
+        except OperationError as exc:
+            return {"id": msg_id, "status": exc.status, "error": exc.error, "detail": exc.detail}
+        except Exception as exc:
+            logger.exception("WebSocket operation %s failed", message.get("op"))
+            return {"id": msg_id, "status": 500, "error": "Internal server error", "detail": str(exc)}
+        return {"id": msg_id, "status": status, "result": result}
+
+
+@router.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    """Multiplexed command and state-subscription channel."""
+    await websocket.accept()
+    metrics.inc("ws_connections")
+    try:
+        await _Connection(websocket).run()
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Time from play_uri returning to audio actually coming out of the speaker
+_START_MARGIN = 1.0
+_MAX_POLL = 60  # seconds, when the duration is unknown
+
+
+async def play_announcement(
+    speaker, uri: str, title: str = "Announcement", volume: int | None = None, duration: float | None = None
+) -> None:
+    """Interrupt a speaker with ``uri``, then restore volume, mute and playback.
+
+    With a known ``duration`` the restore is scheduled for when the audio
+    ends and no thread sits polling the transport state; otherwise the
+    transport is polled once a second until it stops.
+    """
+
+    def _start():
+        # Save current state
+        saved = {
+            "volume": speaker.volume,
+            "mute": speaker.mute,
+            "playing": speaker.get_current_transport_info().get("current_transport_state") == "PLAYING",
+        }
+        try:
+            if volume is not None:
+                speaker.volume = volume
+            if saved["mute"]:
+                speaker.mute = False
+            speaker.play_uri(uri, title=title)
+        except BaseException:
+            _restore(saved)
+            raise
+        return saved
+
+    def _wait():
+        time.sleep(1)  # Give it a moment to start
+        for _ in range(_MAX_POLL):
+            state = speaker.get_current_transport_info().get("current_transport_state", "")
+            if state in ("STOPPED", "PAUSED_PLAYBACK"):
+                break
+            time.sleep(1)
+
+    def _restore(saved):
+        speaker.volume = saved["volume"]
+        speaker.mute = saved["mute"]
+        if saved["playing"]:
+            try:
+                speaker.play()
+            except Exception:
+                pass  # Previous track may no longer be available
+
+    saved = await asyncio.to_thread(_start)
+    try:
+        if duration is not None:
+            await asyncio.sleep(duration + _START_MARGIN)
+        else:
+            await asyncio.to_thread(_wait)
+    finally:
+        await asyncio.to_thread(_restore, saved)
@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from sonos_api.config import settings
+from sonos_api.utils.metrics import metrics
+
+try:
+    from PIL import Image
+except ImportError:  # Resizing is optional; originals are served instead
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Thumbnail edge lengths clients may request (0 = original)
+SIZES = (0, 64, 128, 256, 512)
+
+_SONOS_PORT = 1400
+
+
+def encode_art_url(src: str, base: str = "") -> str:
+    """Rewrite a speaker-local album art URL to a proxy path.
+
+    Relative ``/getaa?...`` URLs are resolved against ``base``
+    (``http://<ip>:1400``). URLs not served by a speaker are returned as-is.
+    """
+    if not src or not settings.art_proxy:
+        return src
+    if base and src.startswith("/"):
+        src = urljoin(base, src)
+    if urlsplit(src).port != _SONOS_PORT:
+        return src
+    token = base64.urlsafe_b64encode(src.encode()).decode().rstrip("=")
+    return f"/art/{token}"
+
+
+def decode_art_token(token: str) -> str | None:
+    try:
+        return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def art_etag(url: str, size: int) -> str:
+    """ETag of the image for ``url`` at ``size``.
+
+    From the key alone, so revalidation needs no image: art URLs carry the
+    track, and their content is treated as immutable (see Cache-Control).
+    """
+    return f'"{hashlib.sha1(url.encode()).hexdigest()[:16]}-{size}"'
+
+
+class ArtImage:
+    __slots__ = ("data", "content_type")
+
+    def __init__(self, data: bytes, content_type: str) -> None:
+        self.data = data
+        self.content_type = content_type
+
+
+class ArtCache:
+    """Two-level album art cache: in-memory LRU over a size-bounded disk cache.
+
+    Each source image is fetched from the speaker once per key (concurrent
+    requests for the same key share one fetch, which runs in its own task so
+    a client going away doesn't cancel it for the others) and every
+    thumbnail size is rendered once and then kept on disk.
+    """
+
+    def __init__(self, directory: str, max_disk_bytes: int, max_memory_bytes: int, timeout: float = 5.0) -> None:
+        self._dir = Path(directory)
+        self._max_disk = max_disk_bytes
+        self._max_memory = max_memory_bytes
+        self._timeout = timeout
+        self._memory: OrderedDict[str, ArtImage] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()  # filename -> size, oldest first
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def load(self) -> None:
+        """Index existing cache files (oldest access first)."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        entries = sorted(self._dir.iterdir(), key=lambda p: p.stat().st_mtime)
+        for path in entries:
+            if path.suffix == ".tmp":
+                continue
+            size = path.stat().st_size
+            self._disk[path.name] = size
+            self._disk_bytes += size
+
+    async def get(self, url: str, size: int) -> ArtImage:
+        """Return the image for ``url`` scaled to ``size``, fetching it if needed."""
+        key = hashlib.sha1(url.encode()).hexdigest()
+        name = f"{key}_{size}"
+
+        image = self._memory.get(name)
+        if image is not None:
+            self._memory.move_to_end(name)
+            metrics.inc("art_cache_memory_hits")
+            return image
+
+        task = self._inflight.get(name)
+        if task is None:
+            task = self._inflight[name] = asyncio.create_task(self._fill(url, key, size, name))
+            # Retrieve the outcome even if every waiter has gone away
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        # Cancelling one waiter leaves the shared fetch running for the rest
+        return await asyncio.shield(task)
+
+    async def _fill(self, url: str, key: str, size: int, name: str) -> ArtImage:
+        try:
+            image = await self._load(url, key, size)
+            self._remember(name, image)
+            return image
+        finally:
+            del self._inflight[name]
+
+    async def _load(self, url: str, key: str, size: int) -> ArtImage:
+        cached = await asyncio.to_thread(self._read_disk, f"{key}_{size}")
+        if cached is not None:
+            metrics.inc("art_cache_disk_hits")
+            return cached
+
+        if size:
+            original = await self.get(url, 0)
+            image = await asyncio.to_thread(self._resize, original, size)
+        else:
+            metrics.inc("art_cache_fetches")
+            image = await asyncio.to_thread(self._fetch, url)
+        await asyncio.to_thread(self._write_disk, f"{key}_{size}", image)
+        return image
+
+    def _fetch(self, url: str) -> ArtImage:
+        response = requests.get(url, timeout=self._timeout)
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "image/jpeg").split(";")[0]
+        return ArtImage(response.content, content_type)
+
+    @staticmethod
+    def _resize(original: ArtImage, size: int) -> ArtImage:
+        if Image is None:
+            return original
+        with Image.open(io.BytesIO(original.data)) as img:
+            if max(img.size) <= size:
+                return original
+            img.thumbnail((size, size))
+            out = io.BytesIO()
+            img.convert("RGB").save(out, format="JPEG", quality=85, optimize=True)
+        data = out.getvalue()
+        return ArtImage(data, "image/jpeg")
+
+    def _read_disk(self, name: str) -> ArtImage | None:
+        with self._disk_lock:
+            if name not in self._disk:
+                return None
+            self._disk.move_to_end(name)
+        path = self._dir / name
+        try:
+            raw = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        content_type, _, data = raw.partition(b"\n")
+        return ArtImage(data, content_type.decode())
+
+    def _write_disk(self, name: str, image: ArtImage) -> None:
+        path = self._dir / name
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(image.content_type.encode() + b"\n" + image.data)
+        tmp.replace(path)
+        size = path.stat().st_size
+        evicted = []
+        with self._disk_lock:
+            self._disk_bytes += size - self._disk.pop(name, 0)
+            self._disk[name] = size
+            while self._disk_bytes > self._max_disk and len(self._disk) > 1:
+                old, old_size = self._disk.popitem(last=False)
+                self._disk_bytes -= old_size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                (self._dir / old).unlink()
+            except OSError:
+                pass
+
+    def _remember(self, name: str, image: ArtImage) -> None:
+        if len(image.data) > self._max_memory:
+            return
+        previous = self._memory.pop(name, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous.data)
+        self._memory[name] = image
+        self._memory_bytes += len(image.data)
+        while self._memory_bytes > self._max_memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.data)
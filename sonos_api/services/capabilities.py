@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+
+from sonos_api.utils.priority_lock import Priority
+
+logger = logging.getLogger(__name__)
+
+# Feature flags reported by /{room}/info and checked before commands
+FEATURES = ("eq", "loudness", "night_mode", "dialog_mode", "line_in", "tv")
+
+
+def _probe(call) -> bool:
+    try:
+        call()
+    except Exception:
+        return False
+    return True
+
+
+def _read_device(speaker) -> dict:
+    """Read static device info (runs in a thread; several SOAP calls)."""
+    info = speaker.get_speaker_info(refresh=True, timeout=5)
+    soundbar = speaker.is_soundbar
+    return {
+        "uid": speaker.uid,
+        "model_name": info.get("model_name") or "",
+        "model_number": info.get("model_number") or "",
+        "software_version": info.get("software_version") or "",
+        "hardware_version": info.get("hardware_version") or "",
+        "display_version": info.get("display_version") or "",
+        "mac_address": info.get("mac_address") or "",
+        "features": {
+            # Bridges, Boosts and Subs have no EQ
+            "eq": _probe(lambda: speaker.bass),
+            "loudness": _probe(lambda: speaker.loudness),
+            "night_mode": soundbar,
+            "dialog_mode": soundbar,
+            "line_in": _probe(lambda: speaker.audioIn.GetAudioInputAttributes()),
+            "tv": soundbar,
+        },
+        "fetched": time.time(),
+    }
+
+
+class CapabilityCache:
+    """Static per-device info (model, firmware, hardware features).
+
+    Read once per device and firmware version and persisted to disk. On
+    startup each known device costs one device-description fetch to check
+    its firmware; the feature probes only run again when it changed.
+    Bonding (satellite/stereo pair/home theater) comes from the group
+    topology the manager already reads and is never fetched separately.
+    """
+
+    def __init__(self, path: str, interval: float = 30.0) -> None:
+        self._path = Path(path)
+        self._interval = interval
+        self._devices: dict[str, dict] = {}
+        self._checked: set[str] = set()  # firmware verified by this process
+        self._task: asyncio.Task | None = None
+
+    def load(self) -> None:
+        """Read the persisted cache (blocking; call from a thread)."""
+        try:
+            self._devices = json.loads(self._path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            logger.warning("Ignoring corrupt device cache %s", self._path)
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._devices, separators=(",", ":")))
+        tmp.replace(self._path)
+
+    async def start(self, manager) -> None:
+        self._task = asyncio.create_task(self._refresh_loop(manager))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _refresh_loop(self, manager) -> None:
+        await manager.wait_discovered()
+        while True:
+            for speaker in list(manager.speakers.values()):
+                if speaker.uid not in self._checked:
+                    try:
+                        async with manager.get_lock(speaker, Priority.BACKGROUND):
+                            await self.ensure(speaker)
+                    except Exception as exc:
+                        logger.warning("Reading device info for %s failed: %s", speaker.ip_address, exc)
+            await asyncio.sleep(self._interval)
+
+    # -- reads -------------------------------------------------------------
+
+    def get(self, uid: str) -> dict | None:
+        return self._devices.get(uid)
+
+    def supports(self, speaker, feature: str) -> bool:
+        """False only when the device is known to lack ``feature``."""
+        device = self._devices.get(speaker.uid)
+        return device is None or device["features"].get(feature, True)
+
+    async def ensure(self, speaker) -> dict:
+        """Device info, (re)read if unknown or the firmware changed. Caller holds the lock."""
+        device = self._devices.get(speaker.uid)
+        if device is not None and speaker.uid in self._checked:
+            return device
+        if device is not None:
+            version = await asyncio.to_thread(
+                lambda: speaker.get_speaker_info(refresh=True, timeout=5).get("software_version")
+            )
+            if version == device["software_version"]:
+                self._checked.add(speaker.uid)
+                return device
+            logger.info("Firmware of %s changed to %s, re-reading capabilities", speaker.uid, version)
+
+        device = await asyncio.to_thread(_read_device, speaker)
+        self._devices[speaker.uid] = device
+        self._checked.add(speaker.uid)
+        await asyncio.to_thread(self._save)
+        return device
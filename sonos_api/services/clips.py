@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import io
+import logging
+import re
+import wave
+from pathlib import Path
+
+from sonos_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_CLIP_NAME_RE = re.compile(r"^[a-z0-9_-]{1,64}$")
+
+# Content type -> file extension for the formats Sonos plays over HTTP
+CONTENT_TYPES = {
+    "audio/mpeg": ".mp3",
+    "audio/x-wav": ".wav",
+    "audio/wav": ".wav",
+    "audio/flac": ".flac",
+    "audio/ogg": ".ogg",
+    "audio/aac": ".aac",
+    "audio/mp4": ".m4a",
+}
+_EXTENSIONS = {ext: content_type for content_type, ext in CONTENT_TYPES.items()}
+
+# MPEG audio Layer III tables: kbps by bitrate index, Hz by sample rate index
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_duration(data: bytes) -> float | None:
+    """Duration of a Layer III stream from its first frame (Xing header or CBR)."""
+    start = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        start = 10 + size + (10 if data[5] & 0x10 else 0)
+    end = len(data) - (128 if data[-128:-125] == b"TAG" else 0)
+
+    # First frame sync: 11 set bits, Layer III
+    pos = data.find(b"\xff", start)
+    while 0 <= pos < end - 4 and not (data[pos + 1] & 0xE0 == 0xE0 and data[pos + 1] & 0x06 == 0x02):
+        pos = data.find(b"\xff", pos + 1)
+    if pos < 0 or pos >= end - 4:
+        return None
+    version = (data[pos + 1] >> 3) & 0x03  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 0x03
+    if version not in _MP3_RATES or rate_index == 3 or bitrate_index in (0, 15):
+        return None
+    sample_rate = _MP3_RATES[version][rate_index]
+    samples = 1152 if version == 3 else 576
+    mono = data[pos + 3] >> 6 == 3
+
+    # VBR files carry the frame count in a Xing/Info header after the side info
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    xing = pos + 4 + side_info
+    if data[xing : xing + 4] in (b"Xing", b"Info") and data[xing + 7] & 0x01:
+        frames = int.from_bytes(data[xing + 8 : xing + 12], "big")
+        return frames * samples / sample_rate
+
+    bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    return (end - pos) * 8 / bitrate
+
+
+def audio_duration(data: bytes, content_type: str) -> float | None:
+    """Playing time in seconds for MP3 and WAV data, None when it can't be told."""
+    try:
+        if content_type == "audio/mpeg":
+            return _mp3_duration(data)
+        if content_type in ("audio/wav", "audio/x-wav"):
+            with wave.open(io.BytesIO(data)) as wav:
+                return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, IndexError, ZeroDivisionError):
+        pass
+    return None
+
+
+class Clip:
+    __slots__ = ("name", "data", "content_type", "duration", "etag")
+
+    def __init__(self, name: str, data: bytes, content_type: str, duration: float | None) -> None:
+        self.name = name
+        self.data = data
+        self.content_type = content_type
+        self.duration = duration
+        self.etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+
+    @property
+    def extension(self) -> str:
+        return CONTENT_TYPES[self.content_type]
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "content_type": self.content_type,
+            "size": len(self.data),
+            "duration": self.duration,
+        }
+
+
+class ClipStore:
+    """Short audio clips (doorbells, chimes) held in memory.
+
+    Clips are uploaded once, written to ``directory`` and served to the
+    speakers straight from memory, so playing one never touches the disk
+    or generates anything. The total size is bounded by ``max_bytes``.
+    A ``<name>.duration`` file next to a clip keeps a duration given at
+    upload for formats whose length can't be parsed.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._clips: dict[str, Clip] = {}
+        self._bytes = 0
+
+    @staticmethod
+    def check_name(name: str) -> str:
+        """Normalized clip name. Raises ValueError for invalid names."""
+        name = name.strip().lower()
+        if not _CLIP_NAME_RE.match(name):
+            raise ValueError(f"Invalid clip name '{name}' (use a-z, 0-9, '_' or '-')")
+        return name
+
+    def load(self) -> None:
+        """Read all stored clips into memory (blocking; call from a thread)."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self._dir.iterdir()):
+            content_type = _EXTENSIONS.get(path.suffix)
+            if content_type is None:
+                continue
+            data = path.read_bytes()
+            if self._bytes + len(data) > self._max_bytes:
+                logger.warning("Clip memory limit reached, not loading %s", path.name)
+                continue
+            duration = None
+            duration_file = path.with_suffix(".duration")
+            if duration_file.exists():
+                try:
+                    duration = float(duration_file.read_text())
+                except (OSError, ValueError) as exc:
+                    logger.warning("Ignoring unreadable %s: %s", duration_file.name, exc)
+            if duration is None:
+                duration = audio_duration(data, content_type)
+            self._clips[path.stem] = Clip(path.stem, data, content_type, duration)
+            self._bytes += len(data)
+        logger.info("Loaded %d clips (%d KiB)", len(self._clips), self._bytes // 1024)
+
+    def get(self, name: str) -> Clip | None:
+        clip = self._clips.get(name.lower())
+        if clip is not None:
+            metrics.inc("clip_hits")
+        return clip
+
+    def list(self) -> list[dict]:
+        return [clip.describe() for clip in sorted(self._clips.values(), key=lambda c: c.name)]
+
+    async def add(self, name: str, data: bytes, content_type: str, duration: float | None = None) -> Clip:
+        """Store a clip. Raises ValueError for bad names/types and MemoryError when full."""
+        name = self.check_name(name)
+        content_type = content_type.split(";")[0].strip().lower()
+        if content_type not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported content type '{content_type}' (use one of {sorted(set(CONTENT_TYPES))})")
+        old = self._clips.get(name)
+        if self._bytes - (len(old.data) if old else 0) + len(data) > self._max_bytes:
+            raise MemoryError("Clip storage is full")
+
+        clip = Clip(name, data, content_type, duration if duration is not None else audio_duration(data, content_type))
+        await asyncio.to_thread(self._write, clip, duration is not None)
+        self._clips[name] = clip
+        self._bytes += len(data) - (len(old.data) if old else 0)
+        return clip
+
+    async def remove(self, name: str) -> bool:
+        clip = self._clips.pop(name.lower(), None)
+        if clip is None:
+            return False
+        self._bytes -= len(clip.data)
+        await asyncio.to_thread(self._delete, clip.name)
+        return True
+
+    def _write(self, clip: Clip, explicit_duration: bool) -> None:
+        self._delete(clip.name)
+        path = self._dir / f"{clip.name}{clip.extension}"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(clip.data)
+        tmp.replace(path)
+        if explicit_duration:
+            path.with_suffix(".duration").write_text(str(clip.duration))
+
+    def _delete(self, name: str) -> None:
+        for path in self._dir.glob(f"{name}.*"):
+            path.unlink(missing_ok=True)
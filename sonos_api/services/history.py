@@ -0,0 +1,298 @@
+import asyncio
+import base64
+import bisect
+import json
+import logging
+import time
+import zlib
+from array import array
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Column name -> array typecode. Strings are stored as indexes into a
+# shared intern table, so a row costs 27 bytes however long the titles are.
+_COLUMNS = {
+    "time": "d",  # unix time
+    "state": "I",
+    "title": "I",
+    "artist": "I",
+    "album": "I",
+    "group": "I",  # coordinator room name
+    "volume": "b",
+    "mute": "b",
+}
+_STRING_COLUMNS = ("state", "title", "artist", "album", "group")
+_FORMAT_VERSION = 1
+
+# Group membership only changes through topology events, which don't touch
+# room state; check for such changes this often
+_GROUP_CHECK_INTERVAL = 10.0
+
+
+class _Strings:
+    """Intern table shared by all rooms."""
+
+    def __init__(self, values: list[str] | None = None) -> None:
+        self.values = values or [""]
+        self._index = {value: i for i, value in enumerate(self.values)}
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class RoomHistory:
+    """Fixed-size ring buffer of state changes for one room, column-wise."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.columns = {name: array(code) for name, code in _COLUMNS.items()}
+        self._head = 0  # next slot to overwrite once full
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def append(self, row: dict) -> None:
+        if len(self) < self.capacity:
+            for name, column in self.columns.items():
+                column.append(row[name])
+        else:
+            for name, column in self.columns.items():
+                column[self._head] = row[name]
+            self._head = (self._head + 1) % self.capacity
+
+    def last(self) -> dict | None:
+        if not len(self):
+            return None
+        index = (self._head - 1) % len(self)
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def ordered(self) -> dict[str, array]:
+        """Columns oldest first."""
+        if self._head == 0:
+            return self.columns
+        return {name: column[self._head :] + column[: self._head] for name, column in self.columns.items()}
+
+
+class HistoryRecorder:
+    """Records every room state change in memory, with periodic disk snapshots.
+
+    One ring buffer per room holds the last ``capacity`` changes of
+    transport state, track, volume, mute and group. The whole history is
+    written to ``path`` every ``snapshot_interval`` seconds (and at
+    shutdown) as compressed columns, and read back on start.
+    """
+
+    def __init__(self, path: str, capacity: int = 10000, snapshot_interval: float = 300.0) -> None:
+        self._path = Path(path)
+        self._capacity = capacity
+        self._snapshot_interval = snapshot_interval
+        self._strings = _Strings()
+        self._rooms: dict[str, RoomHistory] = {}
+        self._manager = None
+        self._store = None
+        self._dirty = False
+        self._tasks: list[asyncio.Task] = []
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self, manager, store) -> None:
+        self._manager = manager
+        self._store = store
+        await asyncio.to_thread(self._load)
+        store.add_listener(self._on_state)
+        self._tasks = [asyncio.create_task(self._snapshot_loop()), asyncio.create_task(self._group_loop())]
+
+    async def stop(self) -> None:
+        if self._store is not None:
+            self._store.remove_listener(self._on_state)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._dirty:
+            await self._save()
+
+    # -- recording ---------------------------------------------------------
+
+    def _group_of(self, room: str) -> str:
+        coordinator = self._manager.coordinator(room) if self._manager is not None else None
+        if coordinator is None:
+            return room
+        info = self._manager.member_info(coordinator.uid)
+        return self._store.room_key(info["name"]) if info else room
+
+    def _on_state(self, state) -> None:
+        self.record(state.room, state.transport, state.track, state.volume, state.mute, self._group_of(state.room))
+
+    def record(self, room: str, transport: str, track: dict, volume: int, mute: bool, group: str) -> None:
+        intern = self._strings.intern
+        row = {
+            "time": time.time(),
+            "state": intern(transport),
+            "title": intern(track.get("title", "")),
+            "artist": intern(track.get("artist", "")),
+            "album": intern(track.get("album", "")),
+            "group": intern(group),
+            "volume": max(0, min(100, int(volume))),
+            "mute": int(bool(mute)),
+        }
+        history = self._rooms.get(room)
+        if history is None:
+            history = self._rooms[room] = RoomHistory(self._capacity)
+        last = history.last()
+        if last is not None and all(last[k] == row[k] for k in row if k != "time"):
+            return
+        history.append(row)
+        self._dirty = True
+
+    async def _group_loop(self) -> None:
+        while True:
+            await asyncio.sleep(_GROUP_CHECK_INTERVAL)
+            for room, history in list(self._rooms.items()):
+                last = history.last()
+                state = self._store.peek(room)
+                if last is not None and state is not None:
+                    group = self._group_of(room)
+                    if self._strings.values[last["group"]] != group:
+                        self.record(room, state.transport, state.track, state.volume, state.mute, group)
+
+    # -- queries -----------------------------------------------------------
+
+    def rooms(self) -> list[str]:
+        return sorted(self._rooms)
+
+    def query(self, room: str, start: float, end: float, step: float = 0) -> list[dict]:
+        """Rows in [start, end]; with ``step`` one row per ``step`` seconds.
+
+        Plain rows are the changes in the range, led by the state in effect
+        at ``start``. Downsampled rows are the state at the end of each
+        interval, with how many changes it held and its volume range.
+        """
+        history = self._rooms.get(room)
+        if history is None:
+            return []
+        columns = history.ordered()
+        times = columns["time"]
+        strings = self._strings.values
+
+        def row(i: int, at: float) -> dict:
+            data = {"time": at}
+            for name in _COLUMNS:
+                if name == "time":
+                    continue
+                value = columns[name][i]
+                data[name] = strings[value] if name in _STRING_COLUMNS else value
+            data["mute"] = bool(data["mute"])
+            return data
+
+        # The row in effect at ``start`` (the last change before it) opens the range
+        first = bisect.bisect_right(times, start)
+        indexes = range(max(0, first - 1), bisect.bisect_right(times, end))
+        if not step:
+            return [row(i, max(times[i], start)) for i in indexes]
+
+        buckets: list[dict] = []
+        position = 0
+        bucket_start = start
+        while bucket_start <= end and indexes:
+            bucket_end = bucket_start + step
+            current = indexes[position]
+            volumes = [columns["volume"][current]] if times[current] < bucket_end else []
+            changes = 0
+            # Advance to the last change at or before the end of this bucket
+            while position + 1 < len(indexes) and times[indexes[position + 1]] < bucket_end:
+                position += 1
+                changes += 1
+                volumes.append(columns["volume"][indexes[position]])
+            current = indexes[position]
+            if times[current] < bucket_end:
+                data = row(current, bucket_start)
+                data.update(changes=changes, volume_min=min(volumes), volume_max=max(volumes))
+                buckets.append(data)
+            bucket_start = bucket_end
+        return buckets
+
+    def at(self, room: str, when: float) -> dict | None:
+        """The state a room was in at ``when``."""
+        rows = self.query(room, when, when)
+        return rows[0] if rows else None
+
+    def stats(self) -> dict:
+        rows = sum(len(h) for h in self._rooms.values())
+        column_bytes = sum(c.itemsize * len(c) for h in self._rooms.values() for c in h.columns.values())
+        return {"rooms": len(self._rooms), "rows": rows, "strings": len(self._strings.values), "bytes": column_bytes}
+
+    # -- persistence -------------------------------------------------------
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._snapshot_interval)
+            if self._dirty:
+                try:
+                    await self._save()
+                except OSError as exc:
+                    logger.warning("Writing history snapshot failed: %s", exc)
+
+    async def _save(self) -> None:
+        # Copy on the loop (cheap, arrays are small), encode and write in a thread
+        self._compact()
+        strings = list(self._strings.values)
+        rooms = {room: {name: c.tobytes() for name, c in h.ordered().items()} for room, h in self._rooms.items()}
+        self._dirty = False
+        await asyncio.to_thread(self._write, strings, rooms)
+
+    def _compact(self) -> None:
+        """Drop interned strings no longer referenced by any row."""
+        used = {0}
+        for history in self._rooms.values():
+            for name in _STRING_COLUMNS:
+                used.update(history.columns[name])
+        if len(used) == len(self._strings.values):
+            return
+        old = self._strings.values
+        remap = {index: new for new, index in enumerate(sorted(used))}
+        self._strings = _Strings([old[index] for index in sorted(used)])
+        for history in self._rooms.values():
+            for name in _STRING_COLUMNS:
+                column = history.columns[name]
+                history.columns[name] = array(column.typecode, (remap[v] for v in column))
+
+    def _write(self, strings: list[str], rooms: dict[str, dict[str, bytes]]) -> None:
+        document = {
+            "version": _FORMAT_VERSION,
+            "strings": strings,
+            "rooms": {
+                room: {name: base64.b64encode(zlib.compress(data)).decode() for name, data in columns.items()}
+                for room, columns in rooms.items()
+            },
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(document, separators=(",", ":")))
+        tmp.replace(self._path)
+
+    def _load(self) -> None:
+        try:
+            document = json.loads(self._path.read_bytes())
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.warning("Ignoring corrupt history snapshot %s", self._path)
+            return
+        if document.get("version") != _FORMAT_VERSION:
+            return
+        self._strings = _Strings(document["strings"])
+        for room, encoded in document["rooms"].items():
+            history = RoomHistory(self._capacity)
+            columns = {}
+            for name, code in _COLUMNS.items():
+                column = array(code)
+                column.frombytes(zlib.decompress(base64.b64decode(encoded[name])))
+                columns[name] = column[-self._capacity :]
+            history.columns = columns
+            self._rooms[room] = history
+        logger.info("Loaded history for %d rooms", len(self._rooms))
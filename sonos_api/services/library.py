@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from soco.data_structures import to_didl_string
+from soco.data_structures_entry import from_didl_string
+
+from sonos_api.utils.priority_lock import Priority
+from sonos_api.utils.retry import retry_soco
+
+logger = logging.getLogger(__name__)
+
+# Indexed kinds -> SoCo music_library search type
+CATEGORIES = {
+    "artist": "artists",
+    "album": "albums",
+    "track": "tracks",
+    "playlist": "playlists",
+    "sonos_playlist": "sonos_playlists",
+    "radio": "radio_stations",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    item_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL DEFAULT '',
+    album TEXT NOT NULL DEFAULT '',
+    uri TEXT NOT NULL DEFAULT '',
+    didl TEXT NOT NULL DEFAULT '',
+    UNIQUE (kind, item_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, artist, album, content='items', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, title, artist, album) VALUES (new.id, new.title, new.artist, new.album);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, artist, album) VALUES ('delete', old.id, old.title, old.artist, old.album);
+END;
+CREATE TABLE IF NOT EXISTS containers (
+    kind TEXT PRIMARY KEY,
+    update_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    refreshed REAL NOT NULL
+);
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 prefix query ("foo"* AND "bar"*)."""
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(text))
+
+
+def _item_row(kind: str, item) -> tuple:
+    resources = getattr(item, "resources", None) or []
+    return (
+        item.item_id,
+        kind,
+        getattr(item, "title", "") or "",
+        getattr(item, "creator", "") or "",
+        getattr(item, "album", "") or "",
+        resources[0].uri if resources else "",
+        to_didl_string(item),
+    )
+
+
+class LibraryIndex:
+    """Local SQLite FTS5 index of the Sonos music library.
+
+    Each category is re-crawled only when its ContentDirectory container
+    UpdateID changes, and never while the household is re-indexing shares
+    (ShareIndexInProgress). Pages are fetched one at a time under the room
+    lock with a pause in between so interactive commands are not starved.
+    """
+
+    def __init__(self, path: str, page_size: int = 100, page_delay: float = 0.2) -> None:
+        self._path = path
+        self._page_size = page_size
+        self._page_delay = page_delay
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.crawling: str | None = None
+
+    def open(self) -> None:
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self._path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        if self._db:
+            self._db.close()
+            self._db = None
+
+    async def start(self, manager, interval: int) -> None:
+        """Open the index and start the periodic refresh task."""
+        await asyncio.to_thread(self.open)
+        self._task = asyncio.create_task(self._refresh_loop(manager, interval))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self.close)
+
+    async def _refresh_loop(self, manager, interval: int) -> None:
+        await manager.wait_discovered()
+        while True:
+            try:
+                await self.refresh(manager)
+            except Exception:
+                logger.exception("Library refresh failed")
+            await asyncio.sleep(interval)
+
+    # -- reads -------------------------------------------------------------
+
+    def _search(self, text: str, kind: str | None, limit: int) -> list[dict]:
+        query = _fts_query(text)
+        if not query:
+            return []
+        sql = (
+            "SELECT i.item_id, i.kind, i.title, i.artist, i.album, i.uri FROM items_fts f"
+            " JOIN items i ON i.id = f.rowid WHERE items_fts MATCH ?"
+        )
+        params: list = [query]
+        if kind:
+            sql += " AND i.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY bm25(items_fts, 10.0, 2.0, 1.0) LIMIT ?"
+        params.append(limit)
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        keys = ("id", "type", "title", "artist", "album", "uri")
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def search(self, text: str, kind: str | None = None, limit: int = 20) -> list[dict]:
+        return await asyncio.to_thread(self._search, text, kind, limit)
+
+    def _didl(self, item_id: str):
+        with self._db_lock:
+            row = self._db.execute("SELECT didl FROM items WHERE item_id = ? LIMIT 1", (item_id,)).fetchone()
+        return from_didl_string(row[0])[0] if row and row[0] else None
+
+    async def get_item(self, item_id: str):
+        """Rebuild the SoCo DIDL object for an indexed item."""
+        return await asyncio.to_thread(self._didl, item_id)
+
+    def _status(self) -> dict:
+        with self._db_lock:
+            rows = self._db.execute("SELECT kind, update_id, count, refreshed FROM containers").fetchall()
+        return {kind: {"update_id": u, "count": c, "refreshed": r} for kind, u, c, r in rows}
+
+    async def status(self) -> dict:
+        return {"crawling": self.crawling, "containers": await asyncio.to_thread(self._status)}
+
+    # -- refresh -----------------------------------------------------------
+
+    def _stored_update_id(self, kind: str) -> int | None:
+        with self._db_lock:
+            row = self._db.execute("SELECT update_id FROM containers WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else None
+
+    def _replace_kind(self, kind: str, rows: list[tuple], update_id: int) -> None:
+        with self._db_lock, self._db:
+            self._db.execute("DELETE FROM items WHERE kind = ?", (kind,))
+            self._db.executemany(
+                "INSERT OR IGNORE INTO items (item_id, kind, title, artist, album, uri, didl) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO containers (kind, update_id, count, refreshed) VALUES (?, ?, ?, ?)",
+                (kind, update_id, len(rows), time.time()),
+            )
+
+    async def refresh(self, manager, force: bool = False) -> dict[str, int]:
+        """Re-crawl categories whose container UpdateID changed. Returns kind -> item count."""
+        speakers = manager.speakers
+        if not speakers:
+            return {}
+        name, speaker = next(iter(speakers.items()))
+        library = speaker.music_library
+
+        @retry_soco()
+        async def _page(search_type: str, start: int, count: int):
+            async with manager.get_lock(name, Priority.BACKGROUND):
+                return await asyncio.to_thread(
+                    library.get_music_library_information, search_type, start=start, max_items=count,
+                )
+
+        async with self._refresh_lock:
+            indexing = await asyncio.to_thread(lambda: library.library_updating)
+            if indexing:
+                logger.info("Music library is being re-indexed by Sonos, postponing refresh")
+                return {}
+
+            refreshed = {}
+            try:
+                for kind, search_type in CATEGORIES.items():
+                    count = await self._refresh_kind(kind, search_type, _page, force)
+                    if count is not None:
+                        refreshed[kind] = count
+            finally:
+                self.crawling = None
+            return refreshed
+
+    async def _refresh_kind(self, kind: str, search_type: str, fetch_page, force: bool) -> int | None:
+        try:
+            # A one-item probe is enough to read the container's UpdateID
+            probe = await fetch_page(search_type, 0, 1)
+        except Exception as exc:
+            logger.warning("Library category %s unavailable: %s", kind, exc)
+            return None
+        update_id = int(probe.update_id or 0)
+        if not force and update_id and update_id == await asyncio.to_thread(self._stored_update_id, kind):
+            return None
+
+        self.crawling = kind
+        rows: list[tuple] = []
+        while len(rows) < probe.total_matches:
+            await asyncio.sleep(self._page_delay)
+            page = await fetch_page(search_type, len(rows), self._page_size)
+            if not len(page):
+                break
+            rows.extend(_item_row(kind, item) for item in page)
+
+        await asyncio.to_thread(self._replace_kind, kind, rows, update_id)
+        logger.info("Indexed %d library %s items", len(rows), kind)
+        return len(rows)
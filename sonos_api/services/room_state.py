@@ -0,0 +1,537 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Collection
+
+from sonos_api.services.art import encode_art_url
+from sonos_api.utils.priority_lock import Priority
+from sonos_api.utils.retry import retry_soco
+from sonos_api.utils.speaker import normalize_room_name
+
+logger = logging.getLogger(__name__)
+
+# TrackInfo fields that come from GetPositionInfo (position is interpolated)
+_TRACK_FIELDS = ("title", "artist", "album", "album_art", "duration", "uri")
+
+# What ``sync`` reads, one SOAP call each
+PARTS = frozenset({"transport", "track", "volume", "mute"})
+
+
+def parse_hms(value: str) -> float:
+    """Parse a Sonos "H:MM:SS" time. Non-times (e.g. NOT_IMPLEMENTED) are 0."""
+    try:
+        parts = [int(p) for p in value.split(":")]
+    except (AttributeError, ValueError):
+        return 0.0
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return float(seconds)
+
+
+def format_hms(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+class RoomState:
+    """Last known state of one room plus a local playback clock.
+
+    ``position`` is authoritative as of ``clock_synced`` (monotonic); while
+    the room is PLAYING the current position is interpolated from it.
+    ``version`` is bumped from a store-wide counter (seeded from wall-clock
+    milliseconds, so it keeps increasing across restarts) whenever a visible
+    field other than the moving position changes.
+    """
+
+    __slots__ = (
+        "room", "transport", "track", "volume", "mute",
+        "position", "duration", "clock_synced", "synced", "version", "changed",
+    )
+
+    def __init__(self, room: str) -> None:
+        self.room = room
+        self.transport = "UNKNOWN"
+        self.track: dict[str, str] = dict.fromkeys(_TRACK_FIELDS, "")
+        self.volume = 0
+        self.mute = False
+        self.position = 0.0
+        self.duration = 0.0
+        self.clock_synced = 0.0
+        self.synced = 0.0
+        self.version = 0
+        self.changed = asyncio.Event()
+
+    def position_at(self, now: float) -> float:
+        if self.transport != "PLAYING":
+            return self.position
+        position = self.position + (now - self.clock_synced)
+        return min(position, self.duration) if self.duration else position
+
+    def track_info(self, now: float | None = None) -> dict:
+        now = time.monotonic() if now is None else now
+        return {**self.track, "position": format_hms(self.position_at(now)) if self.clock_synced else ""}
+
+
+class RoomStateStore:
+    """Caches room state so reads don't need a SOAP round trip per request.
+
+    Transport and rendering state are kept current through UPnP event
+    subscriptions (AVTransport, RenderingControl). Sonos does not event the
+    playback position, so it is interpolated locally and resynchronised
+    with one GetPositionInfo call on transport events, track changes, seeks
+    issued through the API, and a slow drift-correction timer.
+    """
+
+    def __init__(
+        self,
+        subscribe: bool = True,
+        cache_ttl: float = 5.0,
+        resync_interval: float = 60.0,
+    ) -> None:
+        self._subscribe = subscribe
+        self._cache_ttl = cache_ttl
+        self._resync_interval = resync_interval
+        self._rooms: dict[str, RoomState] = {}
+        self._subscriptions: dict[str, list] = {}
+        self._topology_sub: tuple[str, object] | None = None  # (room, subscription)
+        self._counter = int(time.time() * 1000)
+        self.topology_version = self._counter
+        self.any_changed = asyncio.Event()
+        self._listeners: list[Callable[[RoomState], None]] = []
+        self._event_listeners: list[Callable[[str, str, dict], None]] = []
+        self._resyncing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._manager = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self, manager) -> None:
+        self._manager = manager
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._drift_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for room in list(self._subscriptions):
+            await self._unsubscribe(room)
+        if self._topology_sub:
+            await asyncio.to_thread(self._topology_sub[1].unsubscribe, strict=False)
+            self._topology_sub = None
+
+    def add_listener(self, listener: Callable[[RoomState], None]) -> None:
+        """Register a callback run (on the event loop) after every state change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[RoomState], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def add_event_listener(self, listener: Callable[[str, str, dict], None]) -> None:
+        """Register a callback for every speaker event: (room, service type, variables), on the event loop."""
+        self._event_listeners.append(listener)
+
+    # -- reads -------------------------------------------------------------
+
+    def room_key(self, room: str) -> str:
+        """Canonical room name for any name, alias, UUID or IP."""
+        if self._manager is not None:
+            name = self._manager.resolve_name(room)
+            if name is not None:
+                return name
+        return normalize_room_name(room)
+
+    def peek(self, room: str) -> RoomState | None:
+        return self._rooms.get(self.room_key(room))
+
+    @property
+    def live(self) -> bool:
+        """True when every known room and the topology are kept current by events."""
+        return (
+            self._topology_sub is not None
+            and self._manager is not None
+            and all(room in self._subscriptions for room in self._manager.speakers)
+        )
+
+    def export(self) -> dict[str, dict]:
+        """Plain-data copy of every room's state (for the worker snapshot).
+
+        ``live`` rooms are kept current by events and can be served as is;
+        ``clock_synced`` is monotonic time, comparable across processes.
+        """
+        return {
+            room: {
+                "transport": state.transport,
+                "volume": state.volume,
+                "mute": state.mute,
+                "track": state.track,
+                "position": state.position,
+                "duration": state.duration,
+                "clock_synced": state.clock_synced,
+                "version": state.version,
+                "live": room in self._subscriptions and state.synced > 0,
+            }
+            for room, state in self._rooms.items()
+        }
+
+    @property
+    def zones_version(self) -> int:
+        """Highest version across topology and all rooms; changes whenever /zones would."""
+        return max([self.topology_version, *(s.version for s in self._rooms.values())])
+
+    def poll_interval(self, room: str) -> float | None:
+        """How often a waiter must re-read a room that has no event subscription."""
+        return None if self.room_key(room) in self._subscriptions else self._cache_ttl
+
+    @staticmethod
+    async def wait(event: asyncio.Event, timeout: float) -> bool:
+        """Wait for a change notification. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def source(self, room: str, max_age: float | None = None) -> str | None:
+        """Where a read of ``room`` can be answered from without a speaker call.
+
+        ``events`` while subscriptions keep it current, ``cache`` if the last
+        full read is younger than ``max_age`` (default: the cache TTL), else
+        None.
+        """
+        state = self._rooms.get(self.room_key(room))
+        if state is None or not state.synced:
+            return None
+        if state.room in self._subscriptions:
+            return "events"
+        max_age = self._cache_ttl if max_age is None else max_age
+        return "cache" if time.monotonic() - state.synced < max_age else None
+
+    def _is_fresh(self, state: RoomState, now: float) -> bool:
+        if state.room in self._subscriptions:
+            return state.synced > 0
+        return now - state.synced < self._cache_ttl
+
+    async def get(self, room: str, speaker, lock) -> RoomState:
+        """Return room state, doing SOAP reads only when the cache can't answer."""
+        room = self.room_key(room)
+        state = self._rooms.get(room)
+        now = time.monotonic()
+        if state is not None and self._is_fresh(state, now):
+            if now - state.clock_synced < self._resync_interval:
+                return state
+            async with lock:
+                await self._sync_track(state, speaker)
+            return state
+
+        async with lock:
+            return await self.sync(room, speaker)
+
+    # -- writes ------------------------------------------------------------
+
+    def _room(self, room: str) -> RoomState:
+        state = self._rooms.get(room)
+        if state is None:
+            state = self._rooms[room] = RoomState(room)
+        return state
+
+    def _next_version(self) -> int:
+        self._counter += 1
+        return self._counter
+
+    def _wake_all(self) -> None:
+        event, self.any_changed = self.any_changed, asyncio.Event()
+        event.set()
+
+    def _notify(self, state: RoomState) -> None:
+        state.version = self._next_version()
+        event, state.changed = state.changed, asyncio.Event()
+        event.set()
+        self._wake_all()
+        for listener in list(self._listeners):
+            try:
+                listener(state)
+            except Exception:
+                logger.exception("State listener failed")
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _set_transport(state: RoomState, transport: str) -> bool:
+        if transport == state.transport:
+            return False
+        # Freeze the clock at the current position before switching
+        now = time.monotonic()
+        if state.clock_synced:
+            state.position = state.position_at(now)
+            state.clock_synced = now
+        state.transport = transport
+        return True
+
+    def update(self, room: str, **fields) -> RoomState:
+        """Apply known values (e.g. after a successful command) to the cache."""
+        state = self._room(self.room_key(room))
+        changed = False
+        transport = fields.pop("transport", None)
+        if transport is not None:
+            changed = self._set_transport(state, transport)
+        for name, value in fields.items():
+            if getattr(state, name) != value:
+                setattr(state, name, value)
+                changed = True
+        if changed:
+            self._notify(state)
+        return state
+
+    def topology_changed(self) -> None:
+        """Record a group change (join/leave through the API or a topology event)."""
+        self.topology_version = self._next_version()
+        self._wake_all()
+        if self._manager is not None:
+            self._manager.invalidate_topology()
+
+    def invalidate_clock(self, room: str) -> None:
+        """Force a track/position resync on the next read (after next/previous...)."""
+        state = self._rooms.get(self.room_key(room))
+        if state is not None:
+            state.clock_synced = 0.0
+
+    def set_position(self, room: str, seconds: float) -> None:
+        """Record a seek issued through the API."""
+        state = self._rooms.get(self.room_key(room))
+        if state is not None and state.clock_synced:
+            state.position = float(seconds)
+            state.clock_synced = time.monotonic()
+
+    def _apply_track(self, state: RoomState, info: dict, speaker) -> bool:
+        track = {
+            "title": info.get("title", ""),
+            "artist": info.get("artist", ""),
+            "album": info.get("album", ""),
+            "album_art": encode_art_url(info.get("album_art_uri", ""), f"http://{speaker.ip_address}:1400"),
+            "duration": info.get("duration", ""),
+            "uri": info.get("uri", ""),
+        }
+        state.position = parse_hms(info.get("position", ""))
+        state.duration = parse_hms(track["duration"])
+        state.clock_synced = time.monotonic()
+        if track != state.track:
+            state.track = track
+            return True
+        return False
+
+    async def sync(self, room: str, speaker) -> RoomState:
+        """Authoritative full read (transport, track, volume, mute). Caller holds the room lock."""
+
+        @retry_soco()
+        async def _read():
+            def _do():
+                transport = speaker.get_current_transport_info()
+                info = speaker.get_current_track_info()
+                return transport.get("current_transport_state", "UNKNOWN"), info, speaker.volume, speaker.mute
+
+            return await asyncio.to_thread(_do)
+
+        transport, info, volume, mute = await _read()
+        state = self._room(room)
+        changed = self._apply_track(state, info, speaker)
+        if (transport, volume, mute) != (state.transport, state.volume, state.mute):
+            state.transport, state.volume, state.mute = transport, volume, mute
+            changed = True
+        state.synced = time.monotonic()
+        if changed:
+            self._notify(state)
+        return state
+
+    async def read(self, room: str, speaker, parts: Collection[str]) -> RoomState:
+        """Read only ``parts`` (see ``PARTS``) into the cache. Caller holds the room lock.
+
+        Cheaper than ``sync`` when a caller needs a field or two; a partial
+        read doesn't reset the cache TTL.
+        """
+        room = self.room_key(room)
+        if PARTS <= set(parts):
+            return await self.sync(room, speaker)
+
+        @retry_soco()
+        async def _read():
+            def _do():
+                values = {}
+                if "transport" in parts:
+                    values["transport"] = speaker.get_current_transport_info().get("current_transport_state", "UNKNOWN")
+                if "track" in parts:
+                    values["track"] = speaker.get_current_track_info()
+                if "volume" in parts:
+                    values["volume"] = speaker.volume
+                if "mute" in parts:
+                    values["mute"] = speaker.mute
+                return values
+
+            return await asyncio.to_thread(_do)
+
+        values = await _read()
+        state = self._room(room)
+        changed = "track" in values and self._apply_track(state, values.pop("track"), speaker)
+        if "transport" in values:
+            changed = self._set_transport(state, values.pop("transport")) or changed
+        for name, value in values.items():
+            if getattr(state, name) != value:
+                setattr(state, name, value)
+                changed = True
+        if changed:
+            self._notify(state)
+        return state
+
+    async def _sync_track(self, state: RoomState, speaker) -> None:
+        """Resync track and position only (one GetPositionInfo call)."""
+
+        @retry_soco()
+        async def _read():
+            return await asyncio.to_thread(speaker.get_current_track_info)
+
+        info = await _read()
+        if self._apply_track(state, info, speaker):
+            self._notify(state)
+
+    async def _background_track_sync(self, room: str) -> None:
+        if room in self._resyncing:
+            return
+        speaker = self._manager.get(room)
+        state = self._rooms.get(room)
+        if speaker is None or state is None:
+            return
+        self._resyncing.add(room)
+        try:
+            async with self._manager.get_lock(room, Priority.BACKGROUND):
+                await self._sync_track(state, speaker)
+        except Exception as exc:
+            logger.warning("Position resync failed for %s: %s", room, exc)
+        finally:
+            self._resyncing.discard(room)
+
+    # -- UPnP events -------------------------------------------------------
+
+    def _on_event(self, room: str, event) -> None:
+        """Event listener thread -> event loop."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._handle_event, room, event)
+
+    def _handle_event(self, room: str, event) -> None:
+        variables = event.variables
+        service = event.service.service_type
+        for listener in list(self._event_listeners):
+            try:
+                listener(room, service, variables)
+            except Exception:
+                logger.exception("Event listener failed")
+        if service == "ZoneGroupTopology":
+            if "zone_group_state" in variables:
+                self.topology_changed()
+            return
+        state = self._room(room)
+        if service == "AVTransport":
+            transport = variables.get("transport_state")
+            if transport and transport != "TRANSITIONING":
+                if self._set_transport(state, transport):
+                    self._notify(state)
+                self._spawn(self._background_track_sync(room))
+        elif service == "RenderingControl":
+            fields = {}
+            if isinstance(variables.get("volume"), dict) and "Master" in variables["volume"]:
+                fields["volume"] = int(variables["volume"]["Master"])
+            if isinstance(variables.get("mute"), dict) and "Master" in variables["mute"]:
+                fields["mute"] = variables["mute"]["Master"] == "1"
+            if fields:
+                self.update(room, **fields)
+
+    async def _subscribe_room(self, room: str, speaker) -> None:
+        def _do():
+            subs = []
+            for service in (speaker.avTransport, speaker.renderingControl):
+                sub = service.subscribe(auto_renew=True)
+                sub.callback = lambda event, r=room: self._on_event(r, event)
+                sub.auto_renew_fail = lambda exc, r=room: self._loop.call_soon_threadsafe(self._drop_subscription, r)
+                subs.append(sub)
+            return subs
+
+        try:
+            self._subscriptions[room] = await asyncio.to_thread(_do)
+        except Exception as exc:
+            logger.warning("Event subscription failed for %s, falling back to polling: %s", room, exc)
+
+    def _drop_subscription(self, room: str) -> None:
+        """Auto-renewal failed: fall back to TTL caching until re-subscribed."""
+        subs = self._subscriptions.pop(room, None)
+        if subs:
+            self._spawn(asyncio.to_thread(lambda: [s.unsubscribe(strict=False) for s in subs]))
+
+    async def _unsubscribe(self, room: str) -> None:
+        subs = self._subscriptions.pop(room, [])
+        for sub in subs:
+            try:
+                await asyncio.to_thread(sub.unsubscribe)
+            except Exception:
+                pass
+
+    async def _subscribe_topology(self, room: str, speaker) -> None:
+        """One ZoneGroupTopology subscription covers the whole household."""
+
+        def _do():
+            sub = speaker.zoneGroupTopology.subscribe(auto_renew=True)
+            sub.callback = lambda event: self._on_event(room, event)
+            sub.auto_renew_fail = lambda exc: self._loop.call_soon_threadsafe(self._drop_topology)
+            return sub
+
+        try:
+            self._topology_sub = (room, await asyncio.to_thread(_do))
+        except Exception as exc:
+            logger.warning("Topology subscription failed: %s", exc)
+
+    def _drop_topology(self) -> None:
+        self._topology_sub = None
+        self.topology_changed()
+
+    async def _reconcile_subscriptions(self) -> None:
+        if not self._subscribe:
+            return
+        speakers = self._manager.speakers
+        removed = [r for r in self._rooms if r not in speakers]
+        for room in removed:
+            await self._unsubscribe(room)
+            self._rooms.pop(room, None)
+        if removed:
+            self.topology_changed()
+        if self._topology_sub and self._topology_sub[0] not in speakers:
+            await asyncio.to_thread(self._topology_sub[1].unsubscribe, strict=False)
+            self._topology_sub = None
+        if self._topology_sub is None and speakers:
+            await self._subscribe_topology(*next(iter(speakers.items())))
+        await asyncio.gather(
+            *(self._subscribe_room(room, s) for room, s in speakers.items() if room not in self._subscriptions)
+        )
+
+    async def _drift_loop(self) -> None:
+        """Correct position drift of playing rooms and keep subscriptions in line with discovery."""
+        await self._manager.wait_discovered()
+        while True:
+            try:
+                await self._reconcile_subscriptions()
+            except Exception:
+                logger.exception("Subscription reconcile failed")
+            now = time.monotonic()
+            stale = [
+                room for room, state in self._rooms.items()
+                if state.transport == "PLAYING" and now - state.clock_synced >= self._resync_interval
+            ]
+            await asyncio.gather(*(self._background_track_sync(room) for room in stale))
+            await asyncio.sleep(self._resync_interval)
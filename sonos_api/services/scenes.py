@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+from sonos_api.config import settings
+from sonos_api.utils.priority_lock import Priority
+from sonos_api.utils.retry import retry_soco
+
+logger = logging.getLogger(__name__)
+
+_SCENE_NAME_RE = re.compile(r"^[a-z0-9_-]{1,64}$")
+
+# Per-room settings applied after group formation, in this order
+_RENDERING_FIELDS = ("volume", "mute", "bass", "treble", "loudness")
+
+
+def scene_path(name: str) -> Path:
+    """Path of the on-disk scene file. Raises ValueError for invalid names."""
+    name = name.strip().lower()
+    if not _SCENE_NAME_RE.match(name):
+        raise ValueError(f"Invalid scene name '{name}' (use a-z, 0-9, '_' or '-')")
+    return Path(settings.data_dir) / "scenes" / f"{name}.json"
+
+
+def list_scenes() -> list[str]:
+    directory = Path(settings.data_dir) / "scenes"
+    if not directory.is_dir():
+        return []
+    return sorted(p.stem for p in directory.glob("*.json"))
+
+
+def load_scene(name: str) -> dict | None:
+    path = scene_path(name)
+    if not path.exists():
+        return None
+    return json.loads(path.read_bytes())
+
+
+def save_scene(name: str, scene: dict) -> None:
+    path = scene_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(scene, separators=(",", ":")))
+    tmp.replace(path)
+
+
+def delete_scene(name: str) -> bool:
+    path = scene_path(name)
+    if not path.exists():
+        return False
+    path.unlink()
+    return True
+
+
+def _read_room(speaker) -> dict:
+    """Read everything a scene records for one speaker (runs in a thread)."""
+    media = speaker.avTransport.GetMediaInfo([("InstanceID", 0)])
+    transport = speaker.get_current_transport_info()
+    room = {
+        "name": speaker.player_name,
+        "volume": speaker.volume,
+        "mute": speaker.mute,
+        "play_mode": speaker.play_mode,
+        "uri": media.get("CurrentURI", ""),
+        "meta": media.get("CurrentURIMetaData", ""),
+        "playing": transport.get("current_transport_state") == "PLAYING",
+    }
+    # Bridges, Subs and some amps have no EQ
+    for field in ("bass", "treble", "loudness"):
+        try:
+            room[field] = getattr(speaker, field)
+        except Exception:
+            room[field] = None
+    return room
+
+
+async def _read_topology(speakers: list) -> dict[str, str]:
+    """Map member uid -> coordinator uid using a single topology read."""
+
+    @retry_soco()
+    async def _groups():
+        return await asyncio.to_thread(lambda: speakers[0].all_groups)
+
+    topology = {}
+    for group in await _groups():
+        for member in group.members:
+            topology[member.uid] = group.coordinator.uid
+    return topology
+
+
+async def read_house(manager) -> dict[str, dict]:
+    """Read the state of every reachable room concurrently, keyed by uid."""
+    speakers = list(manager.speakers.items())
+    if not speakers:
+        return {}
+
+    topology = await _read_topology([s for _, s in speakers])
+
+    @retry_soco()
+    async def _read(name, speaker):
+        async with manager.get_lock(name, Priority.READ):
+            return await asyncio.to_thread(_read_room, speaker)
+
+    results = await asyncio.gather(*(_read(name, s) for name, s in speakers), return_exceptions=True)
+
+    house = {}
+    for (name, speaker), result in zip(speakers, results):
+        if isinstance(result, BaseException):
+            logger.warning("Failed to read %s: %s", name, result)
+            continue
+        result["coordinator"] = topology.get(speaker.uid, speaker.uid)
+        house[speaker.uid] = result
+    return house
+
+
+async def capture(manager) -> dict:
+    """Capture groups, sources, volume, mute, EQ and play mode of every room."""
+    rooms = await read_house(manager)
+    for uid, room in rooms.items():
+        if room["coordinator"] != uid:
+            # Members follow their coordinator's source and play mode
+            for field in ("uri", "meta", "play_mode", "playing"):
+                room.pop(field, None)
+    return {"captured": int(time.time()), "rooms": rooms}
+
+
+async def apply(manager, store, scene: dict) -> dict:
+    """Apply a captured scene, pushing only the differences from the current state.
+
+    Group changes run first (all unjoins, then all joins, each batch in
+    parallel) and the cached topology is re-read before per-room rendering
+    and per-coordinator transport changes run in parallel across rooms.
+    """
+    current = await read_house(manager)
+    by_uid = {s.uid: (name, s) for name, s in manager.speakers.items()}
+    wanted = {uid: room for uid, room in scene.get("rooms", {}).items() if uid in by_uid and uid in current}
+    missing = [room.get("name", uid) for uid, room in scene.get("rooms", {}).items() if uid not in wanted]
+    changes: list[str] = []
+    errors: list[str] = []
+
+    async def _run(uid: str, label: str, func) -> None:
+        name, _ = by_uid[uid]
+
+        @retry_soco()
+        async def _call():
+            await asyncio.to_thread(func)
+
+        try:
+            async with manager.get_lock(name):
+                await _call()
+            changes.append(f"{name}: {label}")
+        except Exception as exc:
+            logger.warning("Scene step failed for %s (%s): %s", name, label, exc)
+            errors.append(f"{name}: {label}: {exc}")
+
+    # Phase 1: group formation. Future coordinators become standalone first,
+    # then every other room joins its coordinator.
+    unjoins = []
+    joins = []
+    for uid, room in wanted.items():
+        target = room["coordinator"] if room["coordinator"] in by_uid else uid
+        if target == current[uid]["coordinator"]:
+            continue
+        speaker = by_uid[uid][1]
+        if target == uid:
+            unjoins.append(_run(uid, "leave group", speaker.unjoin))
+        else:
+            master_name, master = by_uid[target]
+            joins.append(_run(uid, f"join {master_name}", lambda s=speaker, m=master: s.join(m)))
+    await asyncio.gather(*unjoins)
+    await asyncio.gather(*joins)
+    if unjoins or joins:
+        # Coordinator routing, /zones and its version must see the new groups
+        store.topology_changed()
+        await manager.invalidate_topology()
+
+    # Phase 2: sources, play mode, volume, mute, EQ
+    def _room_steps(uid: str, room: dict) -> list:
+        speaker = by_uid[uid][1]
+        now = current[uid]
+        steps = []
+        is_coordinator = "uri" in room
+        if is_coordinator and room["uri"] and room["uri"] != now.get("uri"):
+            steps.append((
+                "source",
+                lambda: speaker.avTransport.SetAVTransportURI([
+                    ("InstanceID", 0),
+                    ("CurrentURI", room["uri"]),
+                    ("CurrentURIMetaData", room["meta"]),
+                ]),
+            ))
+        if is_coordinator and room["play_mode"] != now.get("play_mode"):
+            steps.append(("play mode", lambda: setattr(speaker, "play_mode", room["play_mode"])))
+        for field in _RENDERING_FIELDS:
+            value = room.get(field)
+            if value is not None and value != now.get(field):
+                steps.append((field, lambda f=field, v=value: setattr(speaker, f, v)))
+        if is_coordinator:
+            source_changed = bool(steps) and steps[0][0] == "source"
+            if room["playing"] and (source_changed or not now.get("playing")):
+                steps.append(("play", speaker.play))
+            elif not room["playing"] and now.get("playing"):
+                steps.append(("pause", speaker.pause))
+        return steps
+
+    async def _apply_room(uid: str, room: dict) -> None:
+        for label, func in _room_steps(uid, room):
+            await _run(uid, label, func)
+
+    await asyncio.gather(*(_apply_room(uid, room) for uid, room in wanted.items()))
+
+    return {"changes": changes, "errors": errors, "missing": missing}
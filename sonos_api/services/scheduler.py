@@ -0,0 +1,312 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sonos_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Jobs scheduled by the server itself, not entries of the operation table
+FADE = "fade"
+
+# Never sleep longer than this, so a wall-clock jump (NTP sync on a Pi
+# without an RTC) delays a job by at most this much
+_MAX_SLEEP = 30.0
+
+# A one-shot job missed by more than this (server down) is dropped, not run late
+_MISSED_GRACE = 60.0
+
+# Shortest interval between fade steps (seconds)
+_FADE_MIN_STEP = 0.5
+
+
+def next_daily(clock: str, days: list[str], after: float) -> float:
+    """Next local time ``HH:MM`` on one of ``days`` strictly after ``after``."""
+    hour, minute = (int(part) for part in clock.split(":"))
+    start = datetime.fromtimestamp(after)
+    for offset in range(8):
+        day = start.date() + timedelta(days=offset)
+        if days and DAYS[day.weekday()] not in days:
+            continue
+        # Naive local datetime: timestamp() follows DST like a wall clock
+        candidate = datetime(day.year, day.month, day.day, hour, minute).timestamp()
+        if candidate > after:
+            return candidate
+    raise ValueError("no matching day")
+
+
+class Job:
+    __slots__ = ("id", "op", "args", "at", "daily", "days", "created", "last_run", "last_status")
+
+    def __init__(
+        self,
+        id: str,
+        op: str,
+        args: dict,
+        at: float,
+        daily: str | None = None,
+        days: list[str] | None = None,
+        created: float | None = None,
+        last_run: float | None = None,
+        last_status: int | None = None,
+    ) -> None:
+        self.id = id
+        self.op = op
+        self.args = args
+        self.at = at  # next run, unix time
+        self.daily = daily  # "HH:MM" for repeating jobs
+        self.days = days or []
+        self.created = created if created is not None else time.time()
+        self.last_run = last_run
+        self.last_status = last_status
+
+    def describe(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Caller:
+    """Stands in for the Request an endpoint function expects."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.headers: dict[str, str] = {}
+
+
+class Scheduler:
+    """Runs operations at given times, on the event loop.
+
+    Jobs live in a heap keyed by their next run time; one task sleeps until
+    the earliest is due. Every job due at that instant is popped together
+    and each is started as its own task, so "pause all and dim the lights
+    at 23:00" fire at the same moment rather than one after another, and a
+    long job (an announcement waits for the clip to finish) never holds up
+    the next due one. Jobs are kept in ``path`` and survive restarts.
+
+    Operations are the ones the WebSocket channel runs (``operations`` is
+    the ``routers.operations`` module, passed in so services don't import
+    routers) plus ``fade``, which steps a room's volume to ``volume`` over
+    ``duration`` seconds and stops if the volume is changed by hand.
+    """
+
+    def __init__(self, path: str, operations) -> None:
+        self._path = Path(path)
+        self._operations = operations
+        self._jobs: dict[str, Job] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._caller = None
+        self._task: asyncio.Task | None = None
+        self._running: dict[str, set[asyncio.Task]] = {}
+
+    # -- jobs --------------------------------------------------------------
+
+    def check(self, op: str, args: dict) -> None:
+        """Validate an operation, its arguments and its room. Raises OperationError.
+
+        Call after ``start``: rooms are looked up in the running app.
+        """
+        if op == FADE:
+            missing = [key for key in ("room", "volume", "duration") if key not in args]
+            if missing:
+                raise self._operations.OperationError(422, "Missing argument", missing[0])
+            try:
+                valid = 0 <= int(args["volume"]) <= 100 and float(args["duration"]) >= 0
+            except (TypeError, ValueError):
+                valid = False
+            if not valid:
+                raise self._operations.OperationError(422, "Invalid arguments", "volume 0-100, duration >= 0")
+            op, args = "state", {"room": args["room"]}  # Only the room is left to check
+        self._operations.check(self._caller, op, args)
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._heap, (job.at, next(self._seq), job.id))
+        self._wakeup.set()
+
+    def add(self, op: str, args: dict, at: float | None = None, daily: str | None = None, days=None) -> Job:
+        self.check(op, args)
+        if daily is not None:
+            at = next_daily(daily, days or [], time.time())
+        job = Job(secrets.token_hex(4), op, args, at, daily, days)
+        self._jobs[job.id] = job
+        self._push(job)
+        self._save()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a job and stop it if it is running (a fade in progress)."""
+        job = self._jobs.pop(job_id, None)
+        tasks = self._running.pop(job_id, set())
+        for task in tasks:
+            task.cancel()
+        if job is None and not tasks:
+            return False
+        self._save()  # The heap entry is skipped when it comes up
+        return True
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[dict]:
+        return [job.describe() for job in sorted(self._jobs.values(), key=lambda j: j.at)]
+
+    # -- persistence -------------------------------------------------------
+
+    def load(self) -> None:
+        """Read saved jobs (blocking; call from a thread before start)."""
+        try:
+            saved = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return
+        except ValueError:
+            logger.warning("Ignoring corrupt schedule %s", self._path)
+            return
+        now = time.time()
+        for data in saved:
+            job = Job(**data)
+            if job.at < now - _MISSED_GRACE:
+                if not job.daily:
+                    logger.warning("Dropping job %s (%s), missed at %s", job.id, job.op, datetime.fromtimestamp(job.at))
+                    continue
+                job.at = next_daily(job.daily, job.days, now)
+            self._jobs[job.id] = job
+            heapq.heappush(self._heap, (job.at, next(self._seq), job.id))
+        logger.info("Loaded %d scheduled jobs", len(self._jobs))
+
+    def _save(self) -> None:
+        # A few hundred bytes per job; written inline
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps([job.describe() for job in self._jobs.values()], indent=2))
+        tmp.replace(self._path)
+
+    # -- running -----------------------------------------------------------
+
+    async def start(self, app) -> None:
+        self._caller = _Caller(app)
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        tasks = [self._task] if self._task else []
+        tasks += [task for running in self._running.values() for task in running]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _due(self) -> list[Job]:
+        """Pop every live job due at the earliest time in the heap."""
+        batch: list[Job] = []
+        when = None
+        while self._heap and (when is None or self._heap[0][0] == when):
+            at, _, job_id = self._heap[0]
+            job = self._jobs.get(job_id)
+            if job is None or job.at != at:
+                heapq.heappop(self._heap)  # Cancelled or rescheduled
+                continue
+            if at > time.time():
+                break
+            heapq.heappop(self._heap)
+            when = at
+            batch.append(job)
+        return batch
+
+    async def _loop(self) -> None:
+        while True:
+            batch = self._due()
+            if batch:
+                metrics.inc("scheduler_batches")
+                for job in batch:
+                    self._start(job)
+                self._save()
+                continue
+            delay = _MAX_SLEEP
+            if self._heap:
+                delay = min(delay, max(0.0, self._heap[0][0] - time.time()))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _start(self, job: Job) -> None:
+        """Reschedule or retire ``job`` and run it in a tracked task."""
+        late = time.time() - job.at
+        logger.info("Running job %s: %s %s (%.3f s late)", job.id, job.op, job.args, late)
+        metrics.inc("scheduler_jobs")
+        if job.daily:
+            job.at = next_daily(job.daily, job.days, job.at)
+            self._push(job)
+        else:
+            del self._jobs[job.id]
+        job.last_run = time.time()
+
+        if job.op == FADE:
+            job.last_status = 200
+            task = asyncio.create_task(self._fade(job))
+        else:
+            task = asyncio.create_task(self._run(job))
+        self._running.setdefault(job.id, set()).add(task)
+        task.add_done_callback(lambda t, i=job.id: self._done(i, t))
+
+    async def _run(self, job: Job) -> None:
+        try:
+            job.last_status, result = await self._operations.invoke(self._caller, job.op, job.args)
+        except self._operations.OperationError as exc:
+            job.last_status, result = exc.status, {"error": exc.error, "detail": exc.detail}
+        except Exception:
+            logger.exception("Job %s (%s) failed", job.id, job.op)
+            job.last_status, result = 500, None
+        if job.last_status >= 400:
+            metrics.inc("scheduler_job_errors")
+            logger.warning("Job %s (%s) returned %d: %s", job.id, job.op, job.last_status, result)
+
+    def _done(self, job_id: str, task: asyncio.Task) -> None:
+        running = self._running.get(job_id)
+        if running is not None:
+            running.discard(task)
+            if not running:
+                del self._running[job_id]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Job %s failed", job_id, exc_info=task.exception())
+        if job_id in self._jobs:
+            self._save()  # A repeating job's last_status
+
+    async def _fade(self, job: Job) -> None:
+        room, target, duration = job.args["room"], int(job.args["volume"]), float(job.args["duration"])
+        status, state = await self._operations.invoke(self._caller, "state", {"room": room})
+        if status != 200:
+            logger.warning("Fade %s: can't read %s (%d)", job.id, room, status)
+            return
+        start_volume = state["volume"]
+        steps = min(abs(target - start_volume), max(1, int(duration / _FADE_MIN_STEP)))
+        if not steps:
+            return
+        store = self._caller.app.state.room_state
+        loop = asyncio.get_running_loop()
+        begin = loop.time()
+        expected = start_volume
+        for step in range(1, steps + 1):
+            # Sleep to absolute deadlines so call latency doesn't stretch the fade
+            await asyncio.sleep(max(0.0, begin + duration * step / steps - loop.time()))
+            current = store.peek(room)
+            if current is not None and current.volume != expected:
+                logger.info("Fade %s stopped: %s volume changed to %d", job.id, room, current.volume)
+                return
+            expected = round(start_volume + (target - start_volume) * step / steps)
+            try:
+                status, _ = await self._operations.invoke(self._caller, "volume", {"room": room, "volume": expected})
+            except self._operations.OperationError as exc:
+                status = exc.status
+            if status != 200:
+                logger.warning("Fade %s stopped: setting %s volume returned %d", job.id, room, status)
+                return
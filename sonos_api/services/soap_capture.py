@@ -0,0 +1,280 @@
+"""Record and replay of speaker HTTP traffic.
+
+SoCo talks to speakers over plain HTTP on port 1400 (SOAP calls, device
+descriptions) through ``requests``. The recorder captures every such
+exchange with its latency into a gzipped JSON-lines file; the replayer
+answers the same requests from that file, sleeping the recorded
+latency, so the routers can be benchmarked and profiled against a
+real household's behaviour without the speakers.
+
+File format: a header line, then one line per exchange. Request and
+response bodies are stored once per distinct content (``{"blob": id,
+"data": ...}`` lines) and referenced by id. Responses that aren't text
+(album art) are stored base64-encoded and marked ``"encoding": "base64"``.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+import soco
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from sonos_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SPEAKER_PORT = 1400
+_FORMAT_VERSION = 1
+_QUEUE_SIZE = 10000
+_FLUSH_INTERVAL = 1.0
+_TEXT_TYPES = ("text/", "xml", "json")
+
+_FAULT = (
+    '<?xml version="1.0"?><s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+    "<s:Fault><faultcode>s:Client</faultcode><faultstring>UPnPError</faultstring><detail>"
+    '<UPnPError xmlns="urn:schemas-upnp-org:control-1-0"><errorCode>501</errorCode>'
+    "<errorDescription>Not in capture</errorDescription></UPnPError></detail></s:Fault></s:Body></s:Envelope>"
+)
+
+
+def _is_speaker_call(request: requests.PreparedRequest) -> bool:
+    # SUBSCRIBE/UNSUBSCRIBE set up event callbacks; those can't be replayed
+    return request.method in ("GET", "POST") and urlsplit(request.url).port == SPEAKER_PORT
+
+
+def _text(body) -> str:
+    if body is None:
+        return ""
+    return body.decode("utf-8", "replace") if isinstance(body, bytes) else str(body)
+
+
+def _response_body(content: bytes, content_type: str) -> tuple[str, str | None]:
+    """Response body as stored: (data, encoding); encoding is None for UTF-8 text."""
+    if any(kind in content_type for kind in _TEXT_TYPES):
+        try:
+            return content.decode("utf-8"), None
+        except UnicodeDecodeError:
+            pass
+    return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def _blob_id(data: str) -> str:
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+def _keys(method: str, host: str, path: str, action: str, body_id: str) -> tuple[tuple, tuple]:
+    """Exact key (same arguments) and loose key (same action, any arguments)."""
+    loose = (method, host, path, action)
+    return (*loose, body_id), loose
+
+
+class SoapRecorder:
+    """Captures speaker HTTP exchanges to ``path`` while installed.
+
+    The request path only queues a record; a writer thread compresses
+    and writes. When the queue is full records are dropped and counted
+    (``soap_capture_dropped``) rather than slowing the speaker calls.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._queue: queue.Queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._started = time.time()
+        self._original = None
+        self._thread: threading.Thread | None = None
+
+    def install(self) -> None:
+        original = self._original = HTTPAdapter.send
+        recorder = self
+
+        def send(adapter, request, *args, **kwargs):
+            if not _is_speaker_call(request):
+                return original(adapter, request, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                response = original(adapter, request, *args, **kwargs)
+            except requests.RequestException as exc:
+                recorder._record(request, start, error=type(exc).__name__)
+                raise
+            response.content  # Read the body inside the timing, as SoCo would
+            recorder._record(request, start, response=response)
+            return response
+
+        HTTPAdapter.send = send
+        self._thread = threading.Thread(target=self._writer, name="soap-recorder", daemon=True)
+        self._thread.start()
+        logger.info("Recording speaker traffic to %s", self._path)
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            HTTPAdapter.send = self._original
+            self._original = None
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _record(self, request, start: float, response=None, error: str | None = None) -> None:
+        elapsed = time.perf_counter() - start
+        url = urlsplit(request.url)
+        record = {
+            "t": round(time.time() - self._started, 4),
+            "ms": round(elapsed * 1000, 3),
+            "method": request.method,
+            "host": url.hostname,
+            "path": url.path,
+            "action": request.headers.get("SOAPACTION", "").strip('"'),
+            "request": _text(request.body),
+        }
+        if response is not None:
+            record.update(status=response.status_code, type=response.headers.get("Content-Type", ""))
+            # Raw bytes: response.text would guess the charset and mangle images
+            record["response"], encoding = _response_body(response.content, record["type"])
+            if encoding:
+                record["encoding"] = encoding
+        else:
+            record["error"] = error
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc("soap_capture_dropped")
+
+    def _writer(self) -> None:
+        seen: set[str] = set()
+        with gzip.open(self._path, "wt", encoding="utf-8") as out:
+            out.write(json.dumps({"version": _FORMAT_VERSION, "started": self._started}) + "\n")
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    record = self._queue.get(timeout=_FLUSH_INTERVAL)
+                except queue.Empty:
+                    record = ...
+                if record is None:
+                    return
+                if record is not ...:
+                    for field in ("request", "response"):
+                        if field in record:
+                            data = record.pop(field)
+                            blob = _blob_id(data)
+                            if blob not in seen:
+                                seen.add(blob)
+                                out.write(json.dumps({"blob": blob, "data": data}) + "\n")
+                            record[field] = blob
+                    out.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    metrics.inc("soap_captured")
+                if time.monotonic() - last_flush >= _FLUSH_INTERVAL:
+                    out.flush()  # Readable up to here even if the process dies
+                    last_flush = time.monotonic()
+
+
+class SoapReplayer:
+    """Answers speaker HTTP requests from a capture, with the recorded latency.
+
+    A request is matched on method, host, path, SOAP action and body; if
+    the arguments differ (a different volume, another queue page) any
+    recorded call of the same action is used. Repeated calls cycle
+    through the recorded answers in order. Unmatched calls get a UPnP
+    fault (``soap_replay_misses``). ``soco.discover`` returns the
+    captured speakers. ``speed`` > 1 shortens the latencies.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        self._path = path
+        self._speed = speed
+        self._exact: dict[tuple, list[dict]] = defaultdict(list)
+        self._loose: dict[tuple, list[dict]] = defaultdict(list)
+        self._turns: dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hosts: set[str] = set()
+        self._originals = None
+
+    def load(self) -> None:
+        """Read the capture (blocking)."""
+        blobs: dict[str, str] = {}
+        with gzip.open(self._path, "rt", encoding="utf-8") as capture:
+            header = json.loads(next(capture))
+            if header.get("version") != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported capture version {header.get('version')}")
+            for line in capture:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Truncated tail of a capture whose process was killed
+                if "blob" in record:
+                    blobs[record["blob"]] = record["data"]
+                    continue
+                record["response"] = blobs.get(record.get("response"), "")
+                exact, loose = _keys(record["method"], record["host"], record["path"], record["action"], record["request"])
+                self._exact[exact].append(record)
+                self._loose[loose].append(record)
+                if "error" not in record:
+                    self.hosts.add(record["host"])
+        logger.info("Replaying %d speaker calls from %d hosts", sum(map(len, self._exact.values())), len(self.hosts))
+
+    def install(self) -> None:
+        original_send = HTTPAdapter.send
+        self._originals = (original_send, soco.discover)
+        replayer = self
+
+        def send(adapter, request, *args, **kwargs):
+            if not _is_speaker_call(request):
+                return original_send(adapter, request, *args, **kwargs)
+            return replayer._serve(request)
+
+        def discover(timeout=5, include_invisible=False, **kwargs):
+            devices = {soco.SoCo(host) for host in self.hosts}
+            return {d for d in devices if include_invisible or d.is_visible} or None
+
+        HTTPAdapter.send = send
+        soco.discover = discover
+
+    def uninstall(self) -> None:
+        if self._originals is not None:
+            HTTPAdapter.send, soco.discover = self._originals
+            self._originals = None
+
+    def _pick(self, key: tuple, records: list[dict]) -> dict:
+        with self._lock:
+            turn = self._turns[key]
+            self._turns[key] = turn + 1
+        return records[turn % len(records)]
+
+    def _serve(self, request) -> requests.Response:
+        url = urlsplit(request.url)
+        action = request.headers.get("SOAPACTION", "").strip('"')
+        exact, loose = _keys(request.method, url.hostname, url.path, action, _blob_id(_text(request.body)))
+        if exact in self._exact:
+            record = self._pick(exact, self._exact[exact])
+        elif loose in self._loose:
+            metrics.inc("soap_replay_loose")
+            record = self._pick(loose, self._loose[loose])
+        else:
+            metrics.inc("soap_replay_misses")
+            logger.warning("Not in capture: %s %s %s", request.method, request.url, action)
+            record = {"ms": 0, "status": 500, "type": "text/xml", "response": _FAULT}
+
+        time.sleep(record["ms"] / 1000 / self._speed)
+        if "error" in record:
+            error = getattr(requests.exceptions, record["error"], requests.ConnectionError)
+            raise error(f"Recorded {record['error']}", request=request)
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict({"Content-Type": record["type"]})
+        if record.get("encoding") == "base64":
+            response._content = base64.b64decode(record["response"])
+        else:
+            response._content = record["response"].encode("utf-8")
+            response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
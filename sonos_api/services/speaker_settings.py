@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+
+from sonos_api.utils.priority_lock import Priority
+from sonos_api.utils.retry import retry_soco
+
+logger = logging.getLogger(__name__)
+
+# Play mode mapping: (shuffle, repeat) -> SoCo play_mode string
+PLAY_MODES = {
+    (False, "off"): "NORMAL",
+    (True, "off"): "SHUFFLE_NOREPEAT",
+    (False, "all"): "REPEAT_ALL",
+    (True, "all"): "SHUFFLE",
+    (False, "one"): "REPEAT_ONE",
+    (True, "one"): "SHUFFLE_REPEAT_ONE",
+}
+
+
+def parse_play_mode(mode: str) -> tuple[bool, str]:
+    """SoCo play_mode string -> (shuffle, repeat)."""
+    shuffle = "SHUFFLE" in mode
+    if "REPEAT_ONE" in mode:
+        return shuffle, "one"
+    if "REPEAT" in mode or mode == "SHUFFLE":
+        return shuffle, "all"
+    return shuffle, "off"
+
+
+def _set_sleep_timer(speaker, seconds: int) -> None:
+    speaker.set_sleep_timer(seconds or None)
+
+
+def _setter(name: str):
+    return lambda speaker, value: setattr(speaker, name, value)
+
+
+# name -> (scope, capability feature, read, write). "room" settings belong to
+# the speaker itself, "group" settings to its group coordinator.
+FIELDS = {
+    "bass": ("room", "eq", lambda s: s.bass, _setter("bass")),
+    "treble": ("room", "eq", lambda s: s.treble, _setter("treble")),
+    "loudness": ("room", "loudness", lambda s: s.loudness, _setter("loudness")),
+    "night_mode": ("room", "night_mode", lambda s: s.night_mode, _setter("night_mode")),
+    "dialog_mode": ("room", "dialog_mode", lambda s: s.dialog_mode, _setter("dialog_mode")),
+    "play_mode": ("group", None, lambda s: s.play_mode, _setter("play_mode")),
+    "crossfade": ("group", None, lambda s: s.cross_fade, _setter("cross_fade")),
+    "sleep_timer": ("group", None, lambda s: s.get_sleep_timer() or 0, _set_sleep_timer),
+}
+
+# Event variables -> (field, parser). The sleep timer is not evented.
+_EVENT_FIELDS = {
+    "RenderingControl": {
+        "bass": ("bass", int),
+        "treble": ("treble", int),
+        "loudness": ("loudness", lambda v: v == "1"),
+        "night_mode": ("night_mode", lambda v: v == "1"),
+        "dialog_level": ("dialog_mode", lambda v: v == "1"),
+    },
+    "AVTransport": {
+        "current_play_mode": ("play_mode", str),
+        "current_crossfade_mode": ("crossfade", lambda v: v == "1"),
+    },
+}
+
+_MISSING = object()
+
+
+class SpeakerSettings:
+    """EQ, play mode, crossfade and sleep timer of each speaker, read and written as one document.
+
+    Values read or written through the API are cached per speaker UID.
+    While a room has event subscriptions its cached values are kept current
+    by RenderingControl and AVTransport events and never expire; otherwise
+    they are trusted for ``ttl`` seconds. Writes compare against the cache
+    and only send what differs; settings that aren't cached are written
+    without reading them first.
+    """
+
+    def __init__(self, ttl: float = 5.0) -> None:
+        self._ttl = ttl
+        self._values: dict[str, dict[str, tuple[object, float]]] = {}  # uid -> field -> (value, read at)
+        self._manager = None
+        self._store = None
+        self._capabilities = None
+
+    def start(self, manager, store, capabilities) -> None:
+        self._manager = manager
+        self._store = store
+        self._capabilities = capabilities
+        store.add_event_listener(self._on_event)
+
+    # -- cache -------------------------------------------------------------
+
+    def cached(self, speaker, field: str):
+        """Cached value of ``field``, or ``_MISSING`` when unknown or expired."""
+        entry = self._values.get(speaker.uid, {}).get(field)
+        if entry is None:
+            return _MISSING
+        value, at = entry
+        if time.monotonic() - at < self._ttl:
+            return value
+        if field != "sleep_timer" and self._store is not None and self._store.poll_interval(speaker.uid) is None:
+            return value  # Kept current by events
+        return _MISSING
+
+    def remember(self, speaker, field: str, value) -> None:
+        self._values.setdefault(speaker.uid, {})[field] = (value, time.monotonic())
+
+    def _on_event(self, room: str, service: str, variables: dict) -> None:
+        fields = _EVENT_FIELDS.get(service)
+        speaker = self._manager.get(room) if fields and self._manager is not None else None
+        if speaker is None:
+            return
+        for variable, (field, parse) in fields.items():
+            value = variables.get(variable)
+            if isinstance(value, dict):
+                value = value.get("Master")
+            if value is None:
+                continue
+            try:
+                self.remember(speaker, field, parse(value))
+            except ValueError:
+                pass
+
+    def _prune(self) -> None:
+        known = {speaker.uid for speaker in self._manager.speakers.values()}
+        for uid in self._values.keys() - known:
+            del self._values[uid]
+
+    # -- speaker I/O -------------------------------------------------------
+
+    def _target(self, room: str, field: str):
+        return self._manager.get(room) if FIELDS[field][0] == "room" else self._manager.coordinator(room)
+
+    def _supported(self, speaker, field: str) -> bool:
+        feature = FIELDS[field][1]
+        return feature is None or self._capabilities is None or self._capabilities.supports(speaker, feature)
+
+    async def _each(self, plan: dict[str, tuple[object, list[str]]], call, priority: Priority) -> dict:
+        """Run ``call(speaker, field)`` for every planned field, concurrently.
+
+        ``plan`` maps speaker UID -> (speaker, fields); each speaker's lock
+        is taken once for all of its fields. Returns field -> result or
+        exception.
+        """
+
+        async def _speaker(speaker, fields):
+            @retry_soco()
+            async def _call(field):
+                return await asyncio.to_thread(call, speaker, field)
+
+            async with self._manager.get_lock(speaker, priority):
+                return await asyncio.gather(*(_call(f) for f in fields), return_exceptions=True)
+
+        plans = list(plan.values())
+        results = await asyncio.gather(*(_speaker(speaker, fields) for speaker, fields in plans))
+        return {field: result for (_, fields), outcome in zip(plans, results) for field, result in zip(fields, outcome)}
+
+    async def read(self, room: str, fields: Iterable[str] = FIELDS) -> tuple[dict, dict]:
+        """Values of ``fields`` for a room and read errors by field.
+
+        Cached values cost nothing; the rest are read in one pass,
+        concurrently, under the room and coordinator locks. Unsupported
+        settings are None.
+        """
+        self._prune()
+        speaker = self._manager.get(room)
+        values: dict = {}
+        plan: dict[str, tuple[object, list[str]]] = {}
+        for field in fields:
+            if not self._supported(speaker, field):
+                values[field] = None
+                continue
+            target = self._target(room, field)
+            value = self.cached(target, field)
+            if value is _MISSING:
+                plan.setdefault(target.uid, (target, []))[1].append(field)
+            else:
+                values[field] = value
+
+        errors: dict[str, str] = {}
+        results = await self._each(plan, lambda target, field: FIELDS[field][2](target), Priority.READ)
+        for field, result in results.items():
+            target = self._target(room, field)
+            if isinstance(result, Exception):
+                logger.warning("Reading %s of %s failed: %s", field, target.ip_address, result)
+                values[field] = None
+                errors[field] = str(result) or type(result).__name__
+            else:
+                values[field] = result
+                self.remember(target, field, result)
+        return values, errors
+
+    async def play_mode(self, room: str, shuffle: bool | None, repeat: str | None) -> str:
+        """Play mode string for a shuffle and/or repeat change; reads the current mode only if not cached."""
+        if shuffle is None or repeat is None:
+            coordinator = self._manager.coordinator(room)
+            mode = self.cached(coordinator, "play_mode")
+            if mode is _MISSING:
+
+                @retry_soco()
+                async def _read():
+                    return await asyncio.to_thread(lambda: coordinator.play_mode)
+
+                async with self._manager.get_lock(coordinator, Priority.READ):
+                    mode = await _read()
+                self.remember(coordinator, "play_mode", mode)
+            current_shuffle, current_repeat = parse_play_mode(mode)
+            shuffle = current_shuffle if shuffle is None else shuffle
+            repeat = current_repeat if repeat is None else repeat
+        return PLAY_MODES.get((shuffle, repeat), "NORMAL")
+
+    async def write(self, room: str, wanted: dict) -> dict:
+        """Send the settings in ``wanted`` that differ from the cache, in parallel.
+
+        Returns the fields ``changed``, ``unchanged`` (already set),
+        ``unsupported`` by the speaker, and ``errors`` by field.
+        """
+        self._prune()
+        speaker = self._manager.get(room)
+        result = {"changed": [], "unchanged": [], "unsupported": [], "errors": {}}
+        plan: dict[str, tuple[object, list[str]]] = {}
+        for field, value in wanted.items():
+            if not self._supported(speaker, field):
+                result["unsupported"].append(field)
+                continue
+            target = self._target(room, field)
+            # A running sleep timer is restarted even if the same duration is asked for
+            if self.cached(target, field) == value and (field != "sleep_timer" or value == 0):
+                result["unchanged"].append(field)
+            else:
+                plan.setdefault(target.uid, (target, []))[1].append(field)
+
+        outcomes = await self._each(plan, lambda target, field: FIELDS[field][3](target, wanted[field]), Priority.WRITE)
+        for field, outcome in outcomes.items():
+            target = self._target(room, field)
+            if isinstance(outcome, Exception):
+                logger.warning("Setting %s of %s failed: %s", field, target.ip_address, outcome)
+                result["errors"][field] = str(outcome) or type(outcome).__name__
+                self._values.get(target.uid, {}).pop(field, None)
+            else:
+                result["changed"].append(field)
+                self.remember(target, field, wanted[field])
+        return result
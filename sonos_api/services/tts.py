@@ -4,6 +4,9 @@ import logging
 from pathlib import Path
 
 from sonos_api.config import settings
+from sonos_api.services.announce import play_announcement
+from sonos_api.services.clips import audio_duration
+from sonos_api.utils.network import resolver
 
 logger = logging.getLogger(__name__)
 
@@ -32,46 +35,12 @@ async def generate_tts(text: str, language: str = "en") -> str:
     return filename
 
 
-async def announce(speaker, text: str, language: str = "en", volume: int | None = None, host_ip: str = ""):
+async def announce(speaker, text: str, language: str = "en", volume: int | None = None):
     """Play a TTS announcement on a speaker, restoring state afterwards."""
     filename = await generate_tts(text, language)
+    path = Path(settings.tts_cache_dir) / filename
+    duration = audio_duration(await asyncio.to_thread(path.read_bytes), "audio/mpeg")
 
-    def _do_announce():
-        # Save current state
-        prev_volume = speaker.volume
-        prev_mute = speaker.mute
-        transport = speaker.get_current_transport_info()
-        was_playing = transport.get("current_transport_state") == "PLAYING"
-
-        try:
-            # Set announcement volume
-            if volume is not None:
-                speaker.volume = volume
-            if speaker.mute:
-                speaker.mute = False
-
-            # Build URI — the FastAPI static mount serves from tts_cache_dir
-            uri = f"http://{host_ip}:{settings.api_port}/static/{filename}"
-            speaker.play_uri(uri, title="Announcement")
-
-            # Wait for it to finish (poll transport state)
-            import time
-
-            time.sleep(1)  # Give it a moment to start
-            for _ in range(60):  # Max 60 seconds
-                info = speaker.get_current_transport_info()
-                state = info.get("current_transport_state", "")
-                if state in ("STOPPED", "PAUSED_PLAYBACK"):
-                    break
-                time.sleep(1)
-        finally:
-            # Restore state
-            speaker.volume = prev_volume
-            speaker.mute = prev_mute
-            if was_playing:
-                try:
-                    speaker.play()
-                except Exception:
-                    pass  # Previous track may no longer be available
-
-    await asyncio.to_thread(_do_announce)
+    # Build URI — the FastAPI static mount serves from tts_cache_dir
+    uri = f"{resolver.base_url(speaker, settings.api_port)}/static/{filename}"
+    await play_announcement(speaker, uri, volume=volume, duration=duration)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from sonos_api.utils import systemd
+from sonos_api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and feeds the systemd watchdog while healthy.
+
+    A probe task sleeps for ``probe_interval`` and records how late it woke
+    up. ``WATCHDOG=1`` is only sent when the lag is below ``max_lag`` and a
+    no-op job completes on the default thread pool (used for all SoCo calls)
+    within ``pool_timeout``. A separate monitor thread logs the loop thread's
+    stack whenever the loop stops ticking for longer than ``slow_callback``.
+    """
+
+    def __init__(
+        self,
+        probe_interval: float = 1.0,
+        max_lag: float = 5.0,
+        pool_timeout: float = 10.0,
+        slow_callback: float = 0.25,
+        notify_socket: str | None = None,
+    ) -> None:
+        self._probe_interval = probe_interval
+        self._max_lag = max_lag
+        self._pool_timeout = pool_timeout
+        self._slow_callback = slow_callback
+        self._notify_socket = notify_socket
+        self._ping_interval: float | None = None
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._monitor: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        """Start the lag probe and the stall monitor thread."""
+        interval = systemd.watchdog_interval()
+        if interval:
+            # systemd recommends pinging at half the configured timeout
+            self._ping_interval = interval / 2
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe_loop())
+        self._monitor = threading.Thread(target=self._monitor_loop, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        """Stop probing and pinging."""
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._monitor:
+            self._monitor.join(timeout=1)
+
+    def notify(self, state: str) -> bool:
+        return systemd.notify(state, self._notify_socket)
+
+    async def _pool_healthy(self) -> bool:
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(lambda: None), timeout=self._pool_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Thread pool did not run a no-op within %.1fs", self._pool_timeout)
+            return False
+        metrics.set_gauge("thread_pool_latency_seconds", time.monotonic() - start)
+        return True
+
+    async def _probe_loop(self) -> None:
+        last_ping = 0.0
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self._probe_interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(0.0, now - start - self._probe_interval)
+            metrics.set_gauge("event_loop_lag_seconds", lag)
+            metrics.observe("event_loop_lag", lag)
+
+            if self._ping_interval is None or now - last_ping < self._ping_interval:
+                continue
+            if lag > self._max_lag:
+                logger.warning("Event loop lag %.2fs exceeds %.2fs, withholding watchdog ping", lag, self._max_lag)
+                continue
+            if not await self._pool_healthy():
+                continue
+            if self.notify("WATCHDOG=1"):
+                last_ping = time.monotonic()
+
+    def _monitor_loop(self) -> None:
+        stalled = False
+        while not self._stopped.wait(self._slow_callback):
+            since_beat = time.monotonic() - self._last_beat
+            if since_beat < self._probe_interval + self._slow_callback:
+                stalled = False
+                continue
+            if stalled:
+                continue  # Already reported this stall
+            stalled = True
+            metrics.inc("event_loop_stalls")
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            logger.warning("Event loop blocked for %.2fs, loop thread stack:\n%s", since_beat, stack)
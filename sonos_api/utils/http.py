@@ -0,0 +1,87 @@
+import re
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+_VERSION_RE = re.compile(r'^(?:W/)?"(\d+)"$')
+
+# Maximum long-poll hold time (seconds)
+MAX_WAIT = 60.0
+
+
+def version_etag(version: int) -> str:
+    """Weak ETag for a state version (the interpolated position may differ)."""
+    return f'W/"{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+def request_version(request: Request, since: int | None) -> int | None:
+    """Version the client already has: ``?since=`` or a version ETag in If-None-Match."""
+    if since is not None:
+        return since
+    match = _VERSION_RE.match(request.headers.get("if-none-match", "").strip())
+    return int(match.group(1)) if match else None
+
+
+def room_not_found(request: Request, room: str) -> JSONResponse:
+    """404 for an unknown room, with "did you mean" suggestions.
+
+    Before the first discovery has finished the room may just not be
+    known yet: that's a 503 with Retry-After instead.
+    """
+    manager = request.app.state.speaker_manager
+    if not manager.discovered:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Discovering speakers", "detail": room},
+            headers={"Retry-After": "1"},
+        )
+    content = {"error": "Room not found", "detail": room}
+    suggestions = manager.suggest(room)
+    if suggestions:
+        content["suggestions"] = suggestions
+    return JSONResponse(status_code=404, content=content)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson.
+
+    Endpoints return plain dicts they built themselves (no model
+    re-validation) or ``bytes`` that are already serialized; the route's
+    ``response_model`` still documents the schema in OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+class Snapshots:
+    """Serialized response bodies, one per key, valid for a single version."""
+
+    def __init__(self) -> None:
+        self._bodies: dict[object, tuple[object, bytes]] = {}
+
+    def __contains__(self, key) -> bool:
+        return key in self._bodies
+
+    def get(self, key, version) -> bytes | None:
+        entry = self._bodies.get(key)
+        return entry[1] if entry and entry[0] == version else None
+
+    def put(self, key, version, body: bytes) -> None:
+        self._bodies[key] = (version, body)
@@ -0,0 +1,65 @@
+import copy
+import logging
+import logging.handlers
+import queue
+
+from sonos_api.utils.metrics import metrics
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks and never formats on the caller's thread.
+
+    Records are handed to a bounded queue drained by a QueueListener
+    thread, which does the formatting and the (possibly slow) write. When
+    the queue is full the record is dropped and counted instead of
+    stalling the event loop.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc("log_records_dropped")
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Render %-args now (they may change after we return) but leave
+        # structlog's event dicts and tracebacks for the writer thread
+        if record.args and not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in ``every`` DEBUG records from the given logger prefixes.
+
+    Records above DEBUG, and DEBUG records from other loggers, always pass.
+    """
+
+    def __init__(self, prefixes: tuple[str, ...], every: int) -> None:
+        super().__init__()
+        self._prefixes = prefixes
+        self._every = max(1, every)
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not record.name.startswith(self._prefixes):
+            return True
+        self._seen += 1
+        if self._seen % self._every == 0:
+            return True
+        metrics.inc("log_records_sampled_out")
+        return False
+
+
+def start_queue_logging(handler: logging.Handler, size: int) -> tuple[logging.Handler, logging.handlers.QueueListener]:
+    """Put ``handler`` behind a bounded queue and a writer thread.
+
+    Returns the handler to install on loggers and the running listener
+    (stop it at shutdown to flush what is still queued).
+    """
+    records: queue.Queue = queue.Queue(maxsize=size)
+    listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    return DroppingQueueHandler(records), listener
@@ -0,0 +1,76 @@
+import gc
+import os
+import tracemalloc
+
+# Allocations made by tracemalloc itself and by imports are noise here
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+GROUPS = ("lineno", "filename", "traceback")
+
+
+def rss_bytes() -> int | None:
+    """Resident set size of this process (Linux only)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def count_instances(cls: type) -> int:
+    """Live objects of ``cls`` tracked by the GC (walks the heap; slow)."""
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, cls))
+
+
+class MemoryProfiler:
+    """tracemalloc wrapper: top allocation sites and growth between reports.
+
+    Tracing costs CPU and memory on every allocation, so it only runs when
+    started (``SONOS_DEBUG_MEMORY``). Each report is diffed against the
+    previous one; the first against the snapshot taken at start.
+    """
+
+    def __init__(self, frames: int = 4) -> None:
+        self._frames = frames
+        self._last: tracemalloc.Snapshot | None = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+        self._last = self._snapshot()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._last = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    @staticmethod
+    def _site(stat) -> str | list[str]:
+        frames = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+        return frames if len(frames) > 1 else frames[0]
+
+    def report(self, top: int = 15, group: str = "lineno") -> dict:
+        """Current, peak and top allocation sites, plus the diff since the last report."""
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        stats = snapshot.statistics(group)
+        diff = snapshot.compare_to(self._last, group) if self._last is not None else []
+        self._last = snapshot
+        return {
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": [{"site": self._site(s), "size": s.size, "count": s.count} for s in stats[:top]],
+            "growth": [
+                {"site": self._site(s), "size_diff": s.size_diff, "size": s.size, "count_diff": s.count_diff}
+                for s in diff[:top]
+                if s.size_diff
+            ],
+        }
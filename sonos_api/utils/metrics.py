@@ -0,0 +1,43 @@
+import threading
+
+
+class Metrics:
+    """Minimal in-process metrics registry (gauges, counters, summaries)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._gauges: dict[str, float] = {}
+        self._counters: dict[str, int] = {}
+        self._summaries: dict[str, list[float]] = {}  # name -> [count, sum, max]
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                if value > summary[2]:
+                    summary[2] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "gauges": dict(self._gauges),
+                "counters": dict(self._counters),
+                "summaries": {
+                    name: {"count": int(c), "sum": s, "max": m, "avg": s / c if c else 0.0}
+                    for name, (c, s, m) in self._summaries.items()
+                },
+            }
+
+
+metrics = Metrics()
@@ -0,0 +1,92 @@
+import logging
+import socket
+import threading
+import time
+
+from sonos_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Re-check routes this often even without a discovery change (DHCP renewals)
+_TTL = 300.0
+
+
+def _route_source(ip: str) -> str | None:
+    """Local address the kernel would use to reach ``ip``.
+
+    ``connect`` on a UDP socket only looks up the route; nothing is sent,
+    so this works on a network without internet access.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect((ip, 1400))
+            address = sock.getsockname()[0]
+    except OSError:
+        return None
+    return None if address.startswith(("0.", "127.")) else address
+
+
+def _fallback() -> str:
+    try:
+        for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET):
+            if not info[4][0].startswith("127."):
+                return info[4][0]
+    except OSError:
+        pass
+    return "127.0.0.1"
+
+
+class CallbackResolver:
+    """Address a speaker can reach this server at, per speaker.
+
+    URLs handed to a speaker (TTS files, clips) must use an address on the
+    interface facing that speaker's subnet. The routing table gives it;
+    results are cached per speaker IP and dropped when the set of
+    speakers or the local interfaces change (checked on each discovery),
+    or after ``_TTL``. ``override`` (SONOS_CALLBACK_HOST) skips all that,
+    for NAT or container setups where the speakers see another address.
+    """
+
+    def __init__(self, override: str = "") -> None:
+        self.override = override
+        self._cache: dict[str, tuple[str, float]] = {}
+        self._fingerprint: tuple | None = None
+        self._lock = threading.Lock()
+
+    def host_for(self, speaker_ip: str) -> str:
+        if self.override:
+            return self.override
+        entry = self._cache.get(speaker_ip)
+        now = time.monotonic()
+        if entry is not None and now - entry[1] < _TTL:
+            return entry[0]
+        address = _route_source(speaker_ip)
+        if address is None:
+            address = _fallback()
+            logger.warning("No route to speaker %s, advertising %s", speaker_ip, address)
+        self._cache[speaker_ip] = (address, now)
+        return address
+
+    def base_url(self, speaker, port: int) -> str:
+        """``http://host:port`` of this server as seen from ``speaker``."""
+        return f"http://{self.host_for(speaker.ip_address)}:{port}"
+
+    def invalidate(self) -> None:
+        self._cache = {}
+
+    def check(self, speaker_ips) -> None:
+        """Drop cached routes if speakers or local interfaces changed (blocking; run in a thread)."""
+        try:
+            interfaces = tuple(socket.if_nameindex())
+        except OSError:
+            interfaces = ()
+        fingerprint = (frozenset(speaker_ips), interfaces)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                if self._fingerprint is not None:
+                    logger.info("Speakers or network interfaces changed, re-resolving callback address")
+                self._fingerprint = fingerprint
+                self.invalidate()
+
+
+resolver = CallbackResolver(settings.callback_host)
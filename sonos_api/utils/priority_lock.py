@@ -0,0 +1,180 @@
+import asyncio
+import itertools
+import math
+import time
+from enum import IntEnum
+
+from sonos_api.utils.metrics import metrics
+
+
+class Priority(IntEnum):
+    """Speaker I/O classes, most urgent first."""
+
+    WRITE = 0  # interactive commands: play, pause, volume, ...
+    READ = 1  # interactive reads the state cache couldn't answer
+    BACKGROUND = 2  # bulk browses, position resyncs, library crawl
+
+
+class SpeakerBusy(Exception):
+    """A speaker's wait queue is full or its rate limit is used up."""
+
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class Superseded(Exception):
+    """A queued write was replaced by a newer write of the same kind."""
+
+
+class TokenBucket:
+    """Classic token bucket; ``rate`` <= 0 disables limiting."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self._rate = rate
+        self._burst = max(burst, 1.0)
+        self._tokens = self._burst
+        self._stamp = time.monotonic()
+
+    def take(self) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is available."""
+        if self._rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class PriorityLock:
+    """Per-speaker mutex that hands the speaker to the most urgent waiter.
+
+    Waiters are served by priority class, FIFO within a class. A waiter
+    that has waited longer than ``max_wait`` is served before all others
+    (oldest first) so a stream of interactive commands can't starve
+    background work forever. Wait times are recorded per class.
+
+    Admission control: interactive (WRITE/READ) acquires fail fast with
+    SpeakerBusy when ``max_queue`` callers are already waiting or the
+    speaker's token bucket is empty; BACKGROUND work waits for a token
+    instead. A waiter queued with a ``key`` is replaced (Superseded) by a
+    later waiter with the same key, so only the newest of a burst of
+    equivalent writes (e.g. absolute volume sets) reaches the speaker.
+    """
+
+    def __init__(self, max_wait: float = 2.0, max_queue: int = 0, rate: float = 0.0, burst: float = 1.0) -> None:
+        self._max_wait = max_wait
+        self._max_queue = max_queue
+        self._bucket = TokenBucket(rate, burst)
+        self._rate = rate
+        self._locked = False
+        # (priority, seq, enqueued, future, key)
+        self._waiters: list[tuple[Priority, int, float, asyncio.Future, str | None]] = []
+        self._seq = itertools.count()
+
+    def __call__(self, priority: Priority = Priority.WRITE, key: str | None = None) -> "_Hold":
+        return _Hold(self, priority, key)
+
+    def locked(self) -> bool:
+        return self._locked
+
+    def idle(self) -> bool:
+        """Not held and nobody waiting (safe to drop)."""
+        return not self._locked and not self._waiters
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def _admit(self, priority: Priority) -> None:
+        if priority != Priority.BACKGROUND and self._max_queue and len(self._waiters) >= self._max_queue:
+            metrics.inc("speaker_rejected.queue_full")
+            backlog = len(self._waiters) / self._rate if self._rate > 0 else 1.0
+            raise SpeakerBusy("Speaker queue is full", backlog)
+        while delay := self._bucket.take():
+            if priority != Priority.BACKGROUND:
+                metrics.inc("speaker_rejected.rate_limited")
+                raise SpeakerBusy("Speaker rate limit exceeded", delay)
+            await asyncio.sleep(delay)
+
+    async def acquire(self, priority: Priority = Priority.WRITE, key: str | None = None) -> None:
+        await self._admit(priority)
+        start = time.monotonic()
+        if not self._locked:
+            self._locked = True
+            metrics.observe(f"speaker_lock_wait_seconds.{priority.name.lower()}", 0.0)
+            return
+
+        if key is not None:
+            for queued in self._waiters:
+                if queued[4] == key and not queued[3].done():
+                    self._waiters.remove(queued)
+                    queued[3].set_exception(Superseded(key))
+                    metrics.inc("speaker_writes_superseded")
+                    break
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._seq), start, future, key)
+        self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()  # Granted just as we were cancelled: pass it on
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        metrics.observe(f"speaker_lock_wait_seconds.{priority.name.lower()}", time.monotonic() - start)
+
+    def release(self) -> None:
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired")
+        waiter = self._next_waiter()
+        if waiter is None:
+            self._locked = False
+            return
+        # Hand over directly so nobody can barge in between release and wake-up
+        self._waiters.remove(waiter)
+        waiter[3].set_result(None)
+
+    def _next_waiter(self):
+        # Waiters cancelled since they queued haven't cleaned up yet
+        self._waiters = [w for w in self._waiters if not w[3].done()]
+        if not self._waiters:
+            return None
+        oldest = min(self._waiters, key=lambda w: w[2])
+        if time.monotonic() - oldest[2] >= self._max_wait:
+            if oldest[0] != Priority.WRITE:
+                metrics.inc("speaker_lock_starvation_grants")
+            return oldest
+        return min(self._waiters, key=lambda w: (w[0], w[1]))
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+
+class _Hold:
+    """``async with lock(priority, key):`` helper."""
+
+    __slots__ = ("_lock", "_priority", "_key")
+
+    def __init__(self, lock: PriorityLock, priority: Priority, key: str | None) -> None:
+        self._lock = lock
+        self._priority = priority
+        self._key = key
+
+    async def __aenter__(self) -> None:
+        await self._lock.acquire(self._priority, self._key)
+
+    async def __aexit__(self, *exc) -> None:
+        self._lock.release()
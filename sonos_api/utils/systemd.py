@@ -0,0 +1,42 @@
+import logging
+import os
+import socket
+
+logger = logging.getLogger(__name__)
+
+
+def notify(state: str, socket_path: str | None = None) -> bool:
+    """Send a sd_notify(3) message such as ``READY=1`` or ``WATCHDOG=1``.
+
+    Uses ``$NOTIFY_SOCKET`` unless ``socket_path`` is given. Returns False
+    when not running under systemd or the message could not be delivered.
+    """
+    path = socket_path or os.environ.get("NOTIFY_SOCKET")
+    if not path:
+        return False
+    if path.startswith("@"):
+        # Abstract namespace socket
+        path = "\0" + path[1:]
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM | socket.SOCK_CLOEXEC) as sock:
+            sock.connect(path)
+            sock.sendall(state.encode())
+    except OSError as exc:
+        logger.warning("sd_notify failed: %s", exc)
+        return False
+    return True
+
+
+def watchdog_interval() -> float | None:
+    """Return the systemd watchdog timeout in seconds, or None if disabled."""
+    usec = os.environ.get("WATCHDOG_USEC")
+    if not usec:
+        return None
+    pid = os.environ.get("WATCHDOG_PID")
+    if pid and pid != str(os.getpid()):
+        return None
+    try:
+        return int(usec) / 1_000_000
+    except ValueError:
+        return None
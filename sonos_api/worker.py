@@ -0,0 +1,262 @@
+"""Stateless HTTP worker for multi-worker deployments.
+
+Serves ``GET /{room}/state``, ``GET /state``, ``/zones`` and ``/health`` from
+the owner's shared-memory snapshot while events keep it current, and
+forwards every other request to the owner process
+(``sonos_api.owner``) over its Unix socket. Run several of them:
+
+    SONOS_OWNER_SOCKET=/run/sonos-api/owner.sock \\
+        uvicorn sonos_api.worker:app --host 0.0.0.0 --port 5005 --workers 4
+"""
+
+import asyncio
+import logging
+import re
+import time
+from urllib.parse import parse_qs, unquote
+
+import orjson
+
+from sonos_api.config import settings
+from sonos_api.ipc.rpc import OwnerClient, OwnerUnavailable
+from sonos_api.ipc.snapshot import SnapshotReader, snapshot_path
+from sonos_api.services.room_state import format_hms
+from sonos_api.utils.metrics import metrics
+from sonos_api.utils.speaker import normalize_room_name
+
+logger = logging.getLogger(__name__)
+
+_STATE_PATH_RE = re.compile(r"^/([^/]+)/state$")
+
+# A snapshot older than this means the owner is gone; forward (and fail) instead
+_MAX_SNAPSHOT_AGE = 5.0
+
+# GET /state fields (as in routers.state.STATE_FIELDS)
+_STATE_FIELDS = ("state", "volume", "mute", "track", "group")
+
+
+def _json(status: int, content, headers: list | None = None) -> tuple[int, list, bytes]:
+    body = orjson.dumps(content) if content is not None else b""
+    return status, [(b"content-type", b"application/json"), *(headers or [])], body
+
+
+def _etag_matches(scope, etag: bytes) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"if-none-match" and (value.strip() == b"*" or etag in (t.strip() for t in value.split(b","))):
+            return True
+    return False
+
+
+def _track(state: dict) -> dict:
+    """Exported track info with the position interpolated to now."""
+    position = state["position"]
+    if state["transport"] == "PLAYING":
+        position += time.monotonic() - state["clock_synced"]
+        if state["duration"]:
+            position = min(position, state["duration"])
+    return {**state["track"], "position": format_hms(position) if state["clock_synced"] else ""}
+
+
+class WorkerApp:
+    """ASGI app: snapshot fast path plus a forwarder to the owner."""
+
+    def __init__(self, owner_socket: str) -> None:
+        self._owner_socket = owner_socket
+        self._client: OwnerClient | None = None
+        self._snapshot: SnapshotReader | None = None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            # /ws needs a long-lived bidirectional channel the RPC doesn't carry
+            await send({"type": "websocket.close", "code": 1013})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if not self._owner_socket:
+                    await send({"type": "lifespan.startup.failed", "message": "SONOS_OWNER_SOCKET is not set"})
+                    return
+                self._client = OwnerClient(self._owner_socket)
+                self._snapshot = SnapshotReader(snapshot_path(self._owner_socket))
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self._client.close()
+                self._snapshot.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # -- snapshot fast path ------------------------------------------------
+
+    def _document(self) -> dict | None:
+        document = self._snapshot.read()
+        if document is None:
+            return None
+        if time.time() - document["published"] > _MAX_SNAPSHOT_AGE:
+            self._snapshot.close()  # Re-open next time in case a new owner recreated the file
+            return None
+        return document
+
+    def _from_snapshot(self, scope) -> tuple[int, list, bytes] | None:
+        """Answer from shared memory, or None when the owner must handle it."""
+        if scope["method"] != "GET":
+            return None
+        path = scope["path"]
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        if float(query.get("wait", ["0"])[0] or 0) > 0:
+            return None  # Long-polls wait on the owner's change events
+        if path == "/health":
+            document = self._document()
+            if document is None:
+                return None
+            status = "ok" if document["discovered"] else "discovering"
+            return _json(200, {"status": status, "speakers": document["speakers"]})
+        if path == "/zones":
+            return self._zones(scope)
+        if path == "/state":
+            return self._all_states(query)
+
+        match = _STATE_PATH_RE.match(path)
+        if match is None:
+            return None
+        document = self._document()
+        if document is None:
+            return None
+        room = unquote(match.group(1))
+        key = document["keys"].get(room) or document["keys"].get(normalize_room_name(room))
+        state = document["rooms"].get(key) if key else None
+        if state is None or not state["live"]:
+            return None
+
+        etag = f'W/"{state["version"]}"'.encode()
+        headers = [(b"etag", etag), (b"cache-control", b"no-cache")]
+        if _etag_matches(scope, etag):
+            return 304, headers, b""
+        return _json(200, {
+            "room": room,
+            "state": state["transport"],
+            "volume": state["volume"],
+            "mute": state["mute"],
+            "track": _track(state),
+            "version": state["version"],
+        }, headers)
+
+    def _zones(self, scope) -> tuple[int, list, bytes] | None:
+        """The owner's live /zones, with track positions interpolated now."""
+        document = self._document()
+        if document is None or not document["live"]:
+            return None
+        etag = f'W/"{document["zones_version"]}"'.encode()
+        headers = [(b"etag", etag), (b"cache-control", b"no-cache")]
+        if _etag_matches(scope, etag):
+            return 304, headers, b""
+        zones = document["zones"]
+        for zone, room in zip(zones, document["zone_rooms"]):
+            track = _track(document["rooms"][room])
+            for member in (zone["coordinator"], *zone["members"]):
+                member["state"]["currentTrack"] = track
+        return _json(200, zones, headers)
+
+    def _all_states(self, query: dict) -> tuple[int, list, bytes] | None:
+        """GET /state when every room is kept current by events (source "events", age 0)."""
+        document = self._document()
+        if document is None or not document["live"] or not document["discovered"]:
+            return None
+        fields = query.get("fields", [",".join(_STATE_FIELDS)])[0]
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        if any(field not in _STATE_FIELDS for field in selected):
+            return None  # The owner answers with the 400
+        rooms = {}
+        for room, group in document["groups"].items():
+            state = document["rooms"].get(room)
+            if state is None or not state["live"] or group is None:
+                return None
+            entry = {}
+            for field in selected:
+                if field == "state":
+                    entry["state"] = state["transport"]
+                elif field == "track":
+                    entry["track"] = _track(state)
+                elif field != "group":
+                    entry[field] = state[field]
+            entry["version"] = state["version"]
+            if "group" in selected:
+                entry["group"] = group
+            entry["age"] = 0.0
+            entry["source"] = "events"
+            rooms[room] = entry
+        return _json(200, {"rooms": rooms}, [(b"cache-control", b"no-cache")])
+
+    # -- forwarding --------------------------------------------------------
+
+    async def _http(self, scope, receive, send) -> None:
+        try:
+            local = self._from_snapshot(scope)
+        except (KeyError, TypeError, ValueError):
+            local = None  # Malformed query or snapshot: let the owner answer
+        if local is not None:
+            metrics.inc("worker_snapshot_hits")
+            status, headers, body = local
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        header = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope["query_string"].decode("latin-1"),
+            "headers": [(k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"]],
+            "client": scope.get("client"),
+        }
+        try:
+            status, headers, chunks = await self._client.request(header, bytes(body))
+        except OwnerUnavailable as exc:
+            status, headers, payload = _json(503, {"error": "Owner unavailable", "detail": str(exc)})
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        metrics.inc("worker_forwarded")
+
+        async def _relay():
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+            })
+            async for chunk in chunks:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def _disconnected():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        # Streams (SSE, long-polls) end when either side goes away
+        relay = asyncio.create_task(_relay())
+        watcher = asyncio.create_task(_disconnected())
+        try:
+            await asyncio.wait({relay, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if relay.done() and isinstance(relay.exception(), OwnerUnavailable):
+                logger.warning("Owner went away while streaming %s", scope["path"])
+        finally:
+            relay.cancel()
+            watcher.cancel()
+            await asyncio.gather(relay, watcher, return_exceptions=True)
+            await chunks.aclose()
+
+
+app = WorkerApp(settings.owner_socket)